@@ -2,15 +2,16 @@ import streamlit as st
 import datetime
 import time
 import pandas as pd
+import optuna
 import logging
 
 from erp_module import load_erp_data
 from config import CONFIG
 
-from simulation_engine import (KimotoSimulator, trigger_single_simulation,
-                               generate_final_erp_data, run_monte_carlo_simulation,
-                               run_optimization, calculate_tahmin_d, analyze_warehouse_feasibility,
-                               analyze_stock_composition_by_category)
+from simulation_engine import (KimotoSimulator, trigger_single_simulation, trigger_paired_simulations, run_paired_monte_carlo,
+                               generate_final_erp_data, stream_monte_carlo_simulation, run_adaptive_monte_carlo,
+                               run_optimization, run_pareto_optimization, enumerate_strategy_space, best_enumerated_strategy, calculate_tahmin_d, analyze_warehouse_feasibility,
+                               analyze_stock_composition_by_category, configure_result_cache, sync_simulation_caches)
 
 from ui_manager import UIManager
 from event_library import JURY_SCENARIOS
@@ -167,6 +168,10 @@ def setup_logging():
 setup_logging()
 logger = logging.getLogger(__name__)
 
+MC_GAUGE_THRESHOLDS = {"final_otifs": [0.95], "annual_profits": [5_000_000], "final_flexibility": [7.0]}
+# Karşılaştırma modunda stratejiler arası farkın güven aralığı için eşlenmiş Monte Carlo tekrar sayısı.
+PAIRED_COMPARISON_RUNS = 2000
+
 @st.cache_data
 def get_initial_data(_config):
     """Simülasyon için temel başlangıç verilerini oluşturur ve önbelleğe alır.
@@ -205,7 +210,7 @@ def manage_erp_data_sourcing():
     st.sidebar.caption("Bu prototip, harici bir CSV dosyasını okuyarak ERP entegrasyon yeteneğini simüle eder.")
     if st.sidebar.button("🔄 ERP'den Canlı Veri Çek"):
         with st.spinner("ERP sisteminden veri çekiliyor..."):
-            erp_data = load_erp_data()
+            erp_data = load_erp_data(cache_dir=CONFIG['erp_cache']['directory'])
             if erp_data is not None and not erp_data.empty:
                 st.session_state.last_sync_time = datetime.datetime.now()
                 st.session_state.erp_data = erp_data
@@ -221,7 +226,7 @@ def manage_erp_data_sourcing():
     else: 
         st.sidebar.warning("🔗 ERP Bağlantısı: Pasif")
 
-def process_and_store_single_results(sim_results, params, scenario_title, config, run_type="single", best_value=None, optimization_goal=None, optimization_trials_df=None):
+def process_and_store_single_results(sim_results, params, scenario_title, config, run_type="single", best_value=None, optimization_goal=None, optimization_trials_df=None, strategy_ranking=None):
     """Tek bir simülasyonun ham sonuçlarını işler ve standart bir formatta sözlük olarak döndürür.
 
     Bu fonksiyon, simülasyon motorundan gelen çıktıları alır, son durum ERP verisini
@@ -237,6 +242,8 @@ def process_and_store_single_results(sim_results, params, scenario_title, config
         best_value (float, optional): Optimizasyon çalışması için en iyi değer.
         optimization_goal (str, optional): Optimizasyon hedefinin açıklaması.
         optimization_trials_df (pd.DataFrame, optional): Optimizasyon denemelerini içeren DataFrame.
+        strategy_ranking (pd.DataFrame, optional): `enumerate_strategy_space` tarafından
+            üretilen, tüm kesikli kombinasyonların sıralama tablosu.
     
     Returns:
         dict: UI katmanında kullanılmak üzere işlenmiş ve yapılandırılmış sonuç sözlüğü.
@@ -271,23 +278,30 @@ def process_and_store_single_results(sim_results, params, scenario_title, config
         result_dict["optimization_goal"] = optimization_goal
         if optimization_trials_df is not None:
             result_dict["optimization_trials_df"] = optimization_trials_df
+        if strategy_ranking is not None:
+            result_dict["strategy_ranking"] = strategy_ranking
 
     return result_dict
 
-def process_and_store_mc_results(mc_results, params, scenario_title):
+def process_and_store_mc_results(mc_summary, params, scenario_title, precision_report=None):
     """Monte Carlo simülasyon sonuçlarını işler ve standart bir sözlük olarak döndürür.
 
     Args:
-        mc_results (list): `run_monte_carlo_simulation` tarafından döndürülen sonuç listesi.
+        mc_summary (MonteCarloAccumulator): `stream_monte_carlo_simulation`
+            tarafından doldurulan sabit boyutlu sonuç özeti.
         params (dict): Simülasyonu çalıştırmak için kullanılan parametreler.
         scenario_title (str): Sonuçların başlığında kullanılacak senaryo adı.
+        precision_report (dict, optional): Uyarlamalı modda `run_adaptive_monte_carlo`
+            tarafından döndürülen hassasiyet raporu.
 
     Returns:
         dict: UI katmanında kullanılmak üzere işlenmiş Monte Carlo sonuç sözlüğü.
     """
     return {
         "run_type": "monte_carlo",
-        "mc_results": mc_results,
+        "mc_summary": mc_summary,
+        "mc_results": mc_summary.samples,
+        "mc_precision": precision_report,
         "params": params,
         "scenario_title": scenario_title
     }
@@ -327,20 +341,79 @@ def run_simulation_flow(params_main, params_compare, is_comparison_mode, is_mc_m
         def mc_callback(current_run, total_runs):
             progress = current_run / total_runs
             progress_bar.progress(progress, text=f"Monte Carlo: Tekrar {current_run}/{total_runs}")
-        mc_sim_results = run_monte_carlo_simulation(params_main, base_data, timeline, locations, interventions, config, num_runs, mc_callback)
+        mc_tolerances = st.session_state.get("mc_tolerances")
+        erp_data = st.session_state.get('erp_data')
+        simulation_seed = st.session_state.get("simulation_seed")
+        mc_summary, precision_report = None, None
+        if mc_tolerances:
+            mc_summary, precision_report = run_adaptive_monte_carlo(params_main, base_data, timeline, locations, interventions, config, mc_tolerances,
+                                                                    max_runs=num_runs, thresholds=MC_GAUGE_THRESHOLDS, callback_func=mc_callback, erp_data=erp_data, seed=simulation_seed)
+        else:
+            for completed_runs, mc_summary in stream_monte_carlo_simulation(params_main, base_data, timeline, locations, interventions, config, num_runs,
+                                                                            thresholds=MC_GAUGE_THRESHOLDS, erp_data=erp_data, seed=simulation_seed):
+                mc_callback(completed_runs, num_runs)
         progress_bar.empty()
-        st.session_state.last_results = process_and_store_mc_results(mc_sim_results, params_main, f"Monte Carlo | {scenario_details}")
+        st.session_state.last_results = process_and_store_mc_results(mc_summary, params_main, f"Monte Carlo | {scenario_details}", precision_report)
     else:
         logger.info(f"Manuel simülasyon başlatıldı. Senaryo: {scenario_details}")
-        with st.spinner(f"'{scenario_details}' senaryosu için Ana Strateji çalıştırılıyor..."):
-            main_sim_results = trigger_single_simulation(params_main, base_data, timeline, locations, interventions, config)
+        simulation_seed = st.session_state.get("simulation_seed")
+        if not is_comparison_mode:
+            with st.spinner(f"'{scenario_details}' senaryosu için Ana Strateji çalıştırılıyor..."):
+                main_sim_results = trigger_single_simulation(params_main, base_data, timeline, locations, interventions, config, seed=simulation_seed)
+                st.session_state.last_results = process_and_store_single_results(main_sim_results, params_main, f"Ana Strateji | {scenario_details}", config)
+            return
+
+        logger.info("Karşılaştırma modu aktif, stratejiler ortak rastgele sayılarla çalıştırılıyor.")
+        with st.spinner(f"'{scenario_details}' senaryosu için Ana ve Karşılaştırma Stratejileri aynı kriz çekilişleriyle çalıştırılıyor..."):
+            main_sim_results, comp_sim_results = trigger_paired_simulations([params_main, params_compare], base_data, timeline, locations, interventions, config, seed=simulation_seed)
             st.session_state.last_results = process_and_store_single_results(main_sim_results, params_main, f"Ana Strateji | {scenario_details}", config)
+            comparison_results = process_and_store_single_results(comp_sim_results, params_compare, f"Karşılaştırma Stratejisi | {scenario_details}", config)
+        with st.spinner("Strateji farkının güven aralığı eşlenmiş Monte Carlo ile hesaplanıyor..."):
+            comparison_results["paired_comparison"] = run_paired_monte_carlo([params_main, params_compare], base_data, timeline, locations, interventions, config,
+                                                                            PAIRED_COMPARISON_RUNS, reference=1, seed=simulation_seed)
+        st.session_state.comparison_results = comparison_results
+
+def run_pareto_optimization_flow(params_main, base_data, timeline, locations, interventions, config, n_trials, goals, scenario_details):
+    """Çok amaçlı (Pareto) optimizasyon akışını yönetir.
+
+    Seçilen hedefleri tek bir Optuna çalışmasında birlikte optimize eder ve
+    Pareto sınırını `st.session_state`'e kaydeder. Sınır tüm hedeflerin
+    değerlerini içerdiğinden arayüz hedefler arasında yeniden simülasyon
+    yapmadan geçiş yapabilir.
 
-        if is_comparison_mode:
-            logger.info("Karşılaştırma modu aktif, ikinci simülasyon çalıştırılıyor.")
-            with st.spinner(f"'{scenario_details}' senaryosu için Karşılaştırma Stratejisi çalıştırılıyor..."):
-                comp_sim_results = trigger_single_simulation(params_compare, base_data, timeline, locations, interventions, config)
-                st.session_state.comparison_results = process_and_store_single_results(comp_sim_results, params_compare, f"Karşılaştırma Stratejisi | {scenario_details}", config)
+    Args:
+        goals (list): Birlikte optimize edilecek hedefler.
+        Diğer argümanlar `run_optimization_flow` ile aynıdır.
+    """
+    st.session_state.last_results = None
+    st.session_state.comparison_results = None
+    if len(goals) < 2:
+        st.error("Çok amaçlı optimizasyon için en az iki hedef seçmelisiniz.")
+        return
+
+    logger.info(f"Çok amaçlı optimizasyon akışı başlatıldı. Hedefler: {goals}, Deneme Sayısı: {n_trials}")
+    progress_bar = st.progress(0, text="Çok amaçlı optimizasyon çalıştırılıyor...")
+    completed_trials = 0
+    def opt_callback(study, trial):
+        nonlocal completed_trials
+        completed_trials += 1
+        progress_bar.progress(min(completed_trials / n_trials, 1.0), text=f"Optimizasyon: Deneme {completed_trials}/{n_trials}")
+
+    opt_settings = config.get('optimization_settings', {})
+    pareto_df, optimization_trials_df = run_pareto_optimization(params_main, base_data, timeline, locations, interventions, config, n_trials, goals, opt_callback,
+                                                                n_workers=opt_settings.get('n_workers', 1), storage_path=opt_settings.get('storage_path'),
+                                                                objective_options=st.session_state.get("opt_robustness"))
+    progress_bar.empty()
+    logger.info(f"Çok amaçlı optimizasyon tamamlandı. Pareto sınırında {len(pareto_df)} strateji var.")
+
+    st.session_state.last_results = {
+        "run_type": "pareto",
+        "pareto_frontier": pareto_df,
+        "pareto_goals": list(goals),
+        "params": params_main,
+        "scenario_title": f"Pareto Optimizasyonu | {scenario_details}",
+        "optimization_trials_df": optimization_trials_df
+    }
 
 def run_optimization_flow(params_main, base_data, timeline, locations, interventions, config, n_trials, optimization_goal, scenario_details):
     """Optimizasyon motoru akışını yönetir.
@@ -366,13 +439,33 @@ def run_optimization_flow(params_main, base_data, timeline, locations, intervent
     logger.info(f"Optimizasyon akışı başlatıldı. Hedef: {optimization_goal}, Deneme Sayısı: {n_trials}")
     progress_bar = st.progress(0, text="Strateji Optimizasyon Motoru çalıştırılıyor...")
     status_text = st.empty()
+    completed_trials = 0
     def opt_callback(study, trial):
-        progress = (trial.number + 1) / n_trials
-        best_val_display = -study.best_value if study.best_value is not None and "Maksimize Et" in optimization_goal else study.best_value
-        progress_bar.progress(progress, text=f"Optimizasyon: Deneme {trial.number + 1}/{n_trials}")
+        # Devam ettirilen çalışmalarda deneme numaraları önceki denemelerden devam eder; ilerleme bu çağrıdaki denemelerle ölçülür.
+        nonlocal completed_trials
+        completed_trials += 1
+        progress = min(completed_trials / n_trials, 1.0)
+        progress_bar.progress(progress, text=f"Optimizasyon: Deneme {completed_trials}/{n_trials}")
+        # Budanan denemeler skor üretmez; henüz tamamlanmış deneme yoksa en iyi skor gösterilmez.
+        if not study.get_trials(deepcopy=False, states=(optuna.trial.TrialState.COMPLETE,)):
+            return
+        best_val_display = -study.best_value if "Maksimize Et" in optimization_goal else study.best_value
         status_text.text(f"Mevcut En İyi Skor: {best_val_display:,.2f}")
     
-    best_params, best_value, optimization_trials_df = run_optimization(params_main, base_data, timeline, locations, interventions, config, n_trials, optimization_goal, opt_callback)
+    opt_settings = config.get('optimization_settings', {})
+    objective_options = dict(st.session_state.get("opt_robustness") or {})
+    strategy_ranking = None
+    if st.session_state.get("opt_enumerate"):
+        with st.spinner("Tüm kesikli strateji kombinasyonları kaydırıcı ızgarası üzerinde taranıyor..."):
+            strategy_ranking = enumerate_strategy_space(base_data, config, timeline, locations, interventions, optimization_goal,
+                                                        replications=objective_options.get("replications", 32),
+                                                        statistic=objective_options.get("statistic", "mean"), alpha=objective_options.get("alpha", 0.1))
+        objective_options = {"replications": 32, **objective_options, "fixed_params": best_enumerated_strategy(strategy_ranking, config)}
+        status_text.text("Kesikli strateji seçildi; kaydırıcılar Optuna ile iyileştiriliyor.")
+
+    best_params, best_value, optimization_trials_df = run_optimization(params_main, base_data, timeline, locations, interventions, config, n_trials, optimization_goal, opt_callback,
+                                                                       n_workers=opt_settings.get('n_workers', 1), storage_path=opt_settings.get('storage_path'),
+                                                                       objective_options=objective_options or None)
     
     progress_bar.empty()
     status_text.empty()
@@ -383,7 +476,7 @@ def run_optimization_flow(params_main, base_data, timeline, locations, intervent
     best_params['tahmin_d'] = calculate_tahmin_d(best_params, config)
 
     with st.spinner("Optimal stratejinin detaylı sonuçları oluşturuluyor..."):
-        final_sim_results = trigger_single_simulation(best_params, base_data, timeline, locations, interventions, config)
+        final_sim_results = trigger_single_simulation(best_params, base_data, timeline, locations, interventions, config, seed=st.session_state.get("simulation_seed"))
         
         st.session_state.last_results = process_and_store_single_results(
             sim_results=final_sim_results, 
@@ -393,7 +486,8 @@ def run_optimization_flow(params_main, base_data, timeline, locations, intervent
             run_type="optimization",
             best_value=best_value,
             optimization_goal=optimization_goal,
-            optimization_trials_df=optimization_trials_df
+            optimization_trials_df=optimization_trials_df,
+            strategy_ranking=strategy_ranking
         )
 
 def main():
@@ -414,6 +508,8 @@ def main():
     logger.info("Uygulama başlatıldı.")
 
     base_data = get_initial_data(CONFIG)
+    configure_result_cache(CONFIG['result_cache']['max_entries'], CONFIG['result_cache']['directory'])
+    sync_simulation_caches(CONFIG, base_data)
     ui = UIManager(base_data)
 
     st.sidebar.title("Kimoto Solutions")
@@ -455,7 +551,7 @@ def main():
         if run_mode == "🤖 Strateji Optimizasyon Motoru":
             button_text = f"💡 En İyi Stratejiyi Bul ({n_trials} Deneme)"
         elif is_mc_mode:
-            button_text = f"🎲 Monte Carlo Simülasyonunu Başlat ({num_runs} Tekrar)"
+            button_text = f"🎲 Monte Carlo Simülasyonunu Başlat ({'en fazla ' if st.session_state.get('mc_tolerances') else ''}{num_runs} Tekrar)"
         elif is_comparison_mode:
             button_text = "🆚 İki Stratejiyi Karşılaştır"
 
@@ -474,7 +570,9 @@ def main():
                 scenario_details = "Manuel Senaryo"
                 timeline, locations, interventions = user_timeline, user_locations, user_interventions
 
-            if run_mode == "🤖 Strateji Optimizasyon Motoru":
+            if run_mode == "🤖 Strateji Optimizasyon Motoru" and not isinstance(optimization_goal, str):
+                run_pareto_optimization_flow(params_main, base_data, timeline, locations, interventions, CONFIG, n_trials, optimization_goal, scenario_details)
+            elif run_mode == "🤖 Strateji Optimizasyon Motoru":
                 run_optimization_flow(params_main, base_data, timeline, locations, interventions, CONFIG, n_trials, optimization_goal, scenario_details)
             else:  
                 run_simulation_flow(params_main, params_compare, is_comparison_mode, is_mc_mode, num_runs, base_data, timeline, locations, interventions, CONFIG, scenario_details)
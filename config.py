@@ -50,6 +50,9 @@ CONFIG = {
     "co2_factors": { "hindistan_mesafe_km": 3000, "g_afrika_mesafe_km": 8000, "turkiye_mesafe_km": 1500, "emisyon_katsayisi_ton_km": 0.0005, },
     "simulation_thresholds": { "esneklik_otif_esigi": 0.80, "esneklik_kar_esigi": 1_500_000, },
     "stakeholder_analysis_thresholds": { "otif_baski_esigi": 0.90, "stok_hizi_baski_esigi": 3.0, "esneklik_kriz_esigi": 5.0 },
+    "optimization_settings": { "storage_path": ".optuna/optimization_studies.log", "n_workers": 4, },
+    "result_cache": { "max_entries": 64, "directory": ".cache/results", "default_seed": 42, },
+    "erp_cache": { "directory": ".cache/erp", },
     "ui_settings": { "targets": {"otif": 0.95, "tasarruf": 5_000_000, "co2": 15000, "esneklik": 10.0, "stok_hizi": 4.0}, "sliders": { "tek_kaynak_orani": {"label": "Tek Kaynaktan Tedarik Oranı", "min": 0.0, "max": 1.0, "default": 0.3, "step": 0.05}, "lojistik_m": {"label": "Lojistik Dış Kaynak (3PL) Oranı", "min": 0.40, "max": 0.80, "default": 0.80, "step": 0.01}, }}
 }
 
@@ -0,0 +1,192 @@
+import numpy as np
+import pandas as pd
+
+from event_library import EVENT_LIBRARY
+
+# Yeniden dengelemeden sonra SKU bayraklarına uygulanan stok politikası çarpanları: politika -> ((sütun, değer, çarpan), ...).
+STOCK_POLICY_MULTIPLIERS = {
+    'Fazla Stokları Erit': (('Yavas_Hareket', True, 0.20),),
+    'SKU Optimizasyonu': (('Yavas_Hareket', True, 0.0),),
+    'Kilit Müşteri Ayrıcalığı': (('Musteri_Ozel', True, 1.20), ('Musteri_Ozel', False, 0.90)),
+}
+REDUCTION_PRIORITY = ('B', 'C', 'A')
+INCREASE_PRIORITY = ('A', 'C', 'B')
+# Monte Carlo birikimcisine eklenen depo metrikleri; kategori tonajları `ErpGroupProfile.metric_names` ile eklenir.
+WAREHOUSE_MC_METRICS = ("final_turnover", "warehouse_utilization", "warehouse_excess_tons")
+# Depo kapasitesinin aşıldığı kabul edilen kullanım oranı.
+WAREHOUSE_BREACH_UTILIZATION = 1.0
+_FLAG_CONDITIONS = tuple(sorted({(column, value) for rules in STOCK_POLICY_MULTIPLIERS.values() for column, value, _ in rules}))
+
+def rebalancing_factors(category_values, category_slot, initial_turnover, final_turnovers):
+    """Hedef stok devir hızlarına göre kategori yuvası başına stok çarpanlarını hesaplar.
+
+    Toplam stok değeri devir hızıyla ters orantılı ölçeklenir. Azaltma
+    `REDUCTION_PRIORITY` sırasıyla (kategori değerinin en fazla %90'ı), artırma
+    `INCREASE_PRIORITY` sırasıyla (kategori değerinin en fazla iki katına kadar)
+    dağıtılır. Tüm tekrarlar tek geçişte, tekrar ekseninde vektörel hesaplanır.
+
+    Args:
+        category_values (np.ndarray): Yuva başına toplam stok değeri (adet × birim maliyet).
+        category_slot (dict): Kategori adı -> yuva indeksi.
+        initial_turnover (float): Başlangıç stok devir hızı.
+        final_turnovers (array-like): Tekrar başına son stok devir hızı.
+
+    Returns:
+        np.ndarray: (tekrar × yuva) boyutlu çarpan matrisi.
+    """
+    final_turnovers = np.atleast_1d(np.asarray(final_turnovers, dtype=float))
+    factors = np.ones((final_turnovers.size, len(category_values)))
+    active = (final_turnovers > 0) & (np.abs(initial_turnover - final_turnovers) > 1e-6)
+    initial_total_stock_value = category_values.sum()
+    with np.errstate(divide='ignore', invalid='ignore'):
+        value_change = np.where(active, initial_total_stock_value - initial_total_stock_value * (initial_turnover / final_turnovers), 0.0)
+
+    for priority, limit_ratio, direction in ((REDUCTION_PRIORITY, 0.90, -1), (INCREASE_PRIORITY, 1.0, 1)):
+        remaining = np.maximum(-direction * value_change, 0.0)
+        for category in priority:
+            category_current_value = category_values[category_slot[category]] if category in category_slot else 0
+            if category_current_value > 0:
+                moved = np.minimum(remaining, category_current_value * limit_ratio)
+                factors[:, category_slot[category]] *= 1 + direction * (moved / category_current_value)
+                remaining = remaining - moved
+    return factors
+
+def apply_event_factors(factors, event_lists, category_slot):
+    """Gerçekleşen olayların `erp_stock_multiplier` çarpanlarını (tekrar × yuva) matrisine yerinde uygular.
+
+    Args:
+        factors (np.ndarray): `rebalancing_factors` çıktısı.
+        event_lists (list): Her tekrar için gerçekleşen olay adlarının listesi.
+        category_slot (dict): Kategori adı -> yuva indeksi.
+    """
+    slot_multipliers = {}
+    for event_name, event_config in EVENT_LIBRARY.items():
+        erp_impact = event_config.get('erp_stock_multiplier')
+        if erp_impact:
+            multiplier = np.full(factors.shape[1], erp_impact.get('multiplier', 1.0))
+            categories = erp_impact.get('categories')
+            if categories:
+                multiplier = np.ones(factors.shape[1])
+                multiplier[[category_slot[category] for category in categories if category in category_slot]] = erp_impact.get('multiplier', 1.0)
+            slot_multipliers[event_name] = multiplier
+    for run_idx, event_names in enumerate(event_lists):
+        for event_name in event_names:
+            if event_name in slot_multipliers:
+                factors[run_idx] *= slot_multipliers[event_name]
+    return factors
+
+class ErpGroupProfile:
+    """SKU tablosunun kategori ve politika bayraklarına göre gruplanmış kompakt özeti.
+
+    Son durum stokları yalnızca kategoriye ve `STOCK_POLICY_MULTIPLIERS`'ın
+    kullandığı bayraklara bağlı çarpanlarla ölçeklendiğinden, çok sayıda
+    tekrarın son durumu SKU tablosu çoğaltılmadan bu gruplar üzerinden
+    hesaplanabilir (A/B/C ve iki bayrakla en fazla 12 grup).
+
+    Attributes:
+        categories (list): Kategori adları; yuva `i + 1` `categories[i]`'ye,
+            yuva 0 kategorisi eksik SKU'lara karşılık gelir.
+        category_slot (dict): Kategori adı -> yuva indeksi.
+        category_values (np.ndarray): Yuva başına toplam stok değeri.
+        group_slot (np.ndarray): Her grubun kategori yuvası.
+        group_flags (dict): (sütun, değer) -> grup başına bayrak dizisi.
+        group_units (np.ndarray): Grup başına toplam stok adedi.
+    """
+    __slots__ = ("categories", "category_slot", "category_values", "group_slot", "group_flags", "group_units")
+
+    def __init__(self, categories, category_values, group_slot, group_flags, group_units):
+        self.categories = list(categories)
+        self.category_slot = {category: slot + 1 for slot, category in enumerate(self.categories)}
+        self.category_values = category_values
+        self.group_slot = group_slot
+        self.group_flags = group_flags
+        self.group_units = group_units
+
+    @classmethod
+    def from_frame(cls, erp_df):
+        """Bir ERP tablosunu kategori ve bayrak gruplarına indirger."""
+        category_codes, categories = pd.factorize(erp_df['Kategori'])
+        category_codes = category_codes + 1
+        stock = erp_df['Stok_Adedi'].to_numpy(dtype=float)
+        category_values = np.bincount(category_codes, weights=stock * erp_df['Birim_Maliyet'].to_numpy(dtype=float), minlength=len(categories) + 1)
+
+        group_key = category_codes.astype(np.int64)
+        for column, value in _FLAG_CONDITIONS:
+            flag = (erp_df[column] == value).to_numpy() if column in erp_df.columns else np.zeros(len(erp_df), dtype=bool)
+            group_key = group_key * 2 + flag
+        keys, group_idx = np.unique(group_key, return_inverse=True)
+
+        group_flags = {}
+        for bit, condition in enumerate(reversed(_FLAG_CONDITIONS)):
+            group_flags[condition] = (keys >> bit) & 1 == 1
+        group_slot = keys >> len(_FLAG_CONDITIONS)
+        return cls(categories, category_values, group_slot, group_flags, np.bincount(group_idx, weights=stock, minlength=len(keys)))
+
+    @property
+    def metric_names(self):
+        """Monte Carlo birikimcisine eklenecek metrik adları (depo metrikleri ve kategori tonajları)."""
+        return WAREHOUSE_MC_METRICS + tuple(f"stock_tons_{category}" for category in self.categories)
+
+    def policy_factors(self, stok_s):
+        """Stok politikasının grup başına çarpanlarını döndürür."""
+        factors = np.ones(len(self.group_units))
+        for column, value, multiplier in STOCK_POLICY_MULTIPLIERS.get(stok_s, ()):
+            factors[self.group_flags[(column, value)]] *= multiplier
+        return factors
+
+def batch_final_erp_state(profile, final_turnovers, event_lists, stok_s, config):
+    """Tüm tekrarların son durum depo kullanımını ve kategori tonajlarını SKU tablosunu çoğaltmadan hesaplar.
+
+    `generate_final_erp_data` ile aynı yeniden dengeleme, stok politikası ve
+    olay çarpanlarını grup toplamlarına uygular. SKU başına adet yuvarlaması
+    yapılmadığından tonajlar tekil sonuçtan SKU başına en fazla yarım adet
+    kadar farklılaşabilir.
+
+    Args:
+        profile (ErpGroupProfile): ERP tablosunun grup özeti.
+        final_turnovers (array-like): Tekrar başına son stok devir hızı.
+        event_lists (list): Her tekrar için gerçekleşen olay adlarının listesi.
+        stok_s (str): Stok stratejisi.
+        config (dict): Uygulamanın genel yapılandırma sözlüğü.
+
+    Returns:
+        dict: Tekrar başına diziler: 'kullanim_orani', 'fark_ton',
+            'gereken_hacim_ton' ve 'kategori_ton' ({kategori: dizi}); ayrıca
+            'toplam_kapasite_ton'.
+    """
+    factors = rebalancing_factors(profile.category_values, profile.category_slot, config['kpi_defaults']['stok_devir_hizi'], final_turnovers)
+    apply_event_factors(factors, event_lists, profile.category_slot)
+    ton_per_unit = config.get('physical_factors', {}).get('avg_ton_per_sku_unit', 0.015)
+    group_tons = factors[:, profile.group_slot] * (profile.group_units * profile.policy_factors(stok_s) * ton_per_unit)
+
+    slot_tons = np.zeros((group_tons.shape[0], len(profile.category_values)))
+    for group, slot in enumerate(profile.group_slot):
+        slot_tons[:, slot] += group_tons[:, group]
+    total_stock_tonnage = slot_tons.sum(axis=1)
+    total_capacity_tons = config.get('warehouse_capacities', {}).get('Toplam', 43000)
+    kullanim_orani = total_stock_tonnage / total_capacity_tons if total_capacity_tons else np.zeros_like(total_stock_tonnage)
+    return {
+        "kullanim_orani": kullanim_orani,
+        "fark_ton": total_stock_tonnage - total_capacity_tons,
+        "gereken_hacim_ton": total_stock_tonnage,
+        "kategori_ton": {category: slot_tons[:, profile.category_slot[category]] for category in profile.categories},
+        "toplam_kapasite_ton": total_capacity_tons,
+    }
+
+def summarize_warehouse_breaches(erp_state, quantiles=(0.05, 0.50, 0.95)):
+    """`batch_final_erp_state` çıktısından depo kapasitesi aşımı dağılımını özetler.
+
+    Returns:
+        dict: 'breach_probability' (kapasitenin aşıldığı tekrar oranı),
+            'utilization_quantiles' ({kantil: kullanım oranı}),
+            'mean_excess_tons' (aşım görülen tekrarlarda ortalama aşım) ve
+            'mean_category_tons' ({kategori: ortalama ton}).
+    """
+    excess = erp_state["fark_ton"]
+    breached = excess > 0
+    return {
+        "breach_probability": float(breached.mean()) if excess.size else float("nan"),
+        "utilization_quantiles": {q: float(np.quantile(erp_state["kullanim_orani"], q)) for q in quantiles} if excess.size else {},
+        "mean_excess_tons": float(excess[breached].mean()) if breached.any() else 0.0,
+        "mean_category_tons": {category: float(tons.mean()) for category, tons in erp_state["kategori_ton"].items()},
+    }
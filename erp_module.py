@@ -1,9 +1,31 @@
+import os
+import hashlib
+import logging
+
+import numpy as np
 import pandas as pd
 import streamlit as st
-import logging
 
 logger = logging.getLogger(__name__)
 
+# CSV okunurken önceden bildirilen sütun tipleri. Dosyada bulunmayan sütunlar yok sayılır;
+# tiplere uymayan (eksik veya sayısal olmayan değerli) dosyalar tipsiz okunup doğrulamaya bırakılır.
+# 'Tedarik_Suresi_Gun' dosyada yoktur, haftadan türetilir; 'int16' haftanın 7 katı 'int32' içinde taşmaz.
+ERP_COLUMN_DTYPES = {
+    'Kategori': 'category', 'Ulke': 'category', 'Tesis_Kodu': 'category',
+    'Stok_Adedi': 'int32', 'Siparis_Bekleyen': 'int32', 'Talep_Tahmini': 'int32', 'Tedarik_Suresi_Hafta': 'int16',
+    'Birim_Maliyet': 'float64', 'Birim_Fiyat': 'float64',
+    'Musteri_Ozel': 'bool', 'Yavas_Hareket': 'bool', 'Tedarik_Suresi_Gun': 'int32',
+}
+# Tipler veya doğrulama kuralları değiştiğinde artırılır; eski önbellek dosyaları okunmaz.
+ERP_CACHE_VERSION = 2
+REQUIRED_COLUMNS = ('SKU', 'Kategori', 'Stok_Adedi', 'Birim_Maliyet', 'Birim_Fiyat', 'Tedarik_Suresi_Hafta')
+VALID_CATEGORIES = ('A', 'B', 'C')
+NUMERIC_COLUMNS = ('Stok_Adedi', 'Siparis_Bekleyen', 'Birim_Maliyet', 'Birim_Fiyat', 'Talep_Tahmini', 'Tedarik_Suresi_Hafta')
+# Akış halinde doğrulamada bir seferde belleğe alınan satır sayısı.
+ERP_CHUNK_ROWS = 100_000
+_BOOL_VALUES = {'true': True, 'false': False, '1': True, '0': False}
+
 def normalize_and_validate_data(df):
     """Yüklenen ERP DataFrame'ini normalize eder ve temel iş kurallarına göre doğrular.
 
@@ -21,32 +43,38 @@ def normalize_and_validate_data(df):
                               Eğer kritik bir hata (örn: eksik sütun) varsa
                               `None` döndürür.
     """
+    validated_df, error_messages = _normalize_and_validate(df)
+    _report_validation_warnings(error_messages)
+    return validated_df
+
+def _normalize_and_validate(df):
+    """(İÇ) `normalize_and_validate_data` gibi çalışır; uyarıları göstermek yerine mesaj listesiyle döndürür."""
     if df.empty:
-        return df 
+        return df, []
 
     validated_df = df.copy()
     error_messages = []
 
-    for col in validated_df.select_dtypes(include=['object']).columns:
-        validated_df[col] = validated_df[col].str.strip()
+    for col in validated_df.columns:
+        if isinstance(validated_df[col].dtype, pd.CategoricalDtype):
+            if pd.api.types.is_string_dtype(validated_df[col].cat.categories):
+                validated_df[col] = validated_df[col].str.strip().astype('category')
+        elif pd.api.types.is_string_dtype(validated_df[col]):
+            validated_df[col] = validated_df[col].str.strip()
 
-    required_columns = ['SKU', 'Kategori', 'Stok_Adedi', 'Birim_Maliyet', 'Birim_Fiyat', 'Tedarik_Suresi_Hafta']
-    for col in required_columns:
+    for col in REQUIRED_COLUMNS:
         if col not in validated_df.columns:
             msg = f"Kritik Hata: CSV dosyasında '{col}' sütunu bulunamadı."
             error_messages.append(msg)
             logger.error(msg)
             st.error(msg)
-            return None 
+            return None, []
 
-    valid_categories = ['A', 'B', 'C']
     if 'Kategori' in validated_df.columns and not validated_df['Kategori'].dropna().empty:
-        if not set(validated_df['Kategori'].unique()).issubset(set(valid_categories)):
+        if not set(validated_df['Kategori'].unique()).issubset(set(VALID_CATEGORIES)):
             error_messages.append("Veri Hatası: 'Kategori' sütununda 'A', 'B', 'C' dışında geçersiz değerler var.")
 
-    numeric_cols_to_check = ['Stok_Adedi', 'Siparis_Bekleyen', 'Birim_Maliyet', 'Birim_Fiyat', 'Talep_Tahmini', 'Tedarik_Suresi_Hafta']
-    
-    cols_to_validate = [col for col in numeric_cols_to_check if col in validated_df.columns]
+    cols_to_validate = [col for col in NUMERIC_COLUMNS if col in validated_df.columns]
 
     for col in cols_to_validate:
         if validated_df[col].dropna().empty:
@@ -57,40 +85,107 @@ def normalize_and_validate_data(df):
         if (validated_df[col] < 0).any():
             error_messages.append(f"Veri Hatası: '{col}' sütununda negatif değerler bulunmamalıdır.")
 
+    return validated_df, error_messages
+
+def _report_validation_warnings(error_messages):
+    """(İÇ) Doğrulama uyarılarını günlüğe yazar ve arayüzde listeler."""
     if error_messages:
         st.warning("Veri Doğrulama Uyarısı:")
         for msg in error_messages:
             logger.warning(f"Veri doğrulama uyarısı: {msg}")
             st.markdown(f"- {msg}")
-    
-    return validated_df
 
-def load_erp_data(file_path="erp_data_300_sku.csv"):
+def erp_cache_path(file_path, cache_dir):
+    """CSV dosyasının ayrıştırılmış ve doğrulanmış halinin Parquet önbellek yolunu döndürür.
+
+    Anahtar; dosyanın mutlak yolu, boyutu (`st_size`), değiştirilme zamanı
+    (`st_mtime_ns`) ve `ERP_CACHE_VERSION` değeridir. Yalnızca `os.stat` ile
+    hesaplandığından dosyanın içeriği okunmaz; dosya yeniden yazılırsa boyut
+    veya zaman değişir ve eski önbellek kullanılmaz.
+    """
+    stat = os.stat(file_path)
+    key = f"{os.path.abspath(file_path)}:{stat.st_size}:{stat.st_mtime_ns}:{ERP_CACHE_VERSION}"
+    return os.path.join(cache_dir, f"{hashlib.sha256(key.encode()).hexdigest()}.parquet")
+
+def _lead_time_days(weeks):
+    """(İÇ) Tedarik süresini haftadan güne çevirir; dar tam sayı tipleri önce 'Tedarik_Suresi_Gun' tipine genişletilir."""
+    days_dtype = np.dtype(ERP_COLUMN_DTYPES['Tedarik_Suresi_Gun'])
+    if pd.api.types.is_integer_dtype(weeks) and weeks.dtype.itemsize < days_dtype.itemsize:
+        weeks = weeks.astype(days_dtype)
+    return weeks * 7
+
+def _read_erp_csv(file_path):
+    """(İÇ) CSV'yi `ERP_COLUMN_DTYPES` tipleriyle okur; tiplere uymayan dosyaları tipsiz okur."""
+    try:
+        return pd.read_csv(file_path, dtype=ERP_COLUMN_DTYPES)
+    except (ValueError, TypeError) as exc:
+        logger.info(f"'{file_path}' tanımlı tiplerle okunamadı, tipsiz okunup doğrulanacak: {exc}")
+        return pd.read_csv(file_path)
+
+def _read_erp_cache(cache_path):
+    """(İÇ) Önbellek dosyasını okur; dosya yoksa veya okunamazsa `None` döndürür."""
+    if not os.path.exists(cache_path):
+        return None
+    try:
+        return pd.read_parquet(cache_path)
+    except (ImportError, OSError, ValueError) as exc:
+        logger.warning(f"ERP önbellek dosyası okunamadı, CSV yeniden ayrıştırılacak: {exc}")
+        return None
+
+def _write_erp_cache(df, cache_path):
+    """(İÇ) Doğrulanmış veriyi Parquet önbelleğine atomik olarak yazar; yazılamazsa yalnızca günlüğe kaydeder."""
+    temporary_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        df.to_parquet(temporary_path, index=False)
+        os.replace(temporary_path, cache_path)
+    except (ImportError, OSError, ValueError) as exc:
+        logger.warning(f"ERP önbelleği yazılamadı: {exc}")
+        if os.path.exists(temporary_path):
+            os.remove(temporary_path)
+
+def load_erp_data(file_path="erp_data_300_sku.csv", cache_dir=None):
     """Belirtilen CSV dosyasından ERP verisini okur, doğrular ve temel dönüşümleri yapar.
 
-    Bu fonksiyon, ERP entegrasyonunu simüle eder. Dosyayı okur,
-    `normalize_and_validate_data` fonksiyonu ile veriyi temizler ve doğrular,
-    ve 'Tedarik_Suresi_Gun' gibi ek bir sütun oluşturur.
+    Bu fonksiyon, ERP entegrasyonunu simüle eder. Dosyayı `ERP_COLUMN_DTYPES`
+    tipleriyle okur (kategorik kategori/ülke/tesis, kompakt tam sayılar,
+    mantıksal bayraklar), `normalize_and_validate_data` fonksiyonu ile veriyi
+    temizler ve doğrular, ve 'Tedarik_Suresi_Gun' gibi ek bir sütun oluşturur.
+    `cache_dir` verilirse uyarısız doğrulanan veri Parquet olarak önbelleğe
+    yazılır; aynı dosyanın sonraki yüklemeleri ayrıştırma ve doğrulamayı atlar.
+    Belleğe sığmayan dosyalar önceden `stream_validate_erp_csv` ile aynı
+    önbellek yoluna yazılabilir.
     Dosya bulunamazsa veya bozuksa, uygulamayı durdurur (`st.stop`).
 
     Args:
         file_path (str, optional): Okunacak CSV dosyasının yolu.
                                    Varsayılan: "erp_data_300_sku.csv".
+        cache_dir (str, optional): Parquet önbellek dizini. `None` ise
+                                   önbellek kullanılmaz.
 
     Returns:
         pd.DataFrame or None: Başarıyla yüklenen ve işlenen ERP verisi.
                               Hata durumunda `None` döner ve uygulama durur.
     """
     try:
-        df = pd.read_csv(file_path)
-        
-        df = normalize_and_validate_data(df)
+        cache_path = erp_cache_path(file_path, cache_dir) if cache_dir else None
+        if cache_path:
+            cached_df = _read_erp_cache(cache_path)
+            if cached_df is not None:
+                logger.info(f"'{file_path}' önbellekten yüklendi, {len(cached_df)} SKU bulundu.")
+                return cached_df
+
+        df, error_messages = _normalize_and_validate(_read_erp_csv(file_path))
         if df is None:
-            st.stop() 
+            st.stop()
+        _report_validation_warnings(error_messages)
 
         if not df.empty and 'Tedarik_Suresi_Hafta' in df.columns:
-            df['Tedarik_Suresi_Gun'] = df['Tedarik_Suresi_Hafta'] * 7
-        
+            df['Tedarik_Suresi_Gun'] = _lead_time_days(df['Tedarik_Suresi_Hafta'])
+
+        if cache_path and not error_messages and not df.empty:
+            _write_erp_cache(df, cache_path)
+
         logger.info(f"'{file_path}' başarıyla yüklendi, {len(df)} SKU bulundu.")
         return df
         
@@ -108,4 +203,198 @@ def load_erp_data(file_path="erp_data_300_sku.csv"):
         logger.error(f"Veri okunurken bir hata oluştu: {e}")
         st.error(f"Veri okunurken bir hata oluştu: {e}")
         st.stop()
-        return None
\ No newline at end of file
+        return None
+
+class ErpValidationReport:
+    """Akış halinde ERP doğrulamasının sınırlı boyutlu özeti.
+
+    Dosya boyutundan bağımsız olarak sütun ve sorun başına yalnızca bir sayaç
+    ile en fazla `max_examples` örnek satır, sütun başına da en fazla
+    `max_examples` farklı bilinmeyen kategori değeri tutulur; sınırı aşan
+    bilinmeyen değerler yalnızca `unknown_category_overflow` içinde sayılır.
+
+    Attributes:
+        max_examples (int): Saklanan örnek satır ve bilinmeyen değer sınırı.
+        rows (int): Okunan veri satırı sayısı.
+        chunks (int): İşlenen parça sayısı.
+        missing_columns (list): Dosyada bulunmayan zorunlu sütunlar.
+        column_issues (dict): (sütun, sorun) -> {'count': adet, 'examples':
+            [(CSV satır no, ham değer), ...]}. Sorunlar 'missing' (boş sayısal
+            hücre), 'non_numeric', 'negative' ve 'type_mismatch' (bildirilen
+            tipe uymayan değer).
+        unknown_categories (dict): Sütun -> {geçersiz değer: adet}.
+        unknown_category_overflow (dict): Sütun -> sınır nedeniyle ayrı
+            tutulamayan geçersiz değerlerin adedi.
+        store_path (str): Yazılan Parquet deposunun yolu (yazılmadıysa `None`).
+    """
+    __slots__ = ("max_examples", "rows", "chunks", "missing_columns", "column_issues", "unknown_categories", "unknown_category_overflow", "store_path")
+
+    def __init__(self, max_examples=5):
+        self.max_examples = max_examples
+        self.rows = 0
+        self.chunks = 0
+        self.missing_columns = []
+        self.column_issues = {}
+        self.unknown_categories = {}
+        self.unknown_category_overflow = {}
+        self.store_path = None
+
+    @property
+    def is_valid(self):
+        """Eksik sütun, hatalı değer veya bilinmeyen kategori bulunmadıysa `True`."""
+        return not (self.missing_columns or self.column_issues or self.unknown_categories)
+
+    def record(self, column, issue, mask, raw_values, row_offset):
+        """Parçadaki sorunlu satırları (`mask`) sayaca ve örnek listesine ekler."""
+        count = int(mask.sum())
+        if not count:
+            return
+        entry = self.column_issues.setdefault((column, issue), {"count": 0, "examples": []})
+        entry["count"] += count
+        free_slots = self.max_examples - len(entry["examples"])
+        if free_slots > 0:
+            positions = np.flatnonzero(mask.to_numpy(dtype=bool))[:free_slots]
+            entry["examples"].extend((row_offset + int(position) + 2, raw_values.iloc[position]) for position in positions)
+
+    def record_unknown_categories(self, column, invalid_values):
+        """Parçadaki geçersiz kategori değerlerini sınırlı sözlüğe ekler."""
+        if invalid_values.empty:
+            return
+        counts = self.unknown_categories.setdefault(column, {})
+        for value, count in invalid_values.value_counts().items():
+            if value in counts or len(counts) < self.max_examples:
+                counts[value] = counts.get(value, 0) + int(count)
+            else:
+                self.unknown_category_overflow[column] = self.unknown_category_overflow.get(column, 0) + int(count)
+
+    def messages(self):
+        """Özeti `normalize_and_validate_data` uyarılarıyla aynı biçimde mesaj listesine çevirir."""
+        messages = [f"Kritik Hata: CSV dosyasında '{col}' sütunu bulunamadı." for col in self.missing_columns]
+        for column, counts in self.unknown_categories.items():
+            total = sum(counts.values()) + self.unknown_category_overflow.get(column, 0)
+            messages.append(f"Veri Hatası: '{column}' sütununda {', '.join(repr(c) for c in VALID_CATEGORIES)} dışında geçersiz değerler var "
+                            f"({total} satır, örn: {', '.join(map(str, counts))}).")
+        templates = {
+            'missing': "Veri Hatası: '{column}' sütununda boş değerler var",
+            'non_numeric': "Veri Hatası: '{column}' sütunu sayısal olmayan değerler içeriyor",
+            'negative': "Veri Hatası: '{column}' sütununda negatif değerler bulunmamalıdır",
+            'type_mismatch': "Veri Hatası: '{column}' sütunu '{dtype}' tipine uymayan değerler içeriyor",
+        }
+        for (column, issue), entry in self.column_issues.items():
+            rows = ', '.join(str(row) for row, _ in entry["examples"])
+            messages.append(templates[issue].format(column=column, dtype=ERP_COLUMN_DTYPES.get(column)) + f" ({entry['count']} satır, ilk satırlar: {rows}).")
+        return messages
+
+def _normalize_chunk(chunk, declared_dtypes, report, row_offset):
+    """(İÇ) Bir CSV parçasını bildirilen tiplere dönüştürür ve sorunları rapora işler.
+
+    Bildirilen tipe dönüştürülemeyen değerler sayılır ve boş bırakılır; böylece
+    parça her zaman depo şemasına uyar.
+    """
+    for column, dtype in declared_dtypes.items():
+        values = chunk[column]
+        if dtype is None or dtype == 'category':
+            values = values.str.strip()
+            if column == 'Kategori':
+                report.record_unknown_categories(column, values[values.notna() & ~values.isin(VALID_CATEGORIES)])
+            if dtype:
+                values = values.astype('category')
+        elif dtype == 'bool':
+            if not pd.api.types.is_bool_dtype(values):
+                parsed = values.astype(str).str.strip().str.lower().map(_BOOL_VALUES)
+                report.record(column, 'type_mismatch', parsed.isna() & values.notna(), values, row_offset)
+                values = parsed
+        else:
+            numeric = pd.to_numeric(values, errors='coerce')
+            report.record(column, 'missing', values.isna(), values, row_offset)
+            report.record(column, 'non_numeric', numeric.isna() & values.notna(), values, row_offset)
+            if column in NUMERIC_COLUMNS:
+                report.record(column, 'negative', numeric < 0, values, row_offset)
+            if dtype.startswith('int'):
+                bounds = np.iinfo(dtype)
+                mismatch = numeric.notna() & ((numeric % 1 != 0) | (numeric < bounds.min) | (numeric > bounds.max))
+                report.record(column, 'type_mismatch', mismatch, values, row_offset)
+                numeric = numeric.mask(mismatch)
+            values = numeric
+        chunk[column] = values
+    chunk['Tedarik_Suresi_Gun'] = _lead_time_days(chunk['Tedarik_Suresi_Hafta'])
+    return chunk
+
+def stream_validate_erp_csv(file_path, cache_dir=None, chunksize=ERP_CHUNK_ROWS, max_examples=5):
+    """Belleğe sığmayan ERP CSV dosyalarını parça parça doğrular ve sütunsal depoya yazar.
+
+    Dosya `chunksize` satırlık parçalar halinde okunur; her parça
+    `ERP_COLUMN_DTYPES` tiplerine dönüştürülür, metin sütunları temizlenir ve
+    sorunlar `ErpValidationReport` içinde sınırlı boyutlu özetlere işlenir.
+    Tüm tablo hiçbir zaman belleğe alınmaz ve kopyalanmaz; tepe bellek dosya
+    boyutundan bağımsız olarak parça boyutuyla sınırlıdır. `cache_dir`
+    verilirse normalize edilmiş parçalar geçici bir Parquet dosyasına satır
+    grupları olarak yazılır. Dosya hatasız doğrulanırsa `erp_cache_path`
+    yoluna taşınır ve sonraki `load_erp_data` çağrıları onu okur. İlk sorunda
+    yazma bırakılır, ancak doğrulama özetin tamamlanması için sürer.
+
+    Args:
+        file_path (str): Doğrulanacak CSV dosyasının yolu.
+        cache_dir (str, optional): Parquet deposunun dizini. `None` ise
+            yalnızca doğrulama yapılır.
+        chunksize (int, optional): Parça başına satır sayısı.
+        max_examples (int, optional): Sorun başına saklanan örnek sayısı.
+
+    Returns:
+        ErpValidationReport: Doğrulama özeti. Zorunlu sütunlar eksikse dosya
+            taranmadan döndürülür.
+
+    Raises:
+        pd.errors.EmptyDataError: Dosya boşsa.
+        ImportError: `cache_dir` verilmiş ve 'pyarrow' kurulu değilse.
+    """
+    report = ErpValidationReport(max_examples)
+    columns = list(pd.read_csv(file_path, nrows=0).columns)
+    report.missing_columns = [col for col in REQUIRED_COLUMNS if col not in columns]
+    if report.missing_columns:
+        return report
+
+    declared_dtypes = {col: ERP_COLUMN_DTYPES.get(col) for col in columns}
+    text_dtypes = {col: str for col, dtype in declared_dtypes.items() if dtype in (None, 'category')}
+    writer = schema = None
+    cache_path = erp_cache_path(file_path, cache_dir) if cache_dir else None
+    temporary_path = f"{cache_path}.{os.getpid()}.tmp" if cache_path else None
+    if cache_path:
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as exc:
+            raise ImportError("Sütunsal ERP deposu için 'pyarrow' paketinin kurulu olması gerekir.") from exc
+        arrow_types = {'category': pa.dictionary(pa.int32(), pa.string()), 'int32': pa.int32(), 'int16': pa.int16(), 'float64': pa.float64(), 'bool': pa.bool_()}
+        fields = {col: arrow_types[dtype] if dtype else pa.string() for col, dtype in declared_dtypes.items()}
+        fields['Tedarik_Suresi_Gun'] = arrow_types[ERP_COLUMN_DTYPES['Tedarik_Suresi_Gun']]
+        schema = pa.schema(list(fields.items()))
+        os.makedirs(cache_dir, exist_ok=True)
+        writer = pq.ParquetWriter(temporary_path, schema)
+
+    try:
+        for chunk in pd.read_csv(file_path, dtype=text_dtypes, chunksize=chunksize):
+            chunk = _normalize_chunk(chunk, declared_dtypes, report, report.rows)
+            report.rows += len(chunk)
+            report.chunks += 1
+            if writer is not None and not report.is_valid:
+                writer.close()
+                writer = None
+                os.remove(temporary_path)
+            if writer is not None:
+                writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+    except BaseException:
+        if writer is not None:
+            writer.close()
+            os.remove(temporary_path)
+        raise
+
+    if writer is not None:
+        writer.close()
+        if report.rows:
+            os.replace(temporary_path, cache_path)
+            report.store_path = cache_path
+        else:
+            os.remove(temporary_path)
+    logger.info(f"'{file_path}' akış halinde doğrulandı: {report.rows} satır, {report.chunks} parça, {len(report.messages())} uyarı.")
+    return report
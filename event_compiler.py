@@ -0,0 +1,178 @@
+import copy
+
+import numpy as np
+from variance_reduction import norm_ppf
+
+IMPACT_CHANNELS = ("satisfaction_shock", "otif", "uretim_kaybi", "net_kar")
+MULTIPLIER_EVENT_TYPES = ("demand", "reputation")
+
+class ConstantSampler:
+    """Sabit bir etki değerini döndüren örnekleyici."""
+    __slots__ = ("value",)
+
+    def __init__(self, value):
+        self.value = float(value)
+
+    def draw(self, rng):
+        return self.value
+
+    def sample(self, generator, size):
+        return np.full(size, self.value)
+
+    def ppf(self, u):
+        return np.full(len(u), self.value)
+
+    @property
+    def mean(self):
+        return self.value
+
+class UniformSampler:
+    """`{"dist": "uniform", "min": .., "max": ..}` tanımı için örnekleyici."""
+    __slots__ = ("low", "high")
+
+    def __init__(self, low, high):
+        self.low = low
+        self.high = high
+
+    def draw(self, rng):
+        return rng.uniform(self.low, self.high)
+
+    def sample(self, generator, size):
+        return generator.uniform(self.low, self.high, size)
+
+    def ppf(self, u):
+        return self.low + (self.high - self.low) * u
+
+    @property
+    def mean(self):
+        return (self.low + self.high) / 2
+
+class NormalSampler:
+    """`{"dist": "normal", "mean": .., "std": ..}` tanımı için örnekleyici."""
+    __slots__ = ("mean", "std")
+
+    def __init__(self, mean, std):
+        self.mean = mean
+        self.std = std
+
+    def draw(self, rng):
+        return rng.normalvariate(self.mean, self.std)
+
+    def sample(self, generator, size):
+        return generator.normal(self.mean, self.std, size)
+
+    def ppf(self, u):
+        return self.mean + self.std * norm_ppf(u)
+
+def make_sampler(effect):
+    """Bir etki tanımını (sabit sayı veya `dist` sözlüğü) örnekleyici nesnesine dönüştürür.
+
+    `draw(rng)` tek bir değer için `random.Random` arayüzünü, `sample(generator, size)`
+    ise toplu çekiliş için `np.random.Generator` arayüzünü kullanır. `ppf(u)`
+    düzgün U(0, 1) değerlerini dağılımın ters birikimli fonksiyonuyla dönüştürür
+    (karşıt ve yarı-rastgele örnekleme için); `mean` beklenen değerdir.
+    """
+    if isinstance(effect, dict) and 'dist' in effect:
+        if effect['dist'] == 'uniform':
+            return UniformSampler(effect['min'], effect['max'])
+        elif effect['dist'] == 'normal':
+            return NormalSampler(effect['mean'], effect['std'])
+        raise ValueError(f"Bilinmeyen dağılım türü: '{effect['dist']}'")
+    return ConstantSampler(effect)
+
+class CompiledEventLibrary:
+    """`EVENT_LIBRARY` ve `DOMINO_RULES`'un tamsayı kimliklerle indekslenmiş derlenmiş hali.
+
+    Simülasyon motorları sıcak döngüde olay adları ve iç içe sözlükler yerine
+    bu tablodaki dizileri ve önceden oluşturulmuş örnekleyicileri kullanır.
+
+    Attributes:
+        names (list): Olay adları; bir olayın kimliği bu listedeki indeksidir.
+        ids (dict): Olay adından kimliğe eşleme.
+        none_id (int): "Kriz Yok" olayının kimliği.
+        types (list): Olay türleri ('logistics', 'demand' vb.).
+        is_active (np.ndarray): Olayın bir etkisi olup olmadığı (tür 'none' değilse).
+        is_geographic (np.ndarray): Olayın coğrafi olarak sınırlanıp sınırlanmadığı.
+        has_channel (np.ndarray): (olay × kanal) boyutlu; olayın `IMPACT_CHANNELS`
+            içindeki etki kanalına sahip olup olmadığı.
+        samplers (list): (olay × kanal) boyutlu örnekleyici tablosu; kanal yoksa `None`.
+        net_kar_multiplier (np.ndarray): Olayın kâr çarpanı (uygulanmıyorsa 1.0).
+        intervention_ids (dict): (olay kimliği, müdahale adı) -> müdahale kimliği.
+        intervention_cost (np.ndarray): Müdahale maliyetleri.
+        intervention_mitigation (np.ndarray): Müdahale azaltım faktörleri.
+        intervention_net_kar_multiplier (np.ndarray): Müdahale kâr çarpanları (yoksa 1.0).
+        domino_trigger (np.ndarray): Tetiklenen olayın kimliği (kural yoksa -1).
+        domino_delay (np.ndarray): Tetiklemenin ay cinsinden gecikmesi.
+        domino_probability (np.ndarray): Tetiklenme olasılığı.
+    """
+    def __init__(self, event_library, domino_rules):
+        self.names = list(event_library.keys())
+        self.ids = {name: event_id for event_id, name in enumerate(self.names)}
+        self.none_id = self.ids.get("Kriz Yok", -1)
+        self._source_snapshot = copy.deepcopy((event_library, domino_rules))
+
+        num_events = len(self.names)
+        self.types = [event.get("type", "none") for event in event_library.values()]
+        self.is_active = np.array([event_type != "none" for event_type in self.types], dtype=bool)
+        self.is_geographic = np.array([event.get("is_geographic", False) for event in event_library.values()], dtype=bool)
+
+        self.has_channel = np.zeros((num_events, len(IMPACT_CHANNELS)), dtype=bool)
+        self.samplers = [[None] * len(IMPACT_CHANNELS) for _ in range(num_events)]
+        self.net_kar_multiplier = np.ones(num_events)
+
+        intervention_cost, intervention_mitigation, intervention_multiplier = [], [], []
+        self.intervention_ids = {}
+
+        for event_id, event in enumerate(event_library.values()):
+            impact = event.get("impact", {})
+            for channel_idx, channel in enumerate(IMPACT_CHANNELS):
+                if channel in impact:
+                    self.has_channel[event_id, channel_idx] = True
+                    self.samplers[event_id][channel_idx] = make_sampler(impact[channel])
+            if "net_kar_multiplier" in impact and event.get("type") in MULTIPLIER_EVENT_TYPES:
+                self.net_kar_multiplier[event_id] = impact["net_kar_multiplier"]
+
+            for intervention_name, intervention in event.get("interventions", {}).items():
+                self.intervention_ids[(event_id, intervention_name)] = len(intervention_cost)
+                intervention_cost.append(intervention["cost"])
+                intervention_mitigation.append(intervention["mitigation_factor"])
+                intervention_multiplier.append(intervention.get("net_kar_multiplier", 1.0))
+
+        self.intervention_cost = np.array(intervention_cost, dtype=float)
+        self.intervention_mitigation = np.array(intervention_mitigation, dtype=float)
+        self.intervention_net_kar_multiplier = np.array(intervention_multiplier, dtype=float)
+
+        self.domino_trigger = np.full(num_events, -1, dtype=np.int64)
+        self.domino_delay = np.zeros(num_events, dtype=np.int64)
+        self.domino_probability = np.zeros(num_events)
+        for source_name, rule in domino_rules.items():
+            if source_name in self.ids:
+                source_id = self.ids[source_name]
+                self.domino_trigger[source_id] = self.ids[rule["triggers"]]
+                self.domino_delay[source_id] = rule["delay"]
+                self.domino_probability[source_id] = rule["probability"]
+
+    def is_stale(self, event_library, domino_rules):
+        """Kaynak sözlüklerin içeriği derlemeden bu yana değişmişse `True` döndürür.
+
+        Derleme anındaki sözlüklerin derin kopyasıyla içerik karşılaştırılır;
+        böylece olay ekleme ve çıkarmanın yanında iç içe değerlerin (örn: etki
+        dağılımı parametreleri, Domino olasılıkları) yerinde değiştirilmesi de
+        algılanır.
+        """
+        return (event_library, domino_rules) != self._source_snapshot
+
+    def event_id(self, event_name):
+        """Olay adının kimliğini döndürür; bilinmeyen adlar için `KeyError` fırlatır."""
+        return self.ids[event_name]
+
+    def intervention_id(self, event_id, intervention_name):
+        """Bir olayın müdahalesinin kimliğini döndürür; olayda tanımlı değilse `KeyError` fırlatır."""
+        return self.intervention_ids[(event_id, intervention_name)]
+
+    def __len__(self):
+        return len(self.names)
+
+def compile_event_library(event_library, domino_rules):
+    """Olay kütüphanesini ve Domino kurallarını `CompiledEventLibrary` tablosuna derler."""
+    return CompiledEventLibrary(event_library, domino_rules)
@@ -0,0 +1,353 @@
+import numpy as np
+from collections import Counter
+from statistics import NormalDist
+
+MC_METRICS = ("annual_profits", "final_otifs", "final_flexibility", "final_satisfaction", "co2_savings")
+
+def z_score(confidence):
+    """İki yönlü `confidence` güven düzeyine karşılık gelen standart normal kritik değeri döndürür."""
+    return NormalDist().inv_cdf(0.5 + confidence / 2)
+
+class RunningMoments:
+    """Welford/Chan algoritmasıyla akan veri için ortalama ve varyans tutar.
+
+    Dizi halinde gelen bloklar tek seferde eklenir; iki örnek `merge` ile
+    sayısal olarak kararlı biçimde birleştirilebilir.
+    """
+    __slots__ = ("count", "mean", "m2")
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def _combine(self, count, mean, m2):
+        total = self.count + count
+        if total == 0:
+            return
+        delta = mean - self.mean
+        self.mean += delta * count / total
+        self.m2 += m2 + delta * delta * self.count * count / total
+        self.count = total
+
+    def update(self, values):
+        values = np.asarray(values, dtype=float).ravel()
+        if values.size:
+            block_mean = values.mean()
+            self._combine(values.size, block_mean, float(((values - block_mean) ** 2).sum()))
+
+    def merge(self, other):
+        self._combine(other.count, other.mean, other.m2)
+
+    @property
+    def variance(self):
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def std(self):
+        return self.variance ** 0.5
+
+    @property
+    def standard_error(self):
+        return (self.variance / self.count) ** 0.5 if self.count > 1 else float("inf")
+
+class QuantileSketch:
+    """Sabit boyutlu, birleştirilebilir (KLL benzeri) bir kantil özeti.
+
+    Değerler ağırlığı 2^seviye olan sıkıştırıcı seviyelerinde tutulur. Bir
+    seviye kapasitesini aştığında sıralanır ve elemanların rastgele yarısı bir
+    üst seviyeye taşınır. Bellek kullanımı gözlem sayısından bağımsız olarak
+    yaklaşık `3k` eleman ile sınırlıdır; sıra hatası `O(1/k)` mertebesindedir.
+    """
+    __slots__ = ("k", "levels", "count", "min", "max", "_rng")
+
+    def __init__(self, k=200, seed=None):
+        self.k = k
+        self.levels = [np.empty(0)]
+        self.count = 0
+        self.min = float("inf")
+        self.max = float("-inf")
+        self._rng = np.random.default_rng(seed)
+
+    def _capacity(self, level):
+        depth = len(self.levels) - 1 - level
+        return max(2, int(np.ceil(self.k * (2 / 3) ** depth)))
+
+    def _compress(self):
+        level = 0
+        while level < len(self.levels):
+            items = self.levels[level]
+            if items.size > self._capacity(level):
+                if level + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                items = np.sort(items)
+                leftover = items[-1:] if items.size % 2 else items[:0]
+                paired = items[:items.size - leftover.size]
+                promoted = paired[self._rng.integers(2)::2]
+                self.levels[level] = leftover
+                self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+            level += 1
+
+    def update(self, values):
+        values = np.asarray(values, dtype=float).ravel()
+        if not values.size:
+            return
+        self.count += values.size
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self._compress()
+
+    def merge(self, other):
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for level, items in enumerate(other.levels):
+            self.levels[level] = np.concatenate([self.levels[level], items])
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._compress()
+
+    def _weighted_items(self):
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(level_items.size, 2.0 ** level) for level, level_items in enumerate(self.levels)])
+        order = np.argsort(items, kind="stable")
+        return items[order], weights[order]
+
+    def quantile(self, q):
+        """`q` kantilinin (0-1) yaklaşık değerini döndürür."""
+        if self.count == 0:
+            return float("nan")
+        if q <= 0:
+            return self.min
+        if q >= 1:
+            return self.max
+        items, weights = self._weighted_items()
+        cumulative = np.cumsum(weights)
+        position = np.searchsorted(cumulative, q * cumulative[-1], side="left")
+        return float(items[min(position, items.size - 1)])
+
+    def fraction_at_least(self, threshold):
+        """`threshold` değerine eşit veya büyük gözlemlerin yaklaşık oranını döndürür."""
+        if self.count == 0:
+            return float("nan")
+        items, weights = self._weighted_items()
+        return float(weights[items >= threshold].sum() / weights.sum())
+
+    def __len__(self):
+        return sum(level.size for level in self.levels)
+
+class RunReservoir:
+    """Akan tekrar kayıtlarından sabit boyutlu, düzgün dağılımlı bir örneklem tutar (Algoritma R)."""
+    __slots__ = ("capacity", "seen", "records", "_rng")
+
+    def __init__(self, capacity=5000, seed=None):
+        self.capacity = capacity
+        self.seen = 0
+        self.records = []
+        self._rng = np.random.default_rng(seed)
+
+    def update(self, num_records, build_record):
+        """`num_records` yeni tekrarı işler; kayıtlar yalnızca örnekleme girenler için oluşturulur.
+
+        Args:
+            num_records (int): Bloktaki tekrar sayısı.
+            build_record (callable): Blok içi indeksten kayıt sözlüğü üreten fonksiyon.
+        """
+        fill = min(num_records, max(0, self.capacity - len(self.records)))
+        self.records.extend(build_record(i) for i in range(fill))
+        if fill < num_records:
+            positions = self.seen + np.arange(fill, num_records)
+            slots = self._rng.integers(0, positions + 1)
+            for i in np.flatnonzero(slots < self.capacity) + fill:
+                self.records[slots[i - fill]] = build_record(int(i))
+        self.seen += num_records
+
+    def merge(self, other):
+        total_seen = self.seen + other.seen
+        size = min(self.capacity, len(self.records) + len(other.records))
+        if size == len(self.records) + len(other.records):
+            self.records = self.records + other.records
+        else:
+            from_self = int(self._rng.hypergeometric(self.seen, other.seen, size)) if other.seen else size
+            from_self = min(max(from_self, size - len(other.records)), len(self.records))
+            self_idx = self._rng.choice(len(self.records), from_self, replace=False)
+            other_idx = self._rng.choice(len(other.records), size - from_self, replace=False)
+            self.records = [self.records[i] for i in self_idx] + [other.records[i] for i in other_idx]
+        self.seen = total_seen
+
+class MonteCarloAccumulator:
+    """Monte Carlo sonuçlarını sabit boyutlu çevrimiçi özetlerde toplar.
+
+    Her metrik için Welford momentleri, kantil özeti ve eşik aşım sayaçları;
+    tüm çalışma için kriz görülme sayaçları ve grafikler için sınırlı bir tekrar
+    örneklemi tutar. Bloklar halinde beslenir ve paralel işçilerden gelen
+    örnekler `merge` ile birleştirilebilir.
+
+    Attributes:
+        count (int): İşlenen toplam tekrar sayısı.
+        moments (dict): Metrik adı -> `RunningMoments`.
+        sketches (dict): Metrik adı -> `QuantileSketch`.
+        thresholds (dict): Metrik adı -> izlenen eşik değerleri listesi.
+        exceedances (dict): (metrik adı, eşik) -> eşiğe eşit/üstü tekrar sayısı.
+        event_counts (Counter): Kriz adı -> toplam görülme sayısı.
+        domino_runs (int): En az bir Domino Etkisi görülen tekrar sayısı.
+        reservoir (RunReservoir): Tekrar kayıtlarından düzgün örneklem.
+        batch_quantiles (dict): (metrik adı, kantil) -> blok başına kantil
+            tahminlerinin `RunningMoments`'i (batch means güven aralıkları için).
+    """
+    def __init__(self, metrics=MC_METRICS, thresholds=None, sketch_k=200, reservoir_size=5000, seed=None, batch_quantiles=None):
+        seed_sequence = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+        sketch_seeds = seed_sequence.spawn(len(metrics) + 1)
+        self.metrics = tuple(metrics)
+        self.count = 0
+        self.moments = {metric: RunningMoments() for metric in self.metrics}
+        self.sketches = {metric: QuantileSketch(sketch_k, sketch_seeds[i]) for i, metric in enumerate(self.metrics)}
+        self.thresholds = {metric: list(values) for metric, values in (thresholds or {}).items()}
+        self.exceedances = {(metric, value): 0 for metric, values in self.thresholds.items() for value in values}
+        self.event_counts = Counter()
+        self.domino_runs = 0
+        self.reservoir = RunReservoir(reservoir_size, sketch_seeds[-1])
+        self.batch_quantiles = {(metric, q): RunningMoments() for metric, qs in (batch_quantiles or {}).items() for q in qs}
+
+    def update(self, metric_arrays, realized_events, first_run_id=1):
+        """Bir blok tekrarın sonuçlarını özetlere ekler.
+
+        Args:
+            metric_arrays (dict): Metrik adı -> tekrar başına değer dizisi.
+            realized_events (list): Her tekrar için `{"event", "source"}` listesi.
+            first_run_id (int, optional): Bloğun ilk tekrarının kimliği.
+        """
+        arrays = {metric: np.asarray(metric_arrays[metric], dtype=float) for metric in self.metrics}
+        num_runs = len(realized_events)
+        for metric, values in arrays.items():
+            self.moments[metric].update(values)
+            self.sketches[metric].update(values)
+        for (metric, value) in self.exceedances:
+            self.exceedances[(metric, value)] += int((arrays[metric] >= value).sum())
+        for (metric, q), moments in self.batch_quantiles.items():
+            if num_runs:
+                moments.update([np.quantile(arrays[metric], q)])
+
+        for run_events in realized_events:
+            self.event_counts.update(event["event"] for event in run_events)
+            self.domino_runs += any(event["source"] == "Domino Etkisi" for event in run_events)
+
+        def build_record(i):
+            record = {"run_id": first_run_id + i}
+            record.update({metric: float(values[i]) for metric, values in arrays.items()})
+            record["realized_events"] = realized_events[i]
+            return record
+
+        self.reservoir.update(num_runs, build_record)
+        self.count += num_runs
+
+    def merge(self, other):
+        """Başka bir birikimciyi (örn. paralel bir işçiden gelen) bu nesneye ekler."""
+        for metric in self.metrics:
+            self.moments[metric].merge(other.moments[metric])
+            self.sketches[metric].merge(other.sketches[metric])
+        for key, value in other.exceedances.items():
+            self.exceedances[key] = self.exceedances.get(key, 0) + value
+        for key, moments in other.batch_quantiles.items():
+            self.batch_quantiles.setdefault(key, RunningMoments()).merge(moments)
+        self.event_counts.update(other.event_counts)
+        self.domino_runs += other.domino_runs
+        self.reservoir.merge(other.reservoir)
+        self.count += other.count
+        return self
+
+    def mean(self, metric):
+        return self.moments[metric].mean
+
+    def std(self, metric):
+        return self.moments[metric].std
+
+    def quantile(self, metric, q):
+        return self.sketches[metric].quantile(q)
+
+    def probability_at_least(self, metric, threshold):
+        """Metriğin `threshold` veya üstünde olma olasılığı; eşik izleniyorsa kesin sayaçtan hesaplanır."""
+        if self.count == 0:
+            return float("nan")
+        if (metric, threshold) in self.exceedances:
+            return self.exceedances[(metric, threshold)] / self.count
+        return self.sketches[metric].fraction_at_least(threshold)
+
+    def estimate(self, target):
+        """Bir hassasiyet hedefinin nokta tahminini döndürür.
+
+        Args:
+            target (tuple): `("mean", metrik)`, `("quantile", metrik, q)` veya
+                `("probability", metrik, eşik)`.
+        """
+        kind, metric = target[0], target[1]
+        if kind == "mean":
+            return self.mean(metric)
+        if kind == "quantile":
+            return self.quantile(metric, target[2])
+        if kind == "probability":
+            return self.probability_at_least(metric, target[2])
+        raise ValueError(f"Bilinmeyen hassasiyet hedefi: '{kind}'")
+
+    def half_width(self, target, confidence=0.95):
+        """Bir hassasiyet hedefi için güven aralığının yarı genişliğini döndürür.
+
+        Ortalama için standart hata, olasılık için binom (Wald) yaklaşımı,
+        kantil için ise blok başına kantil tahminlerinin standart hatası
+        (batch means) kullanılır. Yeterli veri yoksa `inf` döner.
+        """
+        kind, metric = target[0], target[1]
+        z = z_score(confidence)
+        if kind == "mean":
+            return z * self.moments[metric].standard_error
+        if kind == "quantile":
+            batch_moments = self.batch_quantiles.get((metric, target[2]))
+            return z * batch_moments.standard_error if batch_moments is not None else float("inf")
+        if kind == "probability":
+            if self.count == 0:
+                return float("inf")
+            p = self.probability_at_least(metric, target[2])
+            return z * (p * (1 - p) / self.count) ** 0.5
+        raise ValueError(f"Bilinmeyen hassasiyet hedefi: '{kind}'")
+
+    @property
+    def samples(self):
+        """Grafikler için tutulan tekrar kayıtları (en fazla `reservoir_size` adet)."""
+        return self.reservoir.records
+
+def paired_difference_summary(values, reference=0, confidence=0.95):
+    """Ortak rastgele sayılarla eşlenmiş tekrarlardan strateji farklarını ve güven aralıklarını hesaplar.
+
+    `values` (strateji × tekrar) boyutludur ve her sütun aynı rastgele
+    çekilişleri görmüş tekrarları içerir. Fark, tekrar başına
+    `values[i] - values[reference]` olarak alındığından ortak gürültü
+    birbirini götürür; karşılaştırma için bağımsız örneklemlerle elde
+    edilecek standart hata da raporlanır.
+
+    Returns:
+        dict: Her anahtarı strateji başına bir değer içeren dizi olan sözlük.
+            Anahtarlar: 'mean', 'difference', 'standard_error', 'ci_low',
+            'ci_high', 'independent_standard_error'.
+    """
+    values = np.asarray(values, dtype=float)
+    num_runs = values.shape[1]
+    differences = values - values[reference]
+    difference = differences.mean(axis=1)
+    if num_runs > 1:
+        standard_error = differences.std(axis=1, ddof=1) / num_runs ** 0.5
+        variances = values.var(axis=1, ddof=1)
+        independent_standard_error = np.sqrt((variances + variances[reference]) / num_runs)
+        independent_standard_error[reference] = 0.0
+    else:
+        standard_error = np.full(values.shape[0], np.inf)
+        independent_standard_error = np.full(values.shape[0], np.inf)
+    half_width = z_score(confidence) * standard_error
+    return {
+        "mean": values.mean(axis=1),
+        "difference": difference,
+        "standard_error": standard_error,
+        "ci_low": difference - half_width,
+        "ci_high": difference + half_width,
+        "independent_standard_error": independent_standard_error,
+    }
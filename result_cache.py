@@ -0,0 +1,134 @@
+import os
+import copy
+import json
+import pickle
+import hashlib
+import logging
+from collections import OrderedDict
+from collections.abc import Mapping
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+def fingerprint_value(value):
+    """DataFrame'leri ve NumPy dizilerini içerik özetine çevirerek değerleri JSON ile serileştirilebilir hale getirir."""
+    if isinstance(value, pd.DataFrame):
+        return hashlib.sha256(pd.util.hash_pandas_object(value, index=True).values.tobytes() + str(list(value.columns)).encode()).hexdigest()
+    if isinstance(value, np.ndarray):
+        return hashlib.sha256(np.ascontiguousarray(value).tobytes() + f"{value.dtype}{value.shape}".encode()).hexdigest()
+    return str(value)
+
+def _normalize_keys(value):
+    """(İÇ) Eşlemeleri, tür etiketli anahtara göre sıralı (anahtar, değer) çiftlerine dönüştürür.
+
+    JSON nesne anahtarları yalnızca metin olabildiğinden `{1: x}` ile `{"1": x}`
+    aynı gösterime düşer ve karışık türlü anahtarlar `sort_keys` ile sıralanamaz;
+    anahtarın tür adıyla etiketlenmesi her iki sorunu da giderir.
+    """
+    if isinstance(value, Mapping):
+        return [[[type(key).__name__, str(key)], _normalize_keys(item)]
+                for key, item in sorted(value.items(), key=lambda pair: (type(pair[0]).__name__, str(pair[0])))]
+    if isinstance(value, (list, tuple)):
+        return [_normalize_keys(item) for item in value]
+    return value
+
+def content_key(*parts):
+    """Verilen parçaların (parametreler, senaryo, yapılandırma, tohum vb.) kararlı SHA-256 özetini döndürür.
+
+    Özet, Python'un süreç başına rastgeleleştirilen `hash()` değerine değil
+    içeriğin JSON gösterimine dayandığından süreçler ve oturumlar arasında aynıdır.
+    Sözlük anahtarları türleriyle birlikte özetlenir (bkz. `_normalize_keys`).
+    """
+    return hashlib.sha256(json.dumps(_normalize_keys(parts), default=fingerprint_value).encode()).hexdigest()
+
+class ResultCache:
+    """İçerik adresli, bellekte LRU tahliyeli ve isteğe bağlı disk katmanlı sonuç önbelleği.
+
+    Anahtarlar `content_key` ile üretilir. Bellek katmanı en fazla
+    `max_entries` sonucu tutar ve en uzun süredir kullanılmayanı çıkarır;
+    `directory` verilirse sonuçlar ayrıca pickle dosyaları olarak diske yazılır
+    ve bellekte bulunamayan anahtarlar oradan okunur. Sonuçlar önbelleğe
+    yazılırken ve okunurken kopyalanır; çağıranın sonuçları değiştirmesi
+    önbelleği bozmaz.
+
+    Attributes:
+        max_entries (int): Bellek katmanındaki en fazla sonuç sayısı.
+        directory (str): Disk katmanının dizini (`None` ise yalnızca bellek).
+        hits (int): Bellekten veya diskten karşılanan istek sayısı.
+        disk_hits (int): `hits` içinden disk katmanından karşılananlar.
+        misses (int): Hesaplama gerektiren istek sayısı.
+    """
+    def __init__(self, max_entries=64, directory=None):
+        self.max_entries = max_entries
+        self.directory = directory
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.pkl")
+
+    def _remember(self, key, value):
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def get(self, key, default=None):
+        """Anahtarın sonucunu döndürür; bulunamazsa `default` döndürür ve ıska sayar."""
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return copy.deepcopy(self._entries[key])
+        if self.directory and os.path.exists(self._path(key)):
+            try:
+                with open(self._path(key), "rb") as cache_file:
+                    value = pickle.load(cache_file)
+            except (OSError, pickle.UnpicklingError, EOFError) as exc:
+                logger.warning(f"Önbellek dosyası okunamadı, yeniden hesaplanacak: {exc}")
+            else:
+                self._remember(key, value)
+                self.hits += 1
+                self.disk_hits += 1
+                return copy.deepcopy(value)
+        self.misses += 1
+        return default
+
+    def put(self, key, value):
+        """Sonucu bellek katmanına ve (varsa) disk katmanına yazar."""
+        value = copy.deepcopy(value)
+        self._remember(key, value)
+        if self.directory:
+            os.makedirs(self.directory, exist_ok=True)
+            temporary_path = f"{self._path(key)}.{os.getpid()}.tmp"
+            with open(temporary_path, "wb") as cache_file:
+                pickle.dump(value, cache_file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temporary_path, self._path(key))
+
+    def get_or_compute(self, key, compute):
+        """Anahtar önbellekteyse sonucunu, değilse `compute()` sonucunu önbelleğe yazıp döndürür."""
+        missing = object()
+        value = self.get(key, missing)
+        if value is missing:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def clear(self):
+        """Bellek ve disk katmanlarını boşaltır; sayaçları sıfırlar."""
+        self._entries.clear()
+        if self.directory and os.path.isdir(self.directory):
+            for file_name in os.listdir(self.directory):
+                if file_name.endswith(".pkl"):
+                    os.remove(os.path.join(self.directory, file_name))
+        self.hits = self.disk_hits = self.misses = 0
+
+    def stats(self):
+        """İsabet/ıska sayaçlarını ve bellekteki kayıt sayısını döndürür."""
+        return {"hits": self.hits, "disk_hits": self.disk_hits, "misses": self.misses, "entries": len(self._entries)}
+
+    def __len__(self):
+        return len(self._entries)
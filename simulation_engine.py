@@ -2,15 +2,73 @@ import pandas as pd
 import numpy as np
 import random
 import logging
+import os
 import optuna
+from concurrent.futures import ProcessPoolExecutor, as_completed, wait
 from datetime import timedelta
+from itertools import product
+from collections import OrderedDict, deque
 
 from event_library import EVENT_LIBRARY, DOMINO_RULES
+from event_compiler import compile_event_library, IMPACT_CHANNELS, NormalSampler
+from mc_statistics import MonteCarloAccumulator, RunningMoments, MC_METRICS, z_score, paired_difference_summary
+from variance_reduction import make_uniform_stream, TiledUniformStream, control_variate_mean, ImportanceTilt, effective_sample_size, weighted_tail_risk
+from result_cache import ResultCache, content_key
+from erp_end_state import (ErpGroupProfile, STOCK_POLICY_MULTIPLIERS, WAREHOUSE_BREACH_UTILIZATION, rebalancing_factors, apply_event_factors,
+                            batch_final_erp_state, summarize_warehouse_breaches)
+from strategy_effects import KPI_COLUMNS, _KAR, _OTIF, _MEMNUNIYET, _ESNEKLIK, _STOK_HIZI, STRATEGIC_NOISE, get_strategy_schedule, clear_strategy_schedule_cache
 from config import (CONFIG, URETIM_STRATEJILERI, STOK_STRATEJILERI,
                     MONTH_NAMES, LOCATION_COORDINATES)
 
 logger = logging.getLogger(__name__)
 
+KPI_LABELS = {'otif': "OTIF", 'net_kar_aylik': "Aylık Net Kar", 'musteri_memnuniyeti_skoru': "Müşteri Memnuniyeti",
+              'esneklik_skoru': "Esneklik Skoru", 'stok_devir_hizi': "Stok Devir Hızı"}
+_CH_MEMNUNIYET, _CH_OTIF, _CH_URETIM_KAYBI, _CH_NET_KAR = (IMPACT_CHANNELS.index(channel) for channel in ("satisfaction_shock", "otif", "uretim_kaybi", "net_kar"))
+_EVENT_TABLE = compile_event_library(EVENT_LIBRARY, DOMINO_RULES)
+
+def get_event_table():
+    """Motor yüklenirken derlenen olay tablosunu döndürür.
+
+    `EVENT_LIBRARY` veya `DOMINO_RULES` çalışma anında değiştirilmişse
+    (örn: testlerde yeni bir olay eklenmişse) tablo yeniden derlenir.
+    """
+    global _EVENT_TABLE
+    if _EVENT_TABLE.is_stale(EVENT_LIBRARY, DOMINO_RULES):
+        _EVENT_TABLE = compile_event_library(EVENT_LIBRARY, DOMINO_RULES)
+    return _EVENT_TABLE
+
+_RESULT_CACHE = ResultCache()
+# Önbelleğe alınan sonuçların biçimi değiştiğinde (örn: Monte Carlo kayıtlarına yeni alan eklendiğinde)
+# artırılır; böylece disk katmanındaki eski biçimli sonuçlar okunmaz.
+RESULT_FORMAT_VERSION = 4
+
+def get_result_cache():
+    """Tohumlu simülasyon ve analiz sonuçlarının paylaşılan önbelleğini döndürür."""
+    return _RESULT_CACHE
+
+def configure_result_cache(max_entries=64, directory=None):
+    """Sonuç önbelleğinin boyutunu ve disk dizinini ayarlar.
+
+    Ayarlar değişmemişse mevcut önbellek (ve içeriği) korunur; böylece her
+    arayüz yenilemesinde çağrılabilir.
+    """
+    global _RESULT_CACHE
+    if (_RESULT_CACHE.max_entries, _RESULT_CACHE.directory) != (max_entries, directory):
+        _RESULT_CACHE = ResultCache(max_entries=max_entries, directory=directory)
+    return _RESULT_CACHE
+
+def _cached_result(namespace, seed, compute, *key_parts):
+    """(İÇ) Tohum verilmişse sonucu içerik adresli önbellekten okur veya hesaplayıp yazar.
+
+    Anahtar; işlev adı, sonuç biçimi sürümü, tüm girdiler, olay kütüphanesi ve
+    tohumdan türetilir. Tohumsuz çalıştırmalar rastgele olduğundan önbelleğe alınmaz.
+    """
+    if seed is None:
+        return compute()
+    key = content_key(namespace, RESULT_FORMAT_VERSION, *key_parts, EVENT_LIBRARY, DOMINO_RULES, seed)
+    return _RESULT_CACHE.get_or_compute(key, compute)
+
 def calculate_tahmin_d(params, config):
     """
     Verilen parametreler ve konfigürasyona göre talep tahmin doğruluğunu hesaplar.
@@ -28,6 +86,172 @@ def calculate_tahmin_d(params, config):
              
     return min(0.99, kpi_cfg['talep_tahmin_dogrulugu'] + bonus)
 
+class PlantState:
+    """Tesislerin kapasite, üretim ve ülke bilgisini sabit NumPy dizilerinde tutan kompakt yapı.
+
+    Simülasyon boyunca yalnızca `production` dizisi değişir; tesis tablosu
+    (DataFrame) sadece sonuçlar döndürülürken `to_frame` ile yeniden oluşturulur.
+    Salt okunur (`freeze` ile dondurulmuş) bir üretim dizisi kopyalar arasında
+    paylaşılır ve ancak ilk yazmada (`writable_production`) kopyalanır.
+
+    Attributes:
+        template (pd.DataFrame): Dizilerin üretildiği, değiştirilmeyen tesis tablosu.
+        country_names (np.ndarray): Benzersiz ülke adları (ilk görülme sırasıyla).
+        country_idx (np.ndarray): Her tesisin `country_names` içindeki indeksi.
+        capacity (np.ndarray): Tesislerin yıllık kapasitesi (ton).
+        production (np.ndarray): Tesislerin fiili üretimi (ton).
+    """
+    __slots__ = ("template", "country_names", "country_idx", "capacity", "production")
+
+    def __init__(self, template, country_names, country_idx, capacity, production):
+        self.template = template
+        self.country_names = country_names
+        self.country_idx = country_idx
+        self.capacity = capacity
+        self.production = production
+
+    @classmethod
+    def from_frame(cls, tesis_df):
+        """Bir tesis DataFrame'inden dizi tabanlı durumu oluşturur."""
+        country_idx, country_names = pd.factorize(tesis_df['Ulke'])
+        return cls(tesis_df, np.asarray(country_names), country_idx,
+                   tesis_df['Kapasite_Ton_Yil'].to_numpy(dtype=float),
+                   tesis_df['Fiili_Uretim_Ton'].to_numpy(dtype=float, copy=True))
+
+    def copy(self):
+        """Sabit dizileri paylaşan yeni bir durum döndürür; üretim dizisi yalnızca yazılabilirse kopyalanır."""
+        production = self.production.copy() if self.production.flags.writeable else self.production
+        return PlantState(self.template, self.country_names, self.country_idx, self.capacity, production)
+
+    def freeze(self):
+        """Üretim dizisi salt okunur olan, kopyaları arasında paylaşılabilecek bir durum döndürür."""
+        production = self.production.copy()
+        production.flags.writeable = False
+        return PlantState(self.template, self.country_names, self.country_idx, self.capacity, production)
+
+    def writable_production(self):
+        """Üretim dizisini yazılabilir olarak döndürür; paylaşılan salt okunur dizi ilk yazmada kopyalanır."""
+        if not self.production.flags.writeable:
+            self.production = self.production.copy()
+        return self.production
+
+    def country_mask(self, country):
+        """Verilen ülkedeki tesisler için boolean maske döndürür."""
+        return self.country_names[self.country_idx] == country
+
+    def to_frame(self):
+        """Güncel üretimi içeren tesis DataFrame'ini oluşturur."""
+        tesis_df = self.template.copy()
+        tesis_df['Fiili_Uretim_Ton'] = self.production.copy()
+        return tesis_df
+
+class SimulationState:
+    """Simülasyonun anlık durumunu tutan `__slots__` tabanlı yapı.
+
+    Geriye dönük uyumluluk için sözlük gibi (`state['kpis']`) de okunabilir.
+
+    Attributes:
+        kpis (dict): Anlık KPI değerleri.
+        plants (PlantState): Tesislerin dizi tabanlı üretim durumu.
+        month (int): Simülasyonun bulunduğu ay.
+        initial_investment_cost (float): Başlangıç yatırım maliyetlerinin toplamı.
+    """
+    __slots__ = ("kpis", "plants", "month", "initial_investment_cost")
+
+    def __init__(self, kpis, plants, month=0, initial_investment_cost=0):
+        self.kpis = kpis
+        self.plants = plants
+        self.month = month
+        self.initial_investment_cost = initial_investment_cost
+
+    def __getitem__(self, key):
+        return getattr(self, key)
+
+    def __setitem__(self, key, value):
+        setattr(self, key, value)
+
+    @property
+    def tesisler_df(self):
+        return self.plants.to_frame()
+
+    def copy(self):
+        """KPI sözlüğünü kopyalayan bağımsız bir durum döndürür (üretim dizisi `PlantState.copy` ile)."""
+        return SimulationState(self.kpis.copy(), self.plants.copy(), self.month, self.initial_investment_cost)
+
+    def to_dict(self):
+        """Durumu, `run` çıktısındaki 'initial_state' biçimine dönüştürür."""
+        return {"kpis": self.kpis.copy(), "tesisler_df": self.plants.to_frame(), "month": self.month}
+
+# Başlangıç tesis durumları ve strateji kurulumu sonrası anlık görüntüler. Tesis tablosu içerik
+# özetiyle, yapılandırma bölümleri ise aylık etki tablosunda olduğu gibi nesne kimliğiyle
+# anahtarlanır; kayıtlar bu bölümlere referans tuttuğundan kimlikler yeniden kullanılamaz.
+# Tablonun özeti nesne başına bir kez hesaplanır. Yapılandırma veya tesis tablosu yerinde
+# değiştirilebiliyorsa `sync_simulation_caches` (ya da doğrudan `clear_simulation_caches`) çağrılmalıdır.
+_FRAME_KEYS = OrderedDict()
+_BASE_PLANTS = OrderedDict()
+_SETUP_SNAPSHOTS = OrderedDict()
+_SETUP_SNAPSHOT_LIMIT = 64
+# Önbelleğe alınan kurulum ve aylık etki hesaplarının okuduğu yapılandırma bölümleri.
+SIMULATION_CONFIG_SECTIONS = ('strategy_impacts', 'simulation_parameters', 'kpi_defaults', 'co2_factors')
+_SYNCED_SOURCES_KEY = None
+
+def _remember_snapshot(cache, key, entry, limit):
+    """(İÇ) Bir kaydı LRU sırasıyla önbelleğe ekler ve sınırı aşan en eski kaydı çıkarır."""
+    cache[key] = entry
+    while len(cache) > limit:
+        cache.popitem(last=False)
+    return entry
+
+def clear_simulation_caches():
+    """Tesis durumu, kurulum sonrası anlık görüntü ve aylık etki tablosu önbelleklerini boşaltır.
+
+    İçerik adresli sonuç önbelleği ve kontrol noktaları etkilenmez.
+    """
+    _FRAME_KEYS.clear()
+    _BASE_PLANTS.clear()
+    _SETUP_SNAPSHOTS.clear()
+    clear_strategy_schedule_cache()
+
+def sync_simulation_caches(config, base_data):
+    """Simülasyonu etkileyen yapılandırma bölümleri veya tesis tablosu içerik olarak
+    değiştiyse önbellekleri (`clear_simulation_caches`) boşaltır.
+
+    Her arayüz yenilemesinde çağrılabilir: içerik aynı kaldıkça, tablo yeni bir
+    nesne olarak gelse bile önbellekler korunur.
+
+    Returns:
+        bool: Önbellekler boşaltıldıysa True.
+    """
+    global _SYNCED_SOURCES_KEY
+    tesis_df = base_data['tesisler_df']
+    frame_key = content_key(tesis_df)
+    sources_key = content_key([config[section] for section in SIMULATION_CONFIG_SECTIONS], frame_key)
+    changed = sources_key != _SYNCED_SOURCES_KEY
+    if changed:
+        clear_simulation_caches()
+        _SYNCED_SOURCES_KEY = sources_key
+    _remember_snapshot(_FRAME_KEYS, id(tesis_df), (tesis_df, frame_key), _SETUP_SNAPSHOT_LIMIT)
+    return changed
+
+def _frame_key(tesis_df):
+    """(İÇ) Tesis tablosunun içerik özetini döndürür; özet nesne başına bir kez hesaplanır."""
+    entry = _FRAME_KEYS.get(id(tesis_df))
+    if entry is None:
+        entry = _remember_snapshot(_FRAME_KEYS, id(tesis_df), (tesis_df, content_key(tesis_df)), _SETUP_SNAPSHOT_LIMIT)
+    else:
+        _FRAME_KEYS.move_to_end(id(tesis_df))
+    return entry[1]
+
+def _base_plants(tesis_df):
+    """(İÇ) Bir tesis tablosunun dondurulmuş dizi tabanlı durumunu önbellekten döndürür."""
+    key = _frame_key(tesis_df)
+    plants = _BASE_PLANTS.get(key)
+    if plants is None:
+        plants = _remember_snapshot(_BASE_PLANTS, key, PlantState.from_frame(tesis_df).freeze(), _SETUP_SNAPSHOT_LIMIT)
+    else:
+        _BASE_PLANTS.move_to_end(key)
+    return plants
+
 class KimotoSimulator:
     """Tüm simülasyon mantığını, durumunu ve akışını yöneten merkezi sınıf.
 
@@ -40,13 +264,18 @@ class KimotoSimulator:
         base_data (dict): Simülasyonun başlangıç durumunu içeren veri.
         params (dict): Kullanıcı tarafından seçilen strateji parametreleri.
         config (dict): Genel uygulama yapılandırması.
-        state (dict): Simülasyonun anlık durumunu tutan sözlük.
+        state (SimulationState): Simülasyonun anlık durumu (KPI'lar ve dizi tabanlı tesis verisi).
         history (list): Her ayın sonundaki durumun kaydedildiği liste.
         results_df (pd.DataFrame): Simülasyon bittiğinde oluşturulan sonuç tablosu.
         final_tesis_df (pd.DataFrame): Simülasyon sonundaki tesislerin durum tablosu.
         co2_tasarrufu (float): Simülasyon sonucunda hesaplanan CO2 tasarrufu.
+        rng (random.Random): Tüm olasılıksal çekilişlerin kaynağı.
+        strategy_schedule (np.ndarray): (ay × KPI) boyutlu aylık stratejik etki
+            tablosu; ilk ayda önbellekten alınır.
+        resumed_from_month (int): Son çalıştırmanın devam ettiği kontrol noktasının
+            ayı (kontrol noktası kullanılmadıysa `None`).
     """
-    def __init__(self, base_data, params, config):
+    def __init__(self, base_data, params, config, rng=None):
         """KimotoSimulator nesnesini başlatır.
 
         Args:
@@ -55,17 +284,19 @@ class KimotoSimulator:
             params (dict): Kullanıcı tarafından seçilen strateji parametrelerini
                            içeren sözlük.
             config (dict): Uygulamanın genel yapılandırma sözlüğü.
+            rng (random.Random, optional): Tohumlanmış rastgele sayı üreteci.
+                Verilmezse modül düzeyindeki `random` kullanılır.
         """
         self.base_data = base_data
         self.params = params
         self.config = config
+        self.rng = rng if rng is not None else random
+        self.event_table = get_event_table()
         
-        self.state = {
-            "kpis": self.base_data["initial_kpis"].copy(),
-            "tesisler_df": self.base_data["tesisler_df"].copy(),
-            "month": 0,
-            "initial_investment_cost": 0
-        }
+        self.state = SimulationState(
+            kpis=self.base_data["initial_kpis"].copy(),
+            plants=_base_plants(self.base_data["tesisler_df"]).copy()
+        )
         self.initial_state_after_setup = None 
         self.history = []
         self.summary = {}
@@ -73,6 +304,8 @@ class KimotoSimulator:
         self.results_df = None
         self.final_tesis_df = None
         self.co2_tasarrufu = 0
+        self.strategy_schedule = None
+        self.resumed_from_month = None
         logger.info(f"KimotoSimulator başlatıldı. Parametreler: {self.params}")
 
     def _apply_strategic_effects(self):
@@ -82,50 +315,21 @@ class KimotoSimulator:
         stratejisi, stok politikası gibi kararların KPI'lar (OTIF, net kar,
         stok devir hızı vb.) üzerindeki sürekli etkilerini simülasyon
         durumuna yansıtır.
-        """
-        cfg_sim = self.config['simulation_parameters']
-        cfg_strat = self.config['strategy_impacts']
-        months_in_year = cfg_sim['months_in_year']
-        
-        self.state['kpis']['net_kar_aylik'] -= (cfg_strat['lojistik_3pl']['verimlilik_esigi'] - self.params['lojistik_m']) / months_in_year * cfg_strat['lojistik_3pl']['max_maliyet_artis_yillik']
-        
-        uretim_s_config = cfg_strat['uretim'].get(self.params['uretim_s'], {})
-        self.state['kpis']['otif'] += uretim_s_config.get("monthly_otif_bonus", 0)
-
-        if uretim_s_config.get("is_agile_hub", False):
-            transport_mode = self.params.get('transport_m', 'default')
-            transport_impact = cfg_strat['transport']['modes'][transport_mode]
-            self.state['kpis']['otif'] += transport_impact.get('monthly_otif_bonus', 0)
-
-        stok_s_config = cfg_strat['stok'].get(self.params['stok_s'], {})
-        self.state['kpis']['otif'] += stok_s_config.get("monthly_otif_bonus", 0)
-        self.state['kpis']['stok_devir_hizi'] += stok_s_config.get("monthly_turnover_bonus", 0)
-        
-        if self.params['stok_s'] == 'SKU Optimizasyonu':
-             self.state['kpis']['musteri_memnuniyeti_skoru'] += stok_s_config.get("monthly_satisfaction_penalty", 0)
-
-        if self.state['month'] in stok_s_config.get("setup_months", []):
-            cost_per_month = stok_s_config.get("setup_cost", 0) / len(stok_s_config["setup_months"]) if stok_s_config.get("setup_months") else 0
-            self.state['kpis']['net_kar_aylik'] -= cost_per_month
-        elif self.state['month'] in stok_s_config.get("impact_months", []):
-            self.state['kpis']['otif'] += stok_s_config.get("impact_otif_bonus", 0)
-
-        if self.params.get('ozel_sku_modu', False):
-            ozel_sku_cfg = cfg_strat['ozel_sku']
-            self.state['kpis']['net_kar_aylik'] -= ozel_sku_cfg['aylik_operasyonel_ek_maliyet']
-            base_monthly_profit = self.config['kpi_defaults']['net_kar_aylik']
-            profit_bonus = base_monthly_profit * ozel_sku_cfg['gelir_payi'] * ozel_sku_cfg['kar_marji_bonusu']
-            self.state['kpis']['net_kar_aylik'] += profit_bonus
-            self.state['kpis']['stok_devir_hizi'] -= ozel_sku_cfg['stok_hizi_yavaslama_aylik']
 
-        if self.params['mevsimsellik_etkisi'] and self.state['month'] in cfg_sim['mevsimsellik_aylari']:
-            self.state['kpis']['otif'] += cfg_sim['mevsimsellik_otif_etkisi']
+        Etkiler her ay yapılandırmadan yeniden okunmaz; parametrelerin
+        önceden derlenmiş aylık etki tablosundan (`get_strategy_schedule`)
+        ilgili satır eklenir ve ardından çarpımsal gürültü uygulanır.
+        """
+        if self.strategy_schedule is None:
+            self.strategy_schedule = get_strategy_schedule(self.params, self.config)
+        kpis = self.state['kpis']
+        for key, effect in zip(KPI_COLUMNS, self.strategy_schedule[self.state['month'] - 1].tolist()):
+            kpis[key] += effect
 
-        noise_factor = random.uniform(0.98, 1.02)
-        self.state['kpis']['net_kar_aylik'] *= noise_factor
-        self.state['kpis']['otif'] *= random.uniform(0.99, 1.01)
+        for column, low, high in STRATEGIC_NOISE:
+            kpis[KPI_COLUMNS[column]] *= self.rng.uniform(low, high)
 
-    def _apply_event_and_intervention(self, event, intervention_name, location=None):
+    def _apply_event_and_intervention(self, event_id, intervention_name, location=None):
         """(İÇ) Belirli bir aydaki kriz olayının ve seçilen müdahalenin etkilerini uygular.
 
         Bu metot, bir krizin (event) KPI'lar üzerindeki doğrudan etkisini
@@ -134,64 +338,56 @@ class KimotoSimulator:
         Coğrafi etkileri de yönetir.
 
         Args:
-            event (dict): `EVENT_LIBRARY`'den gelen kriz olayı sözlüğü.
+            event_id (int): Derlenmiş olay tablosundaki olay kimliği (`None` ise olay yok).
             intervention_name (str): Kullanıcının kriz için seçtiği müdahalenin adı.
             location (str, optional): Krizin etkilediği coğrafi bölge.
         """
-        if not event or event["type"] == "none":
+        table = self.event_table
+        if event_id is None or not table.is_active[event_id]:
             return
 
         geo_impact_ratio = 1.0
         is_geo_specific_production_loss = False
+        plants = self.state.plants
+        location_mask = None
 
-        if event.get("is_geographic", False) and location:
-            tesis_df = self.state['tesisler_df']
-            total_production = tesis_df['Fiili_Uretim_Ton'].sum()
-            location_production = tesis_df[tesis_df['Ulke'] == location]['Fiili_Uretim_Ton'].sum()
+        if table.is_geographic[event_id] and location:
+            location_mask = plants.country_mask(location)
+            total_production = plants.production.sum()
+            location_production = plants.production[location_mask].sum()
             geo_impact_ratio = location_production / total_production if total_production > 0 else 0
-            if event.get("impact", {}).get("uretim_kaybi"):
+            if table.has_channel[event_id, _CH_URETIM_KAYBI]:
                 is_geo_specific_production_loss = True
         
-        intervention = event["interventions"][intervention_name]
-        self.state['kpis']['net_kar_aylik'] -= intervention["cost"]
-        if "net_kar_multiplier" in intervention:
-            self.state['kpis']['net_kar_aylik'] *= intervention["net_kar_multiplier"]
-
-        impact = event.get("impact", {})
-        mitigation_factor = intervention["mitigation_factor"]
-
-        def get_impact_value(effect):
-            """Etkinin sabit mi yoksa olasılıksal mı olduğunu kontrol eder ve değeri döndürür."""
-            if isinstance(effect, dict) and 'dist' in effect:
-                if effect['dist'] == 'uniform':
-                    return random.uniform(effect['min'], effect['max'])
-                elif effect['dist'] == 'normal':
-                    return random.normalvariate(effect['mean'], effect['std'])
-            return effect 
+        intervention_id = table.intervention_id(event_id, intervention_name)
+        self.state['kpis']['net_kar_aylik'] -= float(table.intervention_cost[intervention_id])
+        self.state['kpis']['net_kar_aylik'] *= float(table.intervention_net_kar_multiplier[intervention_id])
+
+        samplers = table.samplers[event_id]
+        mitigation_factor = float(table.intervention_mitigation[intervention_id])
         
-        if "satisfaction_shock" in impact:
-            value = get_impact_value(impact["satisfaction_shock"])
+        if samplers[_CH_MEMNUNIYET] is not None:
+            value = samplers[_CH_MEMNUNIYET].draw(self.rng)
             self.state['kpis']['musteri_memnuniyeti_skoru'] += value * mitigation_factor
         
-        if "otif" in impact:
-            value = get_impact_value(impact["otif"])
+        if samplers[_CH_OTIF] is not None:
+            value = samplers[_CH_OTIF].draw(self.rng)
             self.state['kpis']['otif'] += value * geo_impact_ratio * mitigation_factor
 
-        if "uretim_kaybi" in impact:
-            value = get_impact_value(impact["uretim_kaybi"])
+        if samplers[_CH_URETIM_KAYBI] is not None:
+            value = samplers[_CH_URETIM_KAYBI].draw(self.rng)
             loss_factor = value * self.params['tek_kaynak_orani'] * mitigation_factor
+            production = plants.writable_production()
             if is_geo_specific_production_loss:
-                self.state['tesisler_df'].loc[self.state['tesisler_df']['Ulke'] == location, 'Fiili_Uretim_Ton'] *= (1 - loss_factor)
+                production[location_mask] *= (1 - loss_factor)
             else:
-                self.state['tesisler_df']['Fiili_Uretim_Ton'] *= (1 - loss_factor)
+                production *= (1 - loss_factor)
         
-        if "net_kar" in impact:
-            value = get_impact_value(impact["net_kar"])
+        if samplers[_CH_NET_KAR] is not None:
+            value = samplers[_CH_NET_KAR].draw(self.rng)
             self.state['kpis']['net_kar_aylik'] += value * geo_impact_ratio * mitigation_factor
         
-        if "net_kar_multiplier" in impact:
-            if event["type"] in ["demand", "reputation"]:
-                self.state['kpis']['net_kar_aylik'] *= impact.get("net_kar_multiplier", 1)
+        self.state['kpis']['net_kar_aylik'] *= float(table.net_kar_multiplier[event_id])
 
     def _update_and_bound_kpis(self, previous_state):
         """(İÇ) Birbirine bağımlı KPI'ları günceller ve değerleri makul sınırlar içinde tutar.
@@ -224,7 +420,7 @@ class KimotoSimulator:
         self.state['kpis']['esneklik_skoru'] = max(kpi_limits['min'], min(kpi_limits['max_esneklik'], self.state['kpis']['esneklik_skoru']))
         self.state['kpis']['musteri_memnuniyeti_skoru'] = max(kpi_limits['min'], min(kpi_limits['max_memnuniyet'], self.state['kpis']['musteri_memnuniyeti_skoru']))
         
-    def _run_monthly_cycle(self, event, intervention_name, location=None):
+    def _run_monthly_cycle(self, event_id, intervention_name, location=None):
         """(İÇ) Tek bir aylık simülasyon döngüsünü yönetir.
 
         Bu metot, bir ay içindeki olayların sırasını düzenler:
@@ -233,17 +429,16 @@ class KimotoSimulator:
         3. Bağımlı KPI'ları günceller ve sınırlandırır.
 
         Args:
-            event (dict): Ayın kriz olayı sözlüğü.
+            event_id (int): Ayın kriz olayının kimliği (`None` ise olay yok).
             intervention_name (str): Ayın müdahalesinin adı.
             location (str, optional): Krizin coğrafi konumu.
         """
         previous_state = {"kpis": self.state["kpis"].copy()}
         self.state['kpis']['talep_tahmin_dogrulugu'] = self.params['tahmin_d']
         self._apply_strategic_effects()
-        if event and event["type"] != "none":
-            event_name = next((k for k, v in EVENT_LIBRARY.items() if v == event), "Bilinmeyen Olay")
-            logger.info(f"Ay {self.state['month']}: '{event_name}' olayı uygulanıyor. Lokasyon: {location}. Müdahale: {intervention_name}")
-        self._apply_event_and_intervention(event, intervention_name, location)
+        if event_id is not None and self.event_table.is_active[event_id]:
+            logger.info(f"Ay {self.state['month']}: '{self.event_table.names[event_id]}' olayı uygulanıyor. Lokasyon: {location}. Müdahale: {intervention_name}")
+        self._apply_event_and_intervention(event_id, intervention_name, location)
         self._update_and_bound_kpis(previous_state)
 
     def _apply_initial_strategy_impacts(self):
@@ -253,7 +448,30 @@ class KimotoSimulator:
         bazı stratejilerin getirdiği tek seferlik maliyetleri (örn: yeni tesis
         kurulum maliyeti) veya faydaları (örn: esneklik bonusu) başlangıç
         durumuna yansıtır.
+
+        Kurulum sonrası durum yalnızca üretim ve stok stratejisine, yapılandırmaya
+        ve başlangıç verisine bağlıdır; her kombinasyon için bir kez hesaplanıp
+        dondurulur ve sonraki simülatörler bu anlık görüntünün kopyasından
+        başlar (üretim dizisi ilk yazmada kopyalanır). Paylaşılan görüntü
+        `initial_state_after_setup` olarak atanır ve değiştirilmemelidir.
         """
+        cfg_strat, cfg_sim = self.config['strategy_impacts'], self.config['simulation_parameters']
+        tesis_df, initial_kpis = self.base_data['tesisler_df'], self.base_data['initial_kpis']
+        key = (self.params.get('uretim_s', URETIM_STRATEJILERI[0]), self.params.get('stok_s', STOK_STRATEJILERI[0]), id(cfg_strat), id(cfg_sim),
+               _frame_key(tesis_df), self.base_data.get('toplam_hacim_yillik'), tuple(initial_kpis.items()))
+        entry = _SETUP_SNAPSHOTS.get(key)
+        if entry is None:
+            self.state = SimulationState(initial_kpis.copy(), _base_plants(tesis_df).copy())
+            self._compute_initial_strategy_impacts()
+            snapshot = SimulationState(self.state.kpis, self.state.plants.freeze(), self.state.month, self.state.initial_investment_cost)
+            entry = _remember_snapshot(_SETUP_SNAPSHOTS, key, (cfg_strat, cfg_sim, snapshot), _SETUP_SNAPSHOT_LIMIT)
+        else:
+            _SETUP_SNAPSHOTS.move_to_end(key)
+        self.initial_state_after_setup = entry[-1]
+        self.state = self.initial_state_after_setup.copy()
+
+    def _compute_initial_strategy_impacts(self):
+        """(İÇ) Başlangıç etkilerini güncel duruma uygular (`_apply_initial_strategy_impacts` için)."""
         uretim_cfg = self.config['strategy_impacts']['uretim']
         stok_cfg = self.config['strategy_impacts']['stok']
 
@@ -266,13 +484,16 @@ class KimotoSimulator:
             
             hedef_ulke_adi = uretim_s_config.get("target_country")
             if hedef_ulke_adi:
+                plants = self.state.plants
+                hedef_maske = plants.country_mask(hedef_ulke_adi)
                 a_kategori_hacmi = self.base_data['toplam_hacim_yillik'] * uretim_s_config.get("a_category_ratio", 0)
-                hedef_tesis = self.state['tesisler_df'][self.state['tesisler_df']['Ulke'] == hedef_ulke_adi].iloc[0]
-                bos_kapasite = hedef_tesis['Kapasite_Ton_Yil'] - hedef_tesis['Fiili_Uretim_Ton']
+                hedef_tesis = np.flatnonzero(hedef_maske)[0]
+                bos_kapasite = plants.capacity[hedef_tesis] - plants.production[hedef_tesis]
                 aktarilacak_hacim = min(a_kategori_hacmi, bos_kapasite)
             
-                self.state['tesisler_df'].loc[self.state['tesisler_df']['Ulke'] == 'Hindistan', 'Fiili_Uretim_Ton'] -= aktarilacak_hacim / self.config['simulation_parameters']['hindistan_tesis_sayisi']
-                self.state['tesisler_df'].loc[self.state['tesisler_df']['Ulke'] == hedef_ulke_adi, 'Fiili_Uretim_Ton'] += aktarilacak_hacim
+                production = plants.writable_production()
+                production[plants.country_mask('Hindistan')] -= aktarilacak_hacim / self.config['simulation_parameters']['hindistan_tesis_sayisi']
+                production[hedef_maske] += aktarilacak_hacim
 
         stok_s_param = self.params.get('stok_s', STOK_STRATEJILERI[0])
         stok_s_config = stok_cfg.get(stok_s_param, {})
@@ -282,12 +503,6 @@ class KimotoSimulator:
         self.state['kpis']['net_kar_aylik'] += stok_s_config.get("initial_profit_gain", 0)
         self.state['kpis']['musteri_memnuniyeti_skoru'] += stok_s_config.get("initial_satisfaction_impact", 0)
 
-        self.initial_state_after_setup = {
-            "kpis": self.state["kpis"].copy(),
-            "tesisler_df": self.state["tesisler_df"].copy(),
-            "month": self.state["month"]
-        }
-
     def _calculate_co2(self):
         """(İÇ) Simülasyon sonundaki toplam CO2 emisyonunu ve başlangıca göre tasarrufu hesaplar.
 
@@ -295,9 +510,8 @@ class KimotoSimulator:
         stratejisi aktifse ve SADECE o merkezden yapılan sevkiyatlar için uygular.
         Diğer tüm sevkiyatlar standart çarpana göre hesaplanır.
         """
-        self.final_tesis_df['Kullanim_Orani'] = (self.final_tesis_df['Fiili_Uretim_Ton'] / self.final_tesis_df['Kapasite_Ton_Yil']).fillna(0)
+        plants = self.state.plants
         
-        final_co2 = 0
         transport_mode = self.params.get('transport_m', 'default')
         co2_multiplier = self.config['strategy_impacts']['transport']['modes'][transport_mode]['co2_multiplier']
         emisyon_katsayisi = self.config['co2_factors']['emisyon_katsayisi_ton_km']
@@ -307,35 +521,95 @@ class KimotoSimulator:
         is_agile_hub_strategy_active = uretim_s_config.get("is_agile_hub", False)
         agile_hub_country = uretim_s_config.get("target_country") if is_agile_hub_strategy_active else None
 
-        for _, row in self.final_tesis_df.iterrows():
-            base_co2_for_plant = row['Fiili_Uretim_Ton'] * self.base_data['distance_map'][row['Ulke']] * emisyon_katsayisi
-            
-            if agile_hub_country and row['Ulke'] == agile_hub_country:
-                final_co2 += base_co2_for_plant * co2_multiplier
-            else:
-                final_co2 += base_co2_for_plant * 1.0 
+        country_factors = np.array([self.base_data['distance_map'][ulke] for ulke in plants.country_names], dtype=float) * emisyon_katsayisi
+        if agile_hub_country:
+            country_factors[plants.country_names == agile_hub_country] *= co2_multiplier
+        final_co2 = float(plants.production @ country_factors[plants.country_idx])
                 
         self.co2_tasarrufu = self.base_data['mevcut_co2_emisyonu'] - final_co2
 
     def _calculate_final_summary(self):
-        """(İÇ) Simülasyon bittikten sonra nihai özet KPI'ları hesaplar."""
-        final_row = self.results_df.iloc[-1]
-        total_operational_profit = self.results_df['Aylık Net Kar'].sum()
-        base_annual_profit = self.base_data['initial_kpis']['net_kar_aylik'] * self.config['simulation_parameters']['months_in_year']
+        """(İÇ) Simülasyon bittikten sonra aylık KPI dizilerinden nihai özet KPI'ları hesaplar."""
+        final_row = self.monthly_kpis[-1]
+        total_operational_profit = self.monthly_kpis[:, _KAR].sum()
+        base_annual_profit = self.base_data['initial_kpis']['net_kar_aylik'] * len(self.monthly_kpis)
         
         annual_profit_change = total_operational_profit - self.state['initial_investment_cost'] - base_annual_profit
 
         self.summary = {
             'annual_profit_change': annual_profit_change,
             'initial_investment_cost': self.state['initial_investment_cost'],
-            'final_otif': final_row['OTIF'],
-            'final_flexibility': final_row['Esneklik Skoru'],
-            'final_satisfaction': final_row['Müşteri Memnuniyeti'],
-            'final_turnover': final_row['Stok Devir Hızı'],
+            'final_otif': final_row[_OTIF],
+            'final_flexibility': final_row[_ESNEKLIK],
+            'final_satisfaction': final_row[_MEMNUNIYET],
+            'final_turnover': final_row[_STOK_HIZI],
             'co2_savings': self.co2_tasarrufu
         }
 
-    def run(self, user_timeline_events, user_event_locations, interventions):
+    def _draw_domino(self, month, event_name, months_in_year):
+        """(İÇ) Kullanıcının seçtiği bir krizin Domino kuralı varsa tetiklenmesini çeker.
+
+        Tetiklenen olay, hedef ayda kullanıcı tarafından seçilmiş bir kriz
+        yoksa o ay gerçekleşir; aynı aya birden fazla tetikleme düşerse ilki
+        geçerlidir. Çekiliş kaynak krizin ayında yapıldığından bir ayın sonundaki
+        durum yalnızca o aya kadarki senaryoya bağlıdır.
+        """
+        table = self.event_table
+        event_id = table.ids.get(event_name)
+        if event_id is not None and table.domino_trigger[event_id] >= 0:
+            if self.rng.random() < table.domino_probability[event_id]:
+                delay = int(table.domino_delay[event_id])
+                triggered_month = month + delay
+                if triggered_month < months_in_year + 1 and triggered_month not in self._pending_dominos:
+                    triggered_event = table.names[table.domino_trigger[event_id]]
+                    self._pending_dominos[triggered_month] = triggered_event
+                    logger.info(f"Domino etkisi tetiklendi: '{event_name}' olayı, {delay} ay sonra '{triggered_event}' olayını tetikledi.")
+
+    def _checkpoint_keys(self, user_timeline_events, user_event_locations, interventions, horizon):
+        """(İÇ) 0..`horizon` ay sonu kontrol noktalarının anahtarlarını üretir.
+
+        Anahtar; parametrelerin, başlangıç verisinin, yapılandırmanın, olay
+        kütüphanesinin ve RNG'nin başlangıç durumunun özeti ile senaryonun o aya
+        kadarki önekinden (kriz, lokasyon, müdahale) oluşur.
+        """
+        base_key = content_key(self.params, self.base_data, self.config, EVENT_LIBRARY, DOMINO_RULES, self.rng.getstate())
+        keys, prefix = [(base_key, ())], ()
+        for month in range(1, horizon + 1):
+            prefix += ((month, user_timeline_events.get(month), user_event_locations.get(month), interventions.get(month)),)
+            keys.append((base_key, prefix))
+        return keys
+
+    def _save_checkpoint(self, key, month_records):
+        """(İÇ) Ay sonundaki durumu, RNG durumunu ve bekleyen Domino olaylarını kaydeder."""
+        month = len(month_records)
+        _CHECKPOINTS[key] = MonthCheckpoint(self.state.copy(), self.rng.getstate(), dict(self._pending_dominos),
+                                            self.monthly_kpis[:month].copy(), tuple(month_records), self.initial_state_after_setup)
+        _CHECKPOINTS.move_to_end(key)
+        while len(_CHECKPOINTS) > _CHECKPOINT_LIMIT:
+            _CHECKPOINTS.popitem(last=False)
+
+    def _restore_checkpoint(self, checkpoint_keys):
+        """(İÇ) Senaryonun değişmemiş en uzun önekinin kontrol noktasını yükler.
+
+        Returns:
+            int: Devam edilecek ayın bir öncesi (0 ise yalnızca kurulum atlanır);
+                uygun kontrol noktası yoksa `None`.
+        """
+        for month in range(len(checkpoint_keys) - 1, -1, -1):
+            checkpoint = _CHECKPOINTS.get(checkpoint_keys[month])
+            if checkpoint is None:
+                continue
+            _CHECKPOINTS.move_to_end(checkpoint_keys[month])
+            self.state = checkpoint.state.copy()
+            self.rng.setstate(checkpoint.rng_state)
+            self._pending_dominos = dict(checkpoint.pending_dominos)
+            self.monthly_kpis[:month] = checkpoint.monthly_kpis
+            self._restored_records = checkpoint.month_records
+            self.initial_state_after_setup = checkpoint.initial_state
+            return month
+        return None
+
+    def run(self, user_timeline_events, user_event_locations, interventions, summary_only=False, horizon=None, stop_condition=None, use_checkpoints=False):
             """Tüm 12 aylık simülasyonu baştan sona çalıştırır ve sonuçları döndürür.
 
             Bu, sınıfın ana dışa açık metodudur. Başlangıç etkilerini uygular,
@@ -349,166 +623,1401 @@ class KimotoSimulator:
                 user_event_locations (dict): Coğrafi krizlerin etkilediği yerler.
                                          {ay: lokasyon_adi}.
                 interventions (dict): Kullanıcının seçtiği müdahaleler. {ay: mudahale_adi}.
+                summary_only (bool, optional): `True` ise hiçbir DataFrame
+                    oluşturulmaz; yalnızca özet ve aylık KPI dizileri döndürülür.
+                    Sadece skor hesaplayan çağıranlar (optimizasyon, risk analizleri)
+                    için hızlı yoldur.
+                horizon (int, optional): Simüle edilecek ay sayısı. Varsayılan olarak
+                    `months_in_year`. Sadece ilk ayların sonucuna bakan analizler
+                    (risk matrisi gibi) için simülasyonu erken bitirir.
+                stop_condition (callable, optional): Her ayın sonunda
+                    `stop_condition(ay, kpis)` şeklinde çağrılır; `True` dönerse
+                    simülasyon o ayda durdurulur.
+                use_checkpoints (bool, optional): `True` ise ve RNG tohumlanmış bir
+                    `random.Random` ise her ay sonundaki durum (RNG durumu dahil)
+                    kaydedilir; aynı parametre ve tohumla, senaryonun yalnızca
+                    sonraki ayları değiştirilerek yapılan çalıştırmalar kurulumu ve
+                    değişmemiş ayları atlayıp ilk değişen aydan devam eder.
+                    `stop_condition` ile birlikte kullanılmaz.
 
             Returns:
                 dict: Simülasyonun tam sonuçlarını içeren bir sözlük. Anahtarlar:
-                    'results_df', 'final_tesis_df', 'initial_state', 'co2_tasarrufu'.
+                    'results_df', 'final_tesis_df', 'initial_state', 'co2_tasarrufu', 'summary'.
+                    `summary_only=True` ise anahtarlar: 'summary', 'monthly_kpis'
+                    ({kpi_adi: np.ndarray}) ve 'realized_events'. Simülasyon erken
+                    durdurulursa aylık sonuçlar yalnızca simüle edilen ayları, özet
+                    ise bu aylardaki kâr değişimini içerir.
             """
-            self._apply_initial_strategy_impacts()
-
-            final_timeline = {}
-            for month, event_name in user_timeline_events.items():
-                source = "Jüri Özel" if "Jüri Özel" in event_name else "Kullanıcı"
-                final_timeline[month] = {"event": event_name, "source": source}
-
-            for month, event_details in list(final_timeline.items()):
-                event_name = event_details["event"]
-                if event_name in DOMINO_RULES:
-                    rule = DOMINO_RULES[event_name]
-                    if random.random() < rule['probability']:
-                        triggered_month = month + rule["delay"]
-                        if triggered_month < self.config['simulation_parameters']['months_in_year'] + 1 and triggered_month not in final_timeline:
-                            final_timeline[triggered_month] = {"event": rule["triggers"], "source": "Domino Etkisi"}
-                            logger.info(f"Domino etkisi tetiklendi: '{event_name}' olayı, {rule['delay']} ay sonra '{rule['triggers']}' olayını tetikledi.")
-        
-            for month in range(1, self.config['simulation_parameters']['months_in_year'] + 1):
+            months_in_year = self.config['simulation_parameters']['months_in_year']
+            if horizon is None:
+                horizon = months_in_year
+            elif not 1 <= horizon <= months_in_year:
+                raise ValueError(f"Simülasyon ufku 1 ile {months_in_year} arasında olmalıdır: {horizon}")
+
+            checkpoint_keys = None
+            if use_checkpoints and stop_condition is None and isinstance(self.rng, random.Random):
+                checkpoint_keys = self._checkpoint_keys(user_timeline_events, user_event_locations, interventions, horizon)
+
+            self.monthly_kpis = np.empty((horizon, len(KPI_COLUMNS)))
+            self.resumed_from_month = self._restore_checkpoint(checkpoint_keys) if checkpoint_keys else None
+            if self.resumed_from_month is None:
+                self._apply_initial_strategy_impacts()
+                self._pending_dominos, month_records, start_month = {}, [], 0
+                if checkpoint_keys:
+                    self._save_checkpoint(checkpoint_keys[0], month_records)
+            else:
+                month_records, start_month = list(self._restored_records), self.resumed_from_month
+                logger.info(f"Simülasyon {start_month}. ay kontrol noktasından devam ediyor.")
+
+            table = self.event_table
+            for month in range(start_month + 1, horizon + 1):
                 self.state['month'] = month
-                event_data = final_timeline.get(month)
-                event_name = event_data["event"] if event_data else "Kriz Yok"
-                event_source = event_data["source"] if event_data else "Yok"
+                user_event = user_timeline_events.get(month)
+                if user_event is not None:
+                    event_name, event_source = user_event, "Jüri Özel" if "Jüri Özel" in user_event else "Kullanıcı"
+                    self._draw_domino(month, user_event, months_in_year)
+                elif month in self._pending_dominos:
+                    event_name, event_source = self._pending_dominos[month], "Domino Etkisi"
+                else:
+                    event_name, event_source = "Kriz Yok", "Yok"
             
-                event_obj = EVENT_LIBRARY.get(event_name)
                 event_location = user_event_locations.get(month)
                 intervention_for_month = interventions.get(month, "Müdahale Yok")
             
-                self._run_monthly_cycle(event_obj, intervention_for_month, location=event_location)
-            
-                self.history.append({
-                    "Ay": month,
-                    "OTIF": self.state['kpis']['otif'],
-                    "Aylık Net Kar": self.state['kpis']['net_kar_aylik'],
-                    "Müşteri Memnuniyeti": self.state['kpis']['musteri_memnuniyeti_skoru'],
-                    "Esneklik Skoru": self.state['kpis']['esneklik_skoru'],
-                    "Stok Devir Hızı": self.state['kpis']['stok_devir_hizi'],
-                    "Gerçekleşen Olay": event_name,
-                    "Olay Kaynağı": event_source,
-                    "Müdahale": intervention_for_month if intervention_for_month != "Müdahale Yok" else "-"
-                })
+                self._run_monthly_cycle(table.ids.get(event_name), intervention_for_month, location=event_location)
+
+                kpis = self.state.kpis
+                self.monthly_kpis[month - 1] = [kpis[key] for key in KPI_COLUMNS]
+                month_records.append((event_name, event_source, intervention_for_month))
+                if checkpoint_keys:
+                    self._save_checkpoint(checkpoint_keys[month], month_records)
+                if stop_condition is not None and stop_condition(month, kpis):
+                    break
 
-            self.results_df = pd.DataFrame(self.history)
-            self.final_tesis_df = self.state['tesisler_df'].copy()
+            self.monthly_kpis = self.monthly_kpis[:len(month_records)]
             self._calculate_co2()
             self._calculate_final_summary()
-            logger.info("12 aylık simülasyon döngüsü tamamlandı.")
+            logger.info(f"{len(month_records)} aylık simülasyon döngüsü tamamlandı.")
+
+            if summary_only:
+                return {
+                    "summary": self.summary,
+                    "monthly_kpis": {key: self.monthly_kpis[:, column] for column, key in enumerate(KPI_COLUMNS)},
+                    "realized_events": [{"event": event_name, "source": event_source}
+                                        for event_name, event_source, _ in month_records if event_name != "Kriz Yok"]
+                }
+
+            for month, (event_name, event_source, intervention_for_month) in enumerate(month_records, start=1):
+                record = {"Ay": month}
+                for key in ('otif', 'net_kar_aylik', 'musteri_memnuniyeti_skoru', 'esneklik_skoru', 'stok_devir_hizi'):
+                    record[KPI_LABELS[key]] = self.monthly_kpis[month - 1, KPI_COLUMNS.index(key)]
+                record["Gerçekleşen Olay"] = event_name
+                record["Olay Kaynağı"] = event_source
+                record["Müdahale"] = intervention_for_month if intervention_for_month != "Müdahale Yok" else "-"
+                self.history.append(record)
+
+            self.results_df = pd.DataFrame(self.history)
+            self.final_tesis_df = self.state.plants.to_frame()
+            self.final_tesis_df['Kullanim_Orani'] = (self.final_tesis_df['Fiili_Uretim_Ton'] / self.final_tesis_df['Kapasite_Ton_Yil']).fillna(0)
         
             return {
                 "results_df": self.results_df,
                 "final_tesis_df": self.final_tesis_df,
-                "initial_state": self.initial_state_after_setup,
+                "initial_state": self.initial_state_after_setup.to_dict(),
                 "co2_tasarrufu": self.co2_tasarrufu,
                 "summary": self.summary
             }
 
+class MonthCheckpoint:
+    """Skaler simülasyonun bir ay sonundaki yeniden başlatılabilir anlık görüntüsü.
+
+    Attributes:
+        state (SimulationState): Ay sonundaki durum.
+        rng_state (tuple): `random.Random.getstate()` çıktısı.
+        pending_dominos (dict): {ay: olay_adi} bekleyen Domino tetiklemeleri.
+        monthly_kpis (np.ndarray): O aya kadarki (ay × KPI) geçmiş.
+        month_records (tuple): O aya kadarki (olay, kaynak, müdahale) kayıtları.
+        initial_state (SimulationState): Kurulum sonrası başlangıç durumu.
+    """
+    __slots__ = ("state", "rng_state", "pending_dominos", "monthly_kpis", "month_records", "initial_state")
+
+    def __init__(self, state, rng_state, pending_dominos, monthly_kpis, month_records, initial_state):
+        self.state = state
+        self.rng_state = rng_state
+        self.pending_dominos = pending_dominos
+        self.monthly_kpis = monthly_kpis
+        self.month_records = month_records
+        self.initial_state = initial_state
+
+_CHECKPOINTS = OrderedDict()
+_CHECKPOINT_LIMIT = 1024
+
+EVENT_SOURCES = ("Yok", "Kullanıcı", "Jüri Özel", "Domino Etkisi")
+_SOURCE_NONE, _SOURCE_USER, _SOURCE_JURY, _SOURCE_DOMINO = range(len(EVENT_SOURCES))
+
+class BatchKimotoSimulator:
+    """Aynı senaryonun N tekrarını NumPy dizileri üzerinde birlikte yürüten vektörel simülatör.
+
+    `KimotoSimulator` ile aynı aylık mantığı (stratejik etkiler, krizler,
+    müdahaleler, KPI sınırlandırma) uygular; ancak her tekrar için ayrı nesne
+    ve DataFrame oluşturmak yerine tüm tekrarların durumunu tek seferde
+    günceller. Monte Carlo çalışmalarında skaler motorla istatistiksel olarak
+    aynı dağılımı üretir. İki motor farklı rastgele sayı üreteçleri ve çekiliş
+    sıraları kullandığından aynı tohum aynı tekrarları vermez; eşitlik
+    yalnızca dağılım düzeyindedir. Aynı motor ve tohum ise takvimin yazılış
+    sırasından bağımsız olarak aynı sonucu verir.
+
+    Attributes:
+        num_runs (int): Birlikte simüle edilen tekrar sayısı.
+        rng (np.random.Generator): Tüm olasılıksal çekilişlerin kaynağı.
+        kpis (np.ndarray): (tekrar × KPI) boyutlu anlık KPI matrisi.
+            Sütun sırası `KPI_COLUMNS` ile aynıdır.
+        production (np.ndarray): (tekrar × tesis) boyutlu fiili üretim matrisi.
+        monthly_kpis (np.ndarray): (tekrar × ay × KPI) boyutlu aylık geçmiş.
+        months_done (int): `monthly_kpis` içinde simüle edilmiş ay sayısı.
+        sampling (str): Düzgün sayıların üretim yöntemi (`SAMPLING_METHODS`).
+        controls (list): `record_controls=True` ise her çekilişin deterministik
+            (gürültüsüz) yörüngedeki değerinden sapması; beklenen değeri sıfır
+            olan kontrol değişkenleri olarak kullanılır.
+        log_weights (np.ndarray): Önem örneklemesinde tekrar başına log
+            olabilirlik oranları (kaydırma yoksa sıfır).
+        param_groups (list): Strateji gruplarının parametreleri; tek bir
+            parametre sözlüğü verildiyse tek elemanlıdır.
+        row_group (np.ndarray): Her tekrarın ait olduğu strateji grubunun indeksi.
+    """
+    def __init__(self, base_data, params, config, num_runs, rng=None, sampling="random", record_controls=False, importance_tilt=None, common_random_numbers=False):
+        """BatchKimotoSimulator nesnesini başlatır.
+
+        Args:
+            base_data (dict): Simülasyon için başlangıç verilerini içeren sözlük.
+            params (dict | list): Tüm tekrarlarda ortak kullanılan strateji
+                parametreleri veya strateji gruplarının parametre listesi. Liste
+                verilirse tekrarlar gruplara eşit büyüklükte ardışık bloklar
+                halinde dağıtılır (`num_runs` grup sayısına tam bölünmelidir).
+            config (dict): Uygulamanın genel yapılandırma sözlüğü.
+            num_runs (int): Birlikte simüle edilecek tekrar sayısı.
+            rng (np.random.Generator, optional): Rastgele sayı üreteci.
+                Verilmezse yeni bir üreteç oluşturulur.
+            sampling (str, optional): "random" (varsayılan), "antithetic",
+                "lhs" veya "halton". "random" dışındaki yöntemler tüm çekilişleri
+                düzgün sayı sütunlarının ters dağılım dönüşümüyle üretir.
+            record_controls (bool, optional): Kontrol değişkeni sütunlarının
+                kaydedilip kaydedilmeyeceği.
+            importance_tilt (ImportanceTilt, optional): Verilirse Domino
+                olasılıkları ve normal etkiler kuyruğa doğru kaydırılır ve
+                tekrar başına olabilirlik oranları `log_weights`'te biriktirilir.
+            common_random_numbers (bool, optional): `True` ise tüm strateji
+                grupları aynı rastgele sayıları kullanır; her grubun `i`. tekrarı
+                aynı kriz ve gürültü çekilişlerini görür. Aynı tohumla kurulan
+                tek gruplu bir simülatör de aynı çekilişleri üretir.
+        """
+        self.param_groups = [params] if isinstance(params, dict) else list(params)
+        num_groups = len(self.param_groups)
+        if num_groups == 0 or num_runs % num_groups:
+            raise ValueError(f"Tekrar sayısı ({num_runs}) strateji grubu sayısına ({num_groups}) tam bölünmelidir.")
+        group_size = num_runs // num_groups
+        self.row_group = np.repeat(np.arange(num_groups), group_size)
+
+        self.base_data = base_data
+        self.params = params
+        self.config = config
+        self.num_runs = num_runs
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.months_in_year = config['simulation_parameters']['months_in_year']
+        self.sampling = sampling
+        if common_random_numbers:
+            self.uniforms = TiledUniformStream(make_uniform_stream(sampling, self.rng, group_size), num_groups)
+        else:
+            self.uniforms = make_uniform_stream(sampling, self.rng, num_runs) if sampling != "random" else None
+        self.controls = [] if record_controls else None
+        self.importance_tilt = importance_tilt
+        self.log_weights = np.zeros(num_runs)
+
+        setup_states = {}
+        for group_params in self.param_groups:
+            setup_key = (group_params.get('uretim_s', URETIM_STRATEJILERI[0]), group_params.get('stok_s', STOK_STRATEJILERI[0]))
+            if setup_key not in setup_states:
+                setup_simulator = KimotoSimulator(base_data, group_params, config)
+                setup_simulator._apply_initial_strategy_impacts()
+                setup_states[setup_key] = setup_simulator.initial_state_after_setup
+        group_states = [setup_states[(group_params.get('uretim_s', URETIM_STRATEJILERI[0]), group_params.get('stok_s', STOK_STRATEJILERI[0]))]
+                        for group_params in self.param_groups]
+
+        self.plants = group_states[0].plants
+        self.initial_investment_cost = np.array([state.initial_investment_cost for state in group_states], dtype=float)[self.row_group]
+        self.production = np.array([state.plants.production for state in group_states])[self.row_group]
+        self.kpis = np.array([[state.kpis[key] for key in KPI_COLUMNS] for state in group_states], dtype=float)[self.row_group]
+        self.single_source_ratio = np.array([group_params['tek_kaynak_orani'] for group_params in self.param_groups], dtype=float)[self.row_group]
+        self.special_sku_rows = np.array([group_params.get('ozel_sku_modu', False) for group_params in self.param_groups], dtype=bool)[self.row_group]
+
+        self.monthly_kpis = np.empty((num_runs, self.months_in_year, len(KPI_COLUMNS)))
+        self.months_done = 0
+        self.event_table = get_event_table()
+        self._schedule = np.array([get_strategy_schedule(group_params, config) for group_params in self.param_groups])
+
+    def _schedule_for(self, column):
+        """(İÇ) Bir ayın stratejik etki satırlarını döndürür; tek grupta tüm tekrarlara yayınlanan tek satırdır."""
+        if len(self.param_groups) == 1:
+            return self._schedule[0, column]
+        return self._schedule[self.row_group, column]
+
+    def _draw(self, sampler, rows, channel):
+        """(İÇ) Bir örnekleyiciden `rows` satırları için toplu değer çeker.
+
+        Sözde rastgele yolda yalnızca olayın gerçekleştiği tekrarlar için değer
+        üretilir. Düzgün sayı akışı (varyans azaltma, ortak rastgele sayılar)
+        kullanılıyorsa sütunların tekrarlar arasında hizalı kalması için tüm
+        tekrarlara çekilir ve `rows` satırları seçilir.
+        """
+        shift = self.importance_tilt.mean_shift(IMPACT_CHANNELS[channel], sampler) if self.importance_tilt is not None else 0.0
+        draw_sampler = NormalSampler(sampler.mean + shift, sampler.std) if shift else sampler
+        if self.uniforms is None:
+            values = draw_sampler.sample(self.rng, rows.size)
+        else:
+            values = draw_sampler.ppf(self.uniforms.next())[rows]
+        if shift:
+            self.log_weights[rows] += ((values - draw_sampler.mean) ** 2 - (values - sampler.mean) ** 2) / (2 * sampler.std ** 2)
+        if self.controls is not None:
+            control = np.zeros(self.num_runs)
+            control[rows] = values - sampler.mean
+            self.controls.append(control)
+        return values
+
+    def _noise(self, low, high):
+        """(İÇ) Tüm tekrarlar için U(low, high) gürültü çarpanı çeker."""
+        if self.uniforms is None:
+            factor = self.rng.uniform(low, high, self.num_runs)
+        else:
+            factor = low + (high - low) * self.uniforms.next()
+        if self.controls is not None:
+            self.controls.append(factor - (low + high) / 2)
+        return factor
+
+    def _build_event_matrix(self, user_timeline_events):
+        """(İÇ) Kullanıcı takvimini ve Domino Etkisi çekilişlerini (tekrar × ay) matrislerine dönüştürür.
+
+        Returns:
+            tuple: (olay kimlikleri, olay kaynakları) matrisleri ve her ay için
+                gerçekleşebilecek olay kimliklerinin kümeleri.
+        """
+        candidates = [set() for _ in range(self.months_in_year)]
+        events = np.zeros((self.num_runs, self.months_in_year), dtype=np.int64)
+        sources = np.full((self.num_runs, self.months_in_year), _SOURCE_NONE, dtype=np.int8)
+        table = self.event_table
+        events[:] = table.none_id
+
+        for month, event_name in user_timeline_events.items():
+            if 1 <= month <= self.months_in_year:
+                events[:, month - 1] = table.event_id(event_name)
+                sources[:, month - 1] = _SOURCE_JURY if "Jüri Özel" in event_name else _SOURCE_USER
+                candidates[month - 1].add(table.event_id(event_name))
+
+        # Skaler motordaki gibi kronolojik sırayla: aynı aya düşen tetiklemelerde önceki ayın krizi geçerlidir
+        # ve çekiliş sırası takvim sözlüğünün ekleme sırasına bağlı değildir.
+        for month, event_name in sorted(user_timeline_events.items()):
+            event_id = table.event_id(event_name)
+            if table.domino_trigger[event_id] >= 0:
+                coin = self.rng.random(self.num_runs) if self.uniforms is None else self.uniforms.next()
+                if self.importance_tilt is not None:
+                    fired, log_ratio = self.importance_tilt.domino_draw(coin, table.domino_probability[event_id])
+                    self.log_weights += log_ratio
+                else:
+                    fired = coin < table.domino_probability[event_id]
+                if self.controls is not None:
+                    self.controls.append(fired - table.domino_probability[event_id])
+                triggered_month = month + int(table.domino_delay[event_id])
+                if triggered_month < self.months_in_year + 1:
+                    rows = fired & (sources[:, triggered_month - 1] == _SOURCE_NONE)
+                    events[rows, triggered_month - 1] = table.domino_trigger[event_id]
+                    sources[rows, triggered_month - 1] = _SOURCE_DOMINO
+                    if triggered_month not in user_timeline_events:
+                        candidates[triggered_month - 1].add(int(table.domino_trigger[event_id]))
+        return events, sources, candidates
+
+    def _apply_event_and_intervention(self, event_id, rows, intervention_name, location=None):
+        """(İÇ) Bir kriz olayını ve müdahalesini yalnızca olayın gerçekleştiği tekrarlara uygular.
+
+        Args:
+            event_id (int): Derlenmiş olay tablosundaki olay kimliği.
+            rows (np.ndarray): Olayın gerçekleştiği tekrarların indeksleri.
+            intervention_name (str): Ayın müdahalesinin adı.
+            location (str, optional): Krizin etkilediği coğrafi bölge.
+        """
+        table = self.event_table
+        geo_impact_ratio = np.ones(rows.size)
+        location_plants = None
+
+        if table.is_geographic[event_id] and location:
+            production = self.production[rows]
+            total_production = production.sum(axis=1)
+            location_mask = self.plants.country_mask(location)
+            location_production = production[:, location_mask].sum(axis=1)
+            geo_impact_ratio = np.divide(location_production, total_production, out=np.zeros(rows.size), where=total_production > 0)
+            if table.has_channel[event_id, _CH_URETIM_KAYBI]:
+                location_plants = np.flatnonzero(location_mask)
+
+        intervention_id = table.intervention_id(event_id, intervention_name)
+        self.kpis[rows, _KAR] -= table.intervention_cost[intervention_id]
+        self.kpis[rows, _KAR] *= table.intervention_net_kar_multiplier[intervention_id]
+
+        samplers = table.samplers[event_id]
+        mitigation_factor = table.intervention_mitigation[intervention_id]
+
+        if samplers[_CH_MEMNUNIYET] is not None:
+            self.kpis[rows, _MEMNUNIYET] += self._draw(samplers[_CH_MEMNUNIYET], rows, _CH_MEMNUNIYET) * mitigation_factor
+
+        if samplers[_CH_OTIF] is not None:
+            self.kpis[rows, _OTIF] += self._draw(samplers[_CH_OTIF], rows, _CH_OTIF) * geo_impact_ratio * mitigation_factor
+
+        if samplers[_CH_URETIM_KAYBI] is not None:
+            loss_factor = self._draw(samplers[_CH_URETIM_KAYBI], rows, _CH_URETIM_KAYBI) * self.single_source_ratio[rows] * mitigation_factor
+            if location_plants is not None:
+                self.production[np.ix_(rows, location_plants)] *= (1 - loss_factor)[:, None]
+            else:
+                self.production[rows] *= (1 - loss_factor)[:, None]
+
+        if samplers[_CH_NET_KAR] is not None:
+            self.kpis[rows, _KAR] += self._draw(samplers[_CH_NET_KAR], rows, _CH_NET_KAR) * geo_impact_ratio * mitigation_factor
+
+        self.kpis[rows, _KAR] *= table.net_kar_multiplier[event_id]
+
+    def _update_and_bound_kpis(self, previous_otif):
+        """(İÇ) Bağımlı KPI'ları tüm tekrarlar için günceller ve sınırlandırır."""
+        cfg_sim = self.config['simulation_parameters']
+        cfg_thresh = self.config['simulation_thresholds']
+        kpis = self.kpis
+        kpis[:, _MEMNUNIYET] += (kpis[:, _OTIF] - previous_otif) * cfg_sim['otif_memnuniyet_katsayisi']
+
+        if self.special_sku_rows.any():
+            ozel_sku_cfg = self.config['strategy_impacts']['ozel_sku']
+            kpis[:, _MEMNUNIYET] += np.where(self.special_sku_rows & (kpis[:, _OTIF] < ozel_sku_cfg['otif_hedefi']), ozel_sku_cfg['memnuniyet_penaltisi_hedef_alti'], 0.0)
+
+        is_stressed = (kpis[:, _OTIF] < cfg_thresh['esneklik_otif_esigi']) | (kpis[:, _KAR] < cfg_thresh['esneklik_kar_esigi'])
+        kpis[:, _ESNEKLIK] += np.where(is_stressed, cfg_sim['esneklik_azalis_puani'], cfg_sim['esneklik_artis_puani'])
+
+        kpi_limits = cfg_sim['kpi_sinirlari']
+        np.clip(kpis[:, _OTIF], kpi_limits['min'], kpi_limits['max_otif'], out=kpis[:, _OTIF])
+        np.maximum(kpis[:, _STOK_HIZI], 0, out=kpis[:, _STOK_HIZI])
+        np.clip(kpis[:, _ESNEKLIK], kpi_limits['min'], kpi_limits['max_esneklik'], out=kpis[:, _ESNEKLIK])
+        np.clip(kpis[:, _MEMNUNIYET], kpi_limits['min'], kpi_limits['max_memnuniyet'], out=kpis[:, _MEMNUNIYET])
+
+    def _calculate_co2_savings(self):
+        """(İÇ) Her tekrar için simülasyon sonundaki CO2 tasarrufunu hesaplar."""
+        emisyon_katsayisi = self.config['co2_factors']['emisyon_katsayisi_ton_km']
+        base_factors = np.array([self.base_data['distance_map'][ulke] for ulke in self.plants.country_names], dtype=float) * emisyon_katsayisi
+
+        plant_factors = []
+        for group_params in self.param_groups:
+            transport_mode = group_params.get('transport_m', 'default')
+            co2_multiplier = self.config['strategy_impacts']['transport']['modes'][transport_mode]['co2_multiplier']
+            uretim_s_config = self.config['strategy_impacts']['uretim'].get(group_params.get('uretim_s', URETIM_STRATEJILERI[0]), {})
+            agile_hub_country = uretim_s_config.get("target_country") if uretim_s_config.get("is_agile_hub", False) else None
+
+            country_factors = base_factors.copy()
+            if agile_hub_country:
+                country_factors[self.plants.country_names == agile_hub_country] *= co2_multiplier
+            plant_factors.append(country_factors[self.plants.country_idx])
+
+        if len(plant_factors) == 1:
+            return self.base_data['mevcut_co2_emisyonu'] - self.production @ plant_factors[0]
+        return self.base_data['mevcut_co2_emisyonu'] - np.einsum('ij,ij->i', self.production, np.array(plant_factors)[self.row_group])
+
+    def _collect_realized_events(self, events, sources):
+        """(İÇ) Her tekrarda gerçekleşen olayları skaler motorla aynı biçimde listeler."""
+        none_id = self.event_table.none_id
+        patterns, inverse = np.unique(np.concatenate([events, sources], axis=1), axis=0, return_inverse=True)
+        pattern_events = []
+        for pattern in patterns:
+            pattern_events.append([
+                {"event": self.event_table.names[event_id], "source": EVENT_SOURCES[source]}
+                for event_id, source in zip(pattern[:self.months_in_year], pattern[self.months_in_year:])
+                if event_id != none_id
+            ])
+        return [list(pattern_events[i]) for i in inverse.ravel()]
+
+    def run_first_month_probes(self, probes):
+        """Satır bloklarına 1. ayda farklı kriz senaryoları uygulayarak yalnızca ilk ayı simüle eder.
+
+        Tekrarlar, `probes` listesindeki her senaryo için eşit büyüklükte ardışık
+        bloklara bölünür. Stratejik gürültü tekrar başına bir kez çekilip tüm
+        bloklara aynen uygulanır (ortak rastgele sayılar); böylece senaryolar
+        arasındaki farklar yalnızca kriz ve müdahale etkilerinden kaynaklanır.
+
+        Args:
+            probes (list): `(olay_kimliği, müdahale_adı, lokasyon)` demetleri.
+
+        Returns:
+            np.ndarray: (senaryo × tekrar × KPI) boyutlu 1. ay KPI'ları.
+        """
+        replications, remainder = divmod(self.num_runs, len(probes))
+        if remainder:
+            raise ValueError(f"Tekrar sayısı ({self.num_runs}) senaryo sayısına ({len(probes)}) tam bölünmelidir.")
+
+        previous_otif = self.kpis[:, _OTIF].copy()
+        self.kpis += self._schedule_for(0)
+        for noise_column, low, high in STRATEGIC_NOISE:
+            self.kpis[:, noise_column] *= np.tile(self.rng.uniform(low, high, replications), len(probes))
+
+        for probe_idx, (event_id, intervention_name, location) in enumerate(probes):
+            if self.event_table.is_active[event_id]:
+                rows = np.arange(probe_idx * replications, (probe_idx + 1) * replications)
+                self._apply_event_and_intervention(event_id, rows, intervention_name, location)
+
+        self._update_and_bound_kpis(previous_otif)
+        self.monthly_kpis[:, 0] = self.kpis
+        self.months_done = 1
+        return self.kpis.reshape(len(probes), replications, len(KPI_COLUMNS)).copy()
+
+    def run(self, user_timeline_events, user_event_locations, interventions, stop_condition=None):
+        """Tüm tekrarları 12 ay boyunca birlikte simüle eder ve özet dizileri döndürür.
+
+        Args:
+            user_timeline_events (dict): Kullanıcının manuel olarak seçtiği krizler.
+                                     {ay: olay_adi}.
+            user_event_locations (dict): Coğrafi krizlerin etkilediği yerler.
+                                     {ay: lokasyon_adi}.
+            interventions (dict): Kullanıcının seçtiği müdahaleler. {ay: mudahale_adi}.
+            stop_condition (callable, optional): Her ayın sonunda
+                `stop_condition(ay, kpis)` şeklinde (tekrar × KPI) matrisiyle
+                çağrılır; `True` dönerse simülasyon o ayda durdurulur ve sonuçlar
+                simüle edilen aylardan hesaplanır.
+
+        Returns:
+            dict: Her anahtarın tekrar başına bir değer içerdiği sonuç sözlüğü.
+                Anahtarlar: 'annual_profits', 'final_otifs', 'final_flexibility',
+                'final_satisfaction', 'final_turnover', 'co2_savings', 'realized_events'.
+                Kontroller kaydediliyorsa (tekrar × kontrol) boyutlu 'controls'
+                matrisi, önem örneklemesi kullanılıyorsa 'log_weights' de eklenir.
+        """
+        events, sources, candidates = self._build_event_matrix(user_timeline_events)
+
+        for month in range(1, self.months_in_year + 1):
+            column = month - 1
+            previous_otif = self.kpis[:, _OTIF].copy()
+
+            self.kpis += self._schedule_for(column)
+            for noise_column, low, high in STRATEGIC_NOISE:
+                self.kpis[:, noise_column] *= self._noise(low, high)
+
+            for event_id in sorted(candidates[column]):
+                if not self.event_table.is_active[event_id]:
+                    continue
+                rows = np.flatnonzero(events[:, column] == event_id)
+                if rows.size == 0 and self.uniforms is None:
+                    continue
+                intervention_for_month = interventions.get(month, "Müdahale Yok")
+                self._apply_event_and_intervention(event_id, rows, intervention_for_month, user_event_locations.get(month))
+
+            self._update_and_bound_kpis(previous_otif)
+            self.monthly_kpis[:, column] = self.kpis
+            self.months_done = month
+            if stop_condition is not None and stop_condition(month, self.kpis):
+                self.monthly_kpis = self.monthly_kpis[:, :month]
+                break
+
+        base_annual_profit = self.base_data['initial_kpis']['net_kar_aylik'] * self.monthly_kpis.shape[1]
+        logger.info(f"Vektörel simülasyon tamamlandı. Tekrar sayısı: {self.num_runs}")
+
+        results = {
+            "annual_profits": self.monthly_kpis[:, :, _KAR].sum(axis=1) - self.initial_investment_cost - base_annual_profit,
+            "final_otifs": self.kpis[:, _OTIF].copy(),
+            "final_flexibility": self.kpis[:, _ESNEKLIK].copy(),
+            "final_satisfaction": self.kpis[:, _MEMNUNIYET].copy(),
+            "final_turnover": self.kpis[:, _STOK_HIZI].copy(),
+            "co2_savings": self._calculate_co2_savings(),
+            "realized_events": self._collect_realized_events(events, sources)
+        }
+        if self.controls is not None:
+            results["controls"] = np.column_stack(self.controls) if self.controls else np.empty((self.num_runs, 0))
+        if self.importance_tilt is not None:
+            results["log_weights"] = self.log_weights.copy()
+        return results
+
 # ==============================================================================
 # OPTİMİZASYON, ANA AKIŞ VE MONTE CARLO FONKSİYONLARI
 # ==============================================================================
 
-def objective(trial, base_data, config, timeline, locations, interventions, optimization_goal):
-    """Optuna için hedef fonksiyonu. Bir dizi parametreyle simülasyonu çalıştırır ve skoru döndürür."""
+OPTIMIZATION_GOALS = ("Yıllık Net Kârı Maksimize Et", "Final OTIF'i Maksimize Et", "Final Esneklik Skorunu Maksimize Et", "CO2 Tasarrufunu Maksimize Et")
+OBJECTIVE_STATISTICS = ("mean", "quantile", "cvar")
+PRUNERS = ("median", "halving")
+
+def _as_goal_list(optimization_goal):
+    """(İÇ) Tek bir hedefi veya hedef listesini doğrulanmış hedef listesine dönüştürür."""
+    goals = [optimization_goal] if isinstance(optimization_goal, str) else list(optimization_goal)
+    unknown = [goal for goal in goals if goal not in OPTIMIZATION_GOALS]
+    if unknown or not goals:
+        raise ValueError(f"Bilinmeyen veya boş optimizasyon hedefi: {unknown}")
+    return goals
+
+def _aggregate_goal_values(values, statistic, alpha):
+    """(İÇ) Tekrar başına hedef değerlerini ortalama, alt kantil veya alt kuyruk ortalamasına (CVaR) indirger."""
+    if statistic == "mean":
+        return float(values.mean())
+    if statistic not in OBJECTIVE_STATISTICS:
+        raise ValueError(f"Bilinmeyen hedef istatistiği: '{statistic}'")
+    var, cvar = weighted_tail_risk(values, np.ones(len(values)), alpha)
+    return var if statistic == "quantile" else cvar
+
+def objective(trial, base_data, config, timeline, locations, interventions, optimization_goal, replications=1, statistic="mean", alpha=0.1, crn_seed=0, fixed_params=None, pruning=False):
+    """Optuna için hedef fonksiyonu. Bir dizi parametreyle simülasyonu çalıştırır ve skoru döndürür.
+
+    `replications > 1` ise deneme, tek bir gürültülü simülasyon yerine
+    `BatchKimotoSimulator` ile tek çağrıda `replications` tekrar üzerinden
+    puanlanır. Tüm denemeler aynı `crn_seed` tohumunu kullandığından
+    (ortak rastgele sayılar) denemeler arası karşılaştırmalar düşük
+    varyanslıdır. Skor, hedefin tekrarlar üzerindeki ortalaması (`mean`),
+    `alpha` alt kantili (`quantile`) veya en kötü `alpha` kısmının ortalamasıdır (`cvar`).
+
+    Her denemede dört hedefin değeri de hesaplanıp `goal_values` kullanıcı
+    niteliğine yazılır. `optimization_goal` bir liste ise (çok amaçlı
+    optimizasyon) her hedef için bir skor içeren demet döndürülür.
+
+    `fixed_params` içindeki kesikli parametreler önerilmez, verilen değerle
+    sabitlenir; böylece çalışma yalnızca sürekli kaydırıcıları iyileştirir.
+
+    `pruning=True` ise (tek hedefte) her ayın sonunda hedefin o ana kadarki
+    değeri (biriken kâr ya da güncel KPI) `trial.report` ile bildirilir ve
+    çalışmanın budayıcısı denemeyi umutsuz bulursa simülasyon `stop_condition`
+    ile durdurulup `optuna.TrialPruned` fırlatılır.
+    """
     params = {}
     model_cfg = config['strategy_impacts']['tahmin_modeli']
+    fixed_params = fixed_params or {}
+    choose = lambda key, choices: fixed_params[key] if key in fixed_params else trial.suggest_categorical(key, choices)
     
     for key, slider_config in config['ui_settings']['sliders'].items():
         params[key] = trial.suggest_float(key, slider_config['min'], slider_config['max'], step=slider_config['step'])
     
     uretim_stratejileri_list = list(config['strategy_impacts']['uretim'].keys())
-    params['uretim_s'] = trial.suggest_categorical('uretim_s', uretim_stratejileri_list)
+    params['uretim_s'] = choose('uretim_s', uretim_stratejileri_list)
     
     if params['uretim_s'] != URETIM_STRATEJILERI[0]:
         transport_options = list(config['strategy_impacts']['transport']['modes'].keys())
         transport_options.remove('default')
-        params['transport_m'] = trial.suggest_categorical('transport_m', transport_options)
+        params['transport_m'] = choose('transport_m', transport_options)
     else:
         params['transport_m'] = 'default'
         
     stok_stratejileri_list = list(config['strategy_impacts']['stok'].keys())
-    params['stok_s'] = trial.suggest_categorical('stok_s', stok_stratejileri_list)
-    params['mevsimsellik_etkisi'] = trial.suggest_categorical('mevsimsellik_etkisi', [True, False])
-    params['ozel_sku_modu'] = trial.suggest_categorical('ozel_sku_modu', [True, False])
+    params['stok_s'] = choose('stok_s', stok_stratejileri_list)
+    params['mevsimsellik_etkisi'] = choose('mevsimsellik_etkisi', [True, False])
+    params['ozel_sku_modu'] = choose('ozel_sku_modu', [True, False])
     
-    params['tahmin_algoritmasi'] = trial.suggest_categorical('tahmin_algoritmasi', list(model_cfg['algoritmalar'].keys()))
+    params['tahmin_algoritmasi'] = choose('tahmin_algoritmasi', list(model_cfg['algoritmalar'].keys()))
     for kaynak in model_cfg['veri_kaynaklari'].keys():
-        params[kaynak] = trial.suggest_categorical(kaynak, [True, False])
+        params[kaynak] = choose(kaynak, [True, False])
     
     params['tahmin_d'] = calculate_tahmin_d(params, config)
 
-    sim_results = trigger_single_simulation(params, base_data, timeline, locations, interventions, config)
-    
-    score = 0
-    if optimization_goal == "Yıllık Net Kârı Maksimize Et":
-        score = sim_results['results_df']['Aylık Net Kar'].sum()
-    elif optimization_goal == "Final OTIF'i Maksimize Et":
-        score = sim_results['results_df'].iloc[-1]['OTIF']
-    elif optimization_goal == "Final Esneklik Skorunu Maksimize Et":
-        score = sim_results['results_df'].iloc[-1]['Esneklik Skoru']
-    elif optimization_goal == "CO2 Tasarrufunu Maksimize Et":
-        score = sim_results['co2_tasarrufu']
-    
-    return -score if "Maksimize Et" in optimization_goal else score
+    if replications > 1:
+        simulator = BatchKimotoSimulator(base_data, params, config, replications, np.random.default_rng(crn_seed), common_random_numbers=True)
+        current_goal_values = lambda: {goal: _aggregate_goal_values(values, statistic, alpha) for goal, values in _batch_goal_values(simulator).items()}
+        run_kwargs = {}
+    else:
+        simulator = KimotoSimulator(base_data, params, config)
+        current_goal_values = lambda: _scalar_goal_values(simulator)
+        run_kwargs = {"summary_only": True}
+
+    pruned = False
+    if pruning and isinstance(optimization_goal, str):
+        sign = -1 if "Maksimize Et" in optimization_goal else 1
+
+        def report_month(month, kpis):
+            nonlocal pruned
+            trial.report(sign * current_goal_values()[optimization_goal], step=month)
+            pruned = trial.should_prune()
+            return pruned
+        run_kwargs["stop_condition"] = report_month
+
+    simulator.run(timeline, locations, interventions, **run_kwargs)
+    if pruned:
+        raise optuna.TrialPruned()
+    goal_values = current_goal_values()
+
+    trial.set_user_attr("goal_values", goal_values)
+    scores = [-goal_values[goal] if "Maksimize Et" in goal else goal_values[goal] for goal in _as_goal_list(optimization_goal)]
+    return scores[0] if isinstance(optimization_goal, str) else tuple(scores)
+
+def _scalar_goal_values(simulator):
+    """(İÇ) Skaler simülatörün o ana kadar simüle ettiği aylardan dört hedefin değerini hesaplar."""
+    simulator._calculate_co2()
+    monthly_kpis = simulator.monthly_kpis[:simulator.state['month']]
+    return {
+        "Yıllık Net Kârı Maksimize Et": float(monthly_kpis[:, _KAR].sum()),
+        "Final OTIF'i Maksimize Et": float(monthly_kpis[-1, _OTIF]),
+        "Final Esneklik Skorunu Maksimize Et": float(monthly_kpis[-1, _ESNEKLIK]),
+        "CO2 Tasarrufunu Maksimize Et": float(simulator.co2_tasarrufu),
+    }
+
+def _batch_goal_values(simulator):
+    """(İÇ) Toplu simülatörün o ana kadar simüle ettiği aylardan tekrar başına hedef değerlerini hesaplar.
+
+    Kâr, simüle edilen ayların `monthly_kpis` sütunlarından biriktirilir;
+    henüz simüle edilmemiş aylar (ön tahsisli dizide) toplama katılmaz.
+    """
+    months_done = simulator.months_done
+    return {
+        "Yıllık Net Kârı Maksimize Et": simulator.monthly_kpis[:, :months_done, _KAR].sum(axis=1),
+        "Final OTIF'i Maksimize Et": simulator.kpis[:, _OTIF].copy(),
+        "Final Esneklik Skorunu Maksimize Et": simulator.kpis[:, _ESNEKLIK].copy(),
+        "CO2 Tasarrufunu Maksimize Et": simulator._calculate_co2_savings(),
+    }
+
+def optimization_study_name(base_data, config, timeline, locations, interventions, optimization_goal, objective_options=None):
+    """
+    Bir optimizasyon senaryosu için kalıcı çalışma (study) adını üretir.
+
+    Ad; hedef, kriz takvimi, lokasyonlar, müdahaleler, yapılandırma ve
+    başlangıç verilerinin (ve varsa hedef fonksiyonu seçeneklerinin) özetinden türetilir. Böylece aynı senaryonun
+    sonraki çalıştırmaları önceki denemeleri devralır, farklı senaryolar
+    birbirine karışmaz.
+    """
+    scenario = {"goal": optimization_goal, "timeline": timeline, "locations": locations,
+                "interventions": interventions, "config": config, "base_data": base_data, "objective": objective_options or {}}
+    digest = content_key(scenario)
+    return f"kimoto-{digest[:16]}"
+
+def _open_study_storage(storage_path):
+    """(İÇ) Yerel çalışma deposunu açar: '.db'/'.sqlite' için SQLite, diğer yollar için günlük (journal) dosyası."""
+    if storage_path is None:
+        return None
+    directory = os.path.dirname(os.path.abspath(storage_path))
+    os.makedirs(directory, exist_ok=True)
+    if storage_path.endswith((".db", ".sqlite")):
+        return f"sqlite:///{storage_path}"
+    return optuna.storages.JournalStorage(optuna.storages.journal.JournalFileBackend(storage_path))
+
+def _make_pruner(name):
+    """(İÇ) Budayıcı adından Optuna budayıcısını oluşturur; `None` budamayı kapatır."""
+    if name is None:
+        return optuna.pruners.NopPruner()
+    if name == "median":
+        return optuna.pruners.MedianPruner(n_startup_trials=5, n_warmup_steps=3)
+    if name == "halving":
+        return optuna.pruners.SuccessiveHalvingPruner()
+    raise ValueError(f"Bilinmeyen budama yöntemi: '{name}'. Seçenekler: {PRUNERS}")
+
+def _run_optimization_worker(study_name, storage_path, n_trials, base_data, config, timeline, locations, interventions, optimization_goal, seed, objective_options, pruner=None):
+    """(İÇ) Paylaşılan depodaki çalışmayı yükler ve bu süreçte `n_trials` deneme çalıştırır."""
+    study = optuna.load_study(study_name=study_name, storage=_open_study_storage(storage_path),
+                              sampler=optuna.samplers.TPESampler(seed=seed, constant_liar=True), pruner=_make_pruner(pruner))
+    study.optimize(lambda trial: objective(trial, base_data, config, timeline, locations, interventions, optimization_goal, **objective_options), n_trials=n_trials)
+
+def run_optimization(params, base_data, timeline, locations, interventions, config, n_trials, optimization_goal, callback_func=None, n_workers=1, storage_path=None, seed=None, poll_interval=0.5, objective_options=None):
+    """
+    Optuna optimizasyon sürecini yönetir.
+
+    `storage_path` verildiğinde çalışma yerel bir dosyada (günlük dosyası
+    veya SQLite) saklanır ve senaryoya özgü bir adla (`optimization_study_name`)
+    açılır; aynı senaryonun önceki denemeleri korunur ve örnekleyici bunlardan
+    başlayarak devam eder. `n_workers > 1` ise denemeler aynı depoyu paylaşan
+    işçi süreçlere dağıtılır.
+
+    `objective_options` içinde `pruner` verilirse ("median" veya "halving")
+    her deneme aylık ara skorlarını bildirir ve budayıcının umutsuz bulduğu
+    denemeler 12 ay tamamlanmadan durdurulur (`PRUNED` durumunda kaydedilir).
+
+    Args:
+        n_trials (int): Bu çağrıda çalıştırılacak yeni deneme sayısı.
+        callback_func (callable, optional): Tamamlanan her yeni deneme için
+            `callback_func(study, trial)`. Paralel modda ana süreçte, depo
+            `poll_interval` saniyede bir yoklanarak çağrılır.
+        n_workers (int, optional): İşçi süreç sayısı.
+        storage_path (str, optional): Kalıcı çalışma deposunun yolu; verilmezse
+            çalışma bellekte tutulur.
+        seed (int, optional): Örnekleyici tohumu (işçiler için türetilir).
+        objective_options (dict, optional): `objective`'e iletilen gürbüz skor
+            seçenekleri (`replications`, `statistic`, `alpha`, `crn_seed`),
+            sabitlenecek kesikli parametreler (`fixed_params`) ve budama yöntemi
+            (`pruner`, `PRUNERS` içinden). Sabit parametreler döndürülen en iyi
+            parametrelere eklenir.
+
+    Returns:
+        tuple: (en iyi parametreler, en iyi değer, tüm denemelerin DataFrame'i).
+
+    Raises:
+        ValueError: Depo yolu olmadan paralel optimizasyon istenirse.
+    """
+    study = _optimize_study(base_data, config, timeline, locations, interventions, optimization_goal, n_trials, ["minimize"],
+                            callback_func, n_workers, storage_path, seed, poll_interval, objective_options)
 
-def run_optimization(params, base_data, timeline, locations, interventions, config, n_trials, optimization_goal, callback_func=None):
-    """Optuna optimizasyon sürecini yönetir."""
-    study = optuna.create_study(direction="minimize")
-    
-    callbacks = [callback_func] if callback_func else []
-    study.optimize(
-        lambda trial: objective(trial, base_data, config, timeline, locations, interventions, optimization_goal),
-        n_trials=n_trials,
-        callbacks=callbacks
-    )
-    
     best_value = -study.best_value if "Maksimize Et" in optimization_goal and study.best_value is not None else study.best_value
+    best_params = {**(objective_options or {}).get("fixed_params", {}), **study.best_params}
     
-    return study.best_params, best_value, study.trials_dataframe()
+    return best_params, best_value, study.trials_dataframe()
+
+def _optimize_study(base_data, config, timeline, locations, interventions, optimization_goal, n_trials, directions, callback_func, n_workers, storage_path, seed, poll_interval, objective_options):
+    """(İÇ) Çalışmayı açar (veya devam ettirir) ve `n_trials` yeni denemeyi sırayla ya da işçi süreçlerde çalıştırır."""
+    if n_workers > 1 and storage_path is None:
+        raise ValueError("Paralel optimizasyon için paylaşılan bir çalışma deposu (storage_path) gereklidir.")
+
+    objective_options = objective_options or {}
+    study_name = optimization_study_name(base_data, config, timeline, locations, interventions, optimization_goal, objective_options) if storage_path else None
+    pruner = objective_options.get("pruner")
+    objective_options = {key: value for key, value in objective_options.items() if key != "pruner"}
+    if pruner is not None:
+        objective_options["pruning"] = True
+    study = optuna.create_study(study_name=study_name, storage=_open_study_storage(storage_path), directions=directions,
+                                load_if_exists=True, sampler=optuna.samplers.TPESampler(seed=seed), pruner=_make_pruner(pruner))
+    previous_trials = len(study.trials)
+    if previous_trials:
+        logger.info(f"'{study_name}' çalışması {previous_trials} önceki denemeyle devam ediyor.")
+
+    if n_workers <= 1:
+        callbacks = [callback_func] if callback_func else []
+        study.optimize(
+            lambda trial: objective(trial, base_data, config, timeline, locations, interventions, optimization_goal, **objective_options),
+            n_trials=n_trials,
+            callbacks=callbacks
+        )
+        return study
+
+    reported = {trial.number for trial in study.trials}
+    worker_trials = [len(chunk) for chunk in np.array_split(np.arange(n_trials), n_workers) if len(chunk)]
+    worker_seeds = [None] * len(worker_trials) if seed is None else [int(child.generate_state(1)[0]) for child in np.random.SeedSequence(seed).spawn(len(worker_trials))]
+    with ProcessPoolExecutor(max_workers=len(worker_trials)) as executor:
+        pending = {executor.submit(_run_optimization_worker, study_name, storage_path, trials, base_data, config, timeline, locations, interventions, optimization_goal, worker_seed, objective_options, pruner)
+                   for trials, worker_seed in zip(worker_trials, worker_seeds)}
+        while pending:
+            done, pending = wait(pending, timeout=poll_interval)
+            for future in done:
+                future.result()
+            if callback_func:
+                for trial in study.get_trials(deepcopy=False, states=(optuna.trial.TrialState.COMPLETE, optuna.trial.TrialState.PRUNED)):
+                    if trial.number not in reported:
+                        reported.add(trial.number)
+                        callback_func(study, trial)
+    return study
+
+def pareto_frontier(study):
+    """
+    Çok amaçlı bir çalışmanın Pareto-optimal denemelerini tablo olarak döndürür.
 
-def trigger_single_simulation(params, base_data, timeline, locations, interventions, config):
-    """SADECE TEK BİR simülasyonu çalıştırır ve ham sonuçları döndürür."""
-    simulator = KimotoSimulator(base_data, params, config)
-    simulation_results = simulator.run(timeline, locations, interventions)
-    return simulation_results
+    Her satır bir Pareto-optimal stratejidir; sütunlar deneme numarası,
+    dört hedefin değerleri (`OPTIMIZATION_GOALS`, optimize edilmemiş olanlar
+    dahil) ve strateji parametreleridir. Hedef değerleri denemelerin
+    `goal_values` niteliğinden okunduğundan hedefler arasında geçiş için
+    yeniden simülasyon gerekmez.
+    """
+    rows = [{"Deneme": trial.number, **trial.user_attrs.get("goal_values", {}), **trial.params} for trial in study.best_trials]
+    frontier = pd.DataFrame(rows, columns=["Deneme", *OPTIMIZATION_GOALS, *sorted({key for row in rows for key in row} - {"Deneme", *OPTIMIZATION_GOALS})])
+    return frontier.sort_values("Deneme", ignore_index=True)
 
-def run_monte_carlo_simulation(params, base_data, timeline, locations, interventions, config, num_runs, callback_func=None):
+def run_pareto_optimization(params, base_data, timeline, locations, interventions, config, n_trials, goals=OPTIMIZATION_GOALS, callback_func=None, n_workers=1, storage_path=None, seed=None, poll_interval=0.5, objective_options=None):
     """
-    Belirtilen senaryoyu `num_runs` kadar çalıştırır ve sonuçların detaylı dağılımını döndürür.
+    Seçilen hedefleri tek bir çok amaçlı Optuna çalışmasında birlikte optimize eder.
+
+    Her hedef için ayrı bir çalışma yürütmek yerine tüm hedefler aynı
+    denemelerde puanlanır ve Pareto sınırı döndürülür. Parametreler
+    `run_optimization` ile aynıdır; `storage_path` verildiğinde sınır çalışma
+    deposunda kalıcıdır ve `load_pareto_frontier` ile yeniden okunabilir.
+
+    Args:
+        goals (sequence, optional): `OPTIMIZATION_GOALS` içinden en az iki hedef.
+
+    Returns:
+        tuple: (Pareto sınırı DataFrame'i (`pareto_frontier`), tüm denemelerin DataFrame'i).
+    """
+    goals = _as_goal_list(goals)
+    if len(goals) < 2:
+        raise ValueError("Çok amaçlı optimizasyon için en az iki hedef seçilmelidir.")
+    study = _optimize_study(base_data, config, timeline, locations, interventions, goals, n_trials, ["minimize"] * len(goals),
+                            callback_func, n_workers, storage_path, seed, poll_interval, objective_options)
+    return pareto_frontier(study), study.trials_dataframe()
+
+def load_pareto_frontier(base_data, config, timeline, locations, interventions, goals, storage_path, objective_options=None):
+    """Aynı senaryo için daha önce kaydedilmiş Pareto sınırını depodan okur; çalışma yoksa `None` döndürür."""
+    study_name = optimization_study_name(base_data, config, timeline, locations, interventions, _as_goal_list(goals), objective_options or {})
+    try:
+        study = optuna.load_study(study_name=study_name, storage=_open_study_storage(storage_path))
+    except KeyError:
+        return None
+    return pareto_frontier(study) if study.get_trials(deepcopy=False, states=(optuna.trial.TrialState.COMPLETE,)) else None
+
+STRATEGY_SPACE_COLUMNS = ('uretim_s', 'transport_m', 'stok_s', 'mevsimsellik_etkisi', 'ozel_sku_modu')
+
+def strategy_space(config):
+    """
+    Simülasyon sonucunu etkileyen tüm kesikli strateji kombinasyonlarını listeler.
+
+    Taşıma modu yalnızca çevik merkez stratejilerinde seçilebildiğinden
+    mevcut stratejiyle yalnızca 'default' eşleşir. Tahmin algoritması ve veri
+    kaynakları yalnızca talep tahmin doğruluğunu değiştirdiği için bu listeye
+    dahil edilmez (bkz. `enumerate_strategy_space`).
+
+    Returns:
+        list: `STRATEGY_SPACE_COLUMNS` anahtarlarına sahip parametre sözlükleri.
+    """
+    cfg_strat = config['strategy_impacts']
+    transport_options = [mode for mode in cfg_strat['transport']['modes'] if mode != 'default']
+    combinations = []
+    for uretim_s, uretim_cfg in cfg_strat['uretim'].items():
+        for transport_m in (transport_options if uretim_cfg.get("is_agile_hub", False) else ['default']):
+            for stok_s, mevsimsellik, ozel_sku in product(cfg_strat['stok'], (False, True), (False, True)):
+                combinations.append(dict(zip(STRATEGY_SPACE_COLUMNS, (uretim_s, transport_m, stok_s, mevsimsellik, ozel_sku))))
+    return combinations
+
+def _slider_grid(config, slider_points):
+    """(İÇ) Her kaydırıcı için adımına yuvarlanmış, eşit aralıklı `slider_points` değer üretir."""
+    grid = {}
+    for key, slider_config in config['ui_settings']['sliders'].items():
+        steps = np.round((np.linspace(slider_config['min'], slider_config['max'], slider_points) - slider_config['min']) / slider_config['step'])
+        grid[key] = np.unique(np.round(slider_config['min'] + steps * slider_config['step'], 10))
+    return grid
+
+def enumerate_strategy_space(base_data, config, timeline, locations, interventions, optimization_goal=OPTIMIZATION_GOALS[0], slider_points=5, replications=32, statistic="mean", alpha=0.1, crn_seed=0, max_batch_rows=200_000):
+    """
+    Tüm kesikli strateji kombinasyonlarını bir kaydırıcı ızgarası üzerinde tek bir vektörel taramada değerlendirir.
+
+    Her (kombinasyon, kaydırıcı noktası) bir strateji grubudur ve
+    `replications` tekrarla simüle edilir. Gruplar, farklı parametreli satırları
+    destekleyen `BatchKimotoSimulator` ile toplu halde çalıştırılır; tüm gruplar
+    aynı `crn_seed` ile ortak rastgele sayıları paylaşır, bu nedenle
+    sıralamadaki farklar gürültüden değil stratejilerden kaynaklanır. Skorlar
+    `objective` ile aynı şekilde (`statistic`, `alpha`) özetlenir.
+
+    Tahmin algoritması ve veri kaynağı seçimleri simülasyonda yalnızca talep
+    tahmin doğruluğunu (`tahmin_d`) belirlediğinden simüle edilmez; tablo
+    bunlarla analitik olarak genişletilir ve eşit skorlarda daha yüksek
+    `tahmin_d` öne alınır.
+
+    Args:
+        optimization_goal (str): Sıralamada kullanılacak hedef.
+        slider_points (int, optional): Kaydırıcı başına ızgara noktası sayısı.
+        replications (int, optional): Grup başına tekrar sayısı.
+        max_batch_rows (int, optional): Tek bir toplu simülasyondaki en fazla satır.
+
+    Returns:
+        pd.DataFrame: 'Sıra', strateji parametreleri, 'tahmin_d' ve dört hedefin
+            değerlerini içeren, `optimization_goal`'e göre sıralanmış tablo.
+    """
+    _as_goal_list(optimization_goal)
+    slider_grid = _slider_grid(config, slider_points)
+    groups = [{**combination, **dict(zip(slider_grid, slider_values))}
+              for combination in strategy_space(config)
+              for slider_values in product(*slider_grid.values())]
+
+    groups_per_batch = max(1, max_batch_rows // replications)
+    goal_rows = []
+    for start in range(0, len(groups), groups_per_batch):
+        batch_groups = groups[start:start + groups_per_batch]
+        simulator = BatchKimotoSimulator(base_data, batch_groups, config, len(batch_groups) * replications,
+                                         np.random.default_rng(crn_seed), common_random_numbers=True)
+        batch_results = simulator.run(timeline, locations, interventions)
+        replication_values = {
+            "Yıllık Net Kârı Maksimize Et": simulator.monthly_kpis[:, :, _KAR].sum(axis=1),
+            "Final OTIF'i Maksimize Et": batch_results['final_otifs'],
+            "Final Esneklik Skorunu Maksimize Et": batch_results['final_flexibility'],
+            "CO2 Tasarrufunu Maksimize Et": batch_results['co2_savings'],
+        }
+        for group_idx in range(len(batch_groups)):
+            rows = slice(group_idx * replications, (group_idx + 1) * replications)
+            goal_rows.append({goal: _aggregate_goal_values(values[rows], statistic, alpha) for goal, values in replication_values.items()})
+
+    simulated = pd.concat([pd.DataFrame(groups), pd.DataFrame(goal_rows)], axis=1)
+
+    model_cfg = config['strategy_impacts']['tahmin_modeli']
+    forecast_options = []
+    for algorithm, *flags in product(model_cfg['algoritmalar'], *[(False, True)] * len(model_cfg['veri_kaynaklari'])):
+        forecast_params = {'tahmin_algoritmasi': algorithm, **dict(zip(model_cfg['veri_kaynaklari'], flags))}
+        forecast_params['tahmin_d'] = calculate_tahmin_d(forecast_params, config)
+        forecast_options.append(forecast_params)
+
+    ranking = simulated.merge(pd.DataFrame(forecast_options), how="cross")
+    ranking = ranking.sort_values([optimization_goal, 'tahmin_d'], ascending=False, kind="stable", ignore_index=True)
+    ranking.insert(0, "Sıra", np.arange(1, len(ranking) + 1))
+    logger.info(f"Strateji uzayı tarandı: {len(groups)} simüle edilen grup, {len(ranking)} kombinasyon.")
+    return ranking
+
+def best_enumerated_strategy(ranking, config, include_sliders=False):
+    """Sıralama tablosunun ilk satırındaki kesikli (isteğe bağlı olarak kaydırıcılar dahil) parametreleri sade Python değerleriyle döndürür."""
+    excluded = {"Sıra", "tahmin_d", *OPTIMIZATION_GOALS}
+    if not include_sliders:
+        excluded |= set(config['ui_settings']['sliders'])
+    return {key: (value.item() if isinstance(value, np.generic) else value) for key, value in ranking.iloc[0].items() if key not in excluded}
+
+def trigger_single_simulation(params, base_data, timeline, locations, interventions, config, seed=None):
+    """SADECE TEK BİR simülasyonu çalıştırır ve ham sonuçları döndürür.
+
+    `seed` verilirse simülasyon tekrarlanabilirdir ve sonuç önbelleğe alınır;
+    aynı girdilerle yapılan sonraki çağrılar yeniden simülasyon yapmaz. Yalnızca
+    senaryonun sonraki ayları değiştirildiğinde ise simülasyon, ay sonu kontrol
+    noktalarından ilk değişen aydan devam eder.
+    """
+    def simulate():
+        if seed is None:
+            return KimotoSimulator(base_data, params, config).run(timeline, locations, interventions)
+        simulator = KimotoSimulator(base_data, params, config, rng=random.Random(seed))
+        return simulator.run(timeline, locations, interventions, use_checkpoints=True)
+    return _cached_result("trigger_single_simulation", seed, simulate, params, base_data, timeline, locations, interventions, config)
+
+def trigger_paired_simulations(strategies, base_data, timeline, locations, interventions, config, seed=None):
+    """Birden fazla stratejiyi aynı rastgele sayı akışıyla (ortak rastgele sayılar) birer kez simüle eder.
+
+    `seed` verilirse her strateji `trigger_single_simulation` ile bu tohumla
+    çalıştırılır (ve önbelleğe alınır). Verilmezse tek seferlik yeni bir
+    tohum çekilir ve tüm stratejiler onunla, önbelleğe alınmadan çalıştırılır;
+    böylece stratejiler arasındaki fark farklı kriz ve gürültü çekilişlerinden
+    kaynaklanmaz.
+
+    Returns:
+        list: Her strateji için `KimotoSimulator.run` sonuç sözlüğü.
+    """
+    if seed is not None:
+        return [trigger_single_simulation(params, base_data, timeline, locations, interventions, config, seed=seed) for params in strategies]
+    shared_seed = _seed_for_random(np.random.SeedSequence())
+    return [KimotoSimulator(base_data, params, config, rng=random.Random(shared_seed)).run(timeline, locations, interventions) for params in strategies]
+
+def _seed_for_random(seed_sequence):
+    """(İÇ) Bir `np.random.SeedSequence`'i `random.Random` için tamsayı tohuma dönüştürür."""
+    return int(seed_sequence.generate_state(1, dtype=np.uint64)[0])
+
+def _build_monte_carlo_record(run_id, summary, realized_events):
+    """(İÇ) Tek bir Monte Carlo tekrarının sonucunu standart sözlük biçimine getirir."""
+    return {
+        "run_id": run_id,
+        "annual_profits": float(summary['annual_profit_change']),
+        "final_otifs": float(summary['final_otif']),
+        "final_flexibility": float(summary['final_flexibility']),
+        "final_satisfaction": float(summary['final_satisfaction']),
+        "final_turnover": float(summary['final_turnover']),
+        "co2_savings": float(summary['co2_savings']),
+        "realized_events": realized_events
+    }
+
+def _run_scalar_monte_carlo_chunk(params, base_data, timeline, locations, interventions, config, run_ids, seed_sequences):
+    """(İÇ) Bir grup Monte Carlo tekrarını skaler motorla çalıştırır.
+
+    Süreç havuzundaki işçiler tarafından da çağrıldığı için modül düzeyindedir.
+    Her tekrar kendi `SeedSequence`'inden türetilen bağımsız bir akış kullanır;
+    tohum verilmemişse (`None`) modül düzeyindeki `random` kullanılır.
+    """
+    chunk_data = []
+    for run_id, seed_sequence in zip(run_ids, seed_sequences):
+        rng = random.Random(_seed_for_random(seed_sequence)) if seed_sequence is not None else None
+        simulator = KimotoSimulator(base_data, params, config, rng=rng)
+        results = simulator.run(timeline, locations, interventions, summary_only=True)
+        chunk_data.append(_build_monte_carlo_record(run_id, results['summary'], results['realized_events']))
+    return chunk_data
+
+def _run_batch_monte_carlo_block(params, base_data, timeline, locations, interventions, config, first_run_id, block_size, seed_sequence, sampling="random"):
+    """(İÇ) Bir blok Monte Carlo tekrarını vektörel motorla, bloğa özel akışla çalıştırır."""
+    simulator = BatchKimotoSimulator(base_data, params, config, block_size, np.random.default_rng(seed_sequence), sampling=sampling)
+    batch_results = simulator.run(timeline, locations, interventions)
+
+    block_data = []
+    for i in range(block_size):
+        summary = {
+            'annual_profit_change': batch_results['annual_profits'][i],
+            'final_otif': batch_results['final_otifs'][i],
+            'final_flexibility': batch_results['final_flexibility'][i],
+            'final_satisfaction': batch_results['final_satisfaction'][i],
+            'final_turnover': batch_results['final_turnover'][i],
+            'co2_savings': batch_results['co2_savings'][i]
+        }
+        block_data.append(_build_monte_carlo_record(first_run_id + i, summary, batch_results['realized_events'][i]))
+    return block_data
+
+def _execute_monte_carlo_tasks(tasks, num_runs, callback_func, n_workers):
+    """(İÇ) Monte Carlo görevlerini sırayla veya süreç havuzunda çalıştırır ve ilerlemeyi bildirir.
+
+    Args:
+        tasks (list): (fonksiyon, argümanlar, tekrar_sayısı) üçlülerinden oluşan liste.
+        num_runs (int): Toplam tekrar sayısı (ilerleme bildirimi için).
+        callback_func (callable, optional): `callback_func(tamamlanan, toplam)`.
+        n_workers (int): İşçi süreç sayısı. 1 ise görevler bu süreçte çalışır.
+
+    Returns:
+        list: `run_id`'ye göre sıralanmış tekrar sonuçları.
     """
     simulation_runs_data = []
+    completed_runs = 0
+
+    if n_workers <= 1:
+        for task_func, task_args, task_runs in tasks:
+            simulation_runs_data.extend(task_func(*task_args))
+            completed_runs += task_runs
+            if callback_func:
+                callback_func(completed_runs, num_runs)
+        return simulation_runs_data
+
+    with ProcessPoolExecutor(max_workers=n_workers) as executor:
+        futures = {executor.submit(task_func, *task_args): task_runs for task_func, task_args, task_runs in tasks}
+        for future in as_completed(futures):
+            simulation_runs_data.extend(future.result())
+            completed_runs += futures[future]
+            if callback_func:
+                callback_func(completed_runs, num_runs)
+
+    simulation_runs_data.sort(key=lambda run: run["run_id"])
+    return simulation_runs_data
 
-    for i in range(num_runs):
-        simulator = KimotoSimulator(base_data, params, config)
-        results = simulator.run(timeline, locations, interventions)
-        
-        summary = results['summary']
-        
-        realized_events_list = [
-            {"event": row["Gerçekleşen Olay"], "source": row["Olay Kaynağı"]}
-            for _, row in results['results_df'].iterrows() if row["Gerçekleşen Olay"] != "Kriz Yok"
-        ]
-
-        simulation_runs_data.append({
-            "run_id": i + 1,
-            "annual_profits": summary['annual_profit_change'],
-            "final_otifs": summary['final_otif'],
-            "final_flexibility": summary['final_flexibility'],
-            "final_satisfaction": summary['final_satisfaction'],
-            "co2_savings": summary['co2_savings'],
-            "realized_events": realized_events_list
-        })
-        
-        if callback_func:
-            callback_func(i + 1, num_runs)
+def run_monte_carlo_simulation(params, base_data, timeline, locations, interventions, config, num_runs, callback_func=None, engine="scalar", batch_size=1000, seed=None, n_workers=1, sampling="random"):
+    """
+    Belirtilen senaryoyu `num_runs` kadar çalıştırır ve sonuçların detaylı dağılımını döndürür.
+
+    `engine="batch"` seçildiğinde tekrarlar `BatchKimotoSimulator` ile
+    `batch_size` büyüklüğündeki bloklar halinde vektörel olarak çalıştırılır;
+    dönen liste skaler motorla aynı biçimdedir.
+
+    `n_workers` 1'den büyükse tekrarlar bir süreç havuzuna dağıtılır. Skaler
+    motorda her tekrar, vektörel motorda her blok `seed` ana tohumundan
+    türetilen bağımsız bir akış kullanır; bu nedenle aynı `seed` ile sonuçlar
+    işçi sayısından bağımsız olarak birebir aynıdır.
+
+    `sampling` yalnızca vektörel motorda geçerlidir ve her blok içinde karşıt
+    ("antithetic"), Latin hiperküp ("lhs") veya Halton ("halton") çekilişleri
+    kullanılmasını sağlar.
 
+    `seed` verilirse sonuçlar önbelleğe alınır; önbellekten karşılanan
+    çağrılarda `callback_func` yalnızca bir kez tamamlanma için çağrılır.
+    """
+    if engine != "batch" and sampling != "random":
+        raise ValueError("Varyans azaltma örneklemesi yalnızca 'batch' motorunda kullanılabilir.")
+    if engine not in ("batch", "scalar"):
+        raise ValueError(f"Bilinmeyen Monte Carlo motoru: '{engine}'")
+
+    computed = []
+    def simulate():
+        computed.append(True)
+        return _run_monte_carlo_tasks(params, base_data, timeline, locations, interventions, config, num_runs, callback_func, engine, batch_size, seed, n_workers, sampling)
+    simulation_runs_data = _cached_result("run_monte_carlo_simulation", seed, simulate, params, base_data, timeline, locations, interventions, config,
+                                          num_runs, engine, batch_size, sampling)
+    if not computed and callback_func:
+        callback_func(num_runs, num_runs)
     return simulation_runs_data
 
+def _run_monte_carlo_tasks(params, base_data, timeline, locations, interventions, config, num_runs, callback_func, engine, batch_size, seed, n_workers, sampling):
+    """(İÇ) Monte Carlo tekrarlarını motora göre görevlere böler ve çalıştırır."""
+    if engine == "batch":
+        block_starts = list(range(0, num_runs, batch_size))
+        seed_sequences = np.random.SeedSequence(seed).spawn(len(block_starts))
+        tasks = []
+        for start, seed_sequence in zip(block_starts, seed_sequences):
+            block_size = min(batch_size, num_runs - start)
+            tasks.append((_run_batch_monte_carlo_block, (params, base_data, timeline, locations, interventions, config, start + 1, block_size, seed_sequence, sampling), block_size))
+    else:
+        if seed is None and n_workers <= 1:
+            seed_sequences = [None] * num_runs
+        else:
+            seed_sequences = np.random.SeedSequence(seed).spawn(num_runs)
+        chunk_size = 1 if n_workers <= 1 else max(1, -(-num_runs // (n_workers * 8)))
+        tasks = []
+        for start in range(0, num_runs, chunk_size):
+            run_ids = list(range(start + 1, min(start + chunk_size, num_runs) + 1))
+            tasks.append((_run_scalar_monte_carlo_chunk, (params, base_data, timeline, locations, interventions, config, run_ids, seed_sequences[start:start + chunk_size]), len(run_ids)))
+
+    logger.info(f"Monte Carlo başlatılıyor. Motor: {engine}, Tekrar: {num_runs}, İşçi: {n_workers}, Tohum: {seed}")
+    return _execute_monte_carlo_tasks(tasks, num_runs, callback_func, n_workers)
+
+def run_variance_reduced_monte_carlo(params, base_data, timeline, locations, interventions, config, num_runs, sampling="antithetic", control_variate=True, num_replicates=10, seed=None, metrics=MC_METRICS):
+    """
+    Varyans azaltma teknikleriyle Monte Carlo ortalamalarını tahmin eder ve elde edilen kazancı raporlar.
+
+    Tekrarlar `num_replicates` bağımsız bloğa bölünür. Her blok `sampling`
+    yöntemiyle (karşıt çiftler, Latin hiperküp veya Halton) çalıştırılır;
+    `control_variate=True` ise blok ortalaması, her çekilişin deterministik
+    gürültüsüz yörüngedeki değerinden sapmalarını kontrol değişkeni olarak
+    kullanan regresyonla düzeltilir. Tahminin standart hatası blok
+    tahminlerinin dağılımından, düz Monte Carlo'nun standart hatası ise
+    tekrar başına varyanstan hesaplanır.
+
+    Returns:
+        dict: Metrik adı -> {'estimate', 'standard_error', 'plain_standard_error',
+            'variance_reduction'}. 'variance_reduction', aynı hassasiyete düz
+            Monte Carlo ile ulaşmak için gereken tekrar sayısı katsayısıdır.
+    """
+    block_size = num_runs // num_replicates
+    if num_replicates < 2 or block_size < 2:
+        raise ValueError("Varyans tahmini için en az 2 blok ve blok başına en az 2 tekrar gerekir.")
+
+    block_estimates = {metric: [] for metric in metrics}
+    per_run_moments = {metric: RunningMoments() for metric in metrics}
+    for seed_sequence in np.random.SeedSequence(seed).spawn(num_replicates):
+        simulator = BatchKimotoSimulator(base_data, params, config, block_size, np.random.default_rng(seed_sequence),
+                                         sampling=sampling, record_controls=control_variate)
+        batch_results = simulator.run(timeline, locations, interventions)
+        for metric in metrics:
+            values = batch_results[metric]
+            per_run_moments[metric].update(values)
+            block_estimates[metric].append(control_variate_mean(values, batch_results["controls"]) if control_variate else float(values.mean()))
+
+    report = {}
+    for metric in metrics:
+        estimates = np.array(block_estimates[metric])
+        standard_error = estimates.std(ddof=1) / np.sqrt(num_replicates)
+        plain_standard_error = per_run_moments[metric].standard_error
+        report[metric] = {
+            "estimate": float(estimates.mean()),
+            "standard_error": float(standard_error),
+            "plain_standard_error": float(plain_standard_error),
+            "variance_reduction": float(plain_standard_error ** 2 / standard_error ** 2) if standard_error > 0 else float("inf")
+        }
+    logger.info(f"Varyans azaltmalı Monte Carlo tamamlandı. Yöntem: {sampling}, Kontrol değişkeni: {control_variate}, Tekrar: {block_size * num_replicates}")
+    return report
+
+def run_importance_sampling_monte_carlo(params, base_data, timeline, locations, interventions, config, num_runs, alphas=(0.01, 0.05), domino_probability=0.9, impact_shift=1.0, directions=None, batch_size=10000, seed=None):
+    """
+    Domino zincirleri ve aşırı kriz etkileri için önem örneklemesiyle kuyruk riskini tahmin eder.
+
+    Tekrarlar `ImportanceTilt` ile kuyruğa kaydırılmış dağılımdan (daha
+    yüksek Domino olasılığı, daha olumsuz normal etki ortalamaları) çekilir ve
+    her tekrar olabilirlik oranıyla ağırlıklandırılır. Yıllık kâr
+    değişiminin (`annual_profit_change`) VaR/CVaR değerleri bu ağırlıklarla
+    hesaplanır.
+
+    Args:
+        num_runs (int): Toplam tekrar sayısı.
+        alphas (tuple, optional): Kuyruk olasılıkları (örn. 0.01 -> P1).
+        domino_probability (float, optional): Kaydırılmış Domino olasılığı.
+        impact_shift (float, optional): Normal etkilerin standart sapma cinsinden kayması.
+        directions (dict, optional): Kanal -> kayma yönü (`ImportanceTilt`).
+        batch_size (int, optional): Blok başına tekrar sayısı.
+        seed (int, optional): Tekrarlanabilir sonuçlar için tohum değeri.
+
+    Returns:
+        dict: 'var' ve 'cvar' ({alpha: değer}), ağırlıklı 'mean',
+            'effective_sample_size', 'num_runs' ve 'domino_rate' (kaydırılmış
+            dağılımda en az bir Domino görülen tekrar oranı).
+    """
+    tilt = ImportanceTilt(domino_probability, impact_shift, directions)
+    block_starts = list(range(0, num_runs, batch_size))
+    profits, log_weights, domino_runs = [], [], 0
+    for start, seed_sequence in zip(block_starts, np.random.SeedSequence(seed).spawn(len(block_starts))):
+        block_size = min(batch_size, num_runs - start)
+        simulator = BatchKimotoSimulator(base_data, params, config, block_size, np.random.default_rng(seed_sequence), importance_tilt=tilt)
+        batch_results = simulator.run(timeline, locations, interventions)
+        profits.append(batch_results["annual_profits"])
+        log_weights.append(batch_results["log_weights"])
+        domino_runs += sum(any(event["source"] == "Domino Etkisi" for event in run_events) for run_events in batch_results["realized_events"])
+
+    profits = np.concatenate(profits)
+    log_weights = np.concatenate(log_weights)
+    weights = np.exp(log_weights - log_weights.max())
+
+    report = {"var": {}, "cvar": {}, "num_runs": num_runs, "domino_rate": domino_runs / num_runs,
+              "mean": float((weights * profits).sum() / weights.sum()),
+              "effective_sample_size": effective_sample_size(weights)}
+    for alpha in alphas:
+        report["var"][alpha], report["cvar"][alpha] = weighted_tail_risk(profits, weights, alpha)
+    logger.info(f"Önem örneklemeli Monte Carlo tamamlandı. Tekrar: {num_runs}, Etkin örneklem: {report['effective_sample_size']:.0f}")
+    return report
+
+def run_paired_monte_carlo(strategies, base_data, timeline, locations, interventions, config, num_runs, reference=0, confidence=0.95, batch_size=5000, seed=None, metrics=MC_METRICS):
+    """
+    Birden fazla stratejiyi ortak rastgele sayılarla (eşlenmiş tekrarlar) karşılaştırır.
+
+    Her blokta tüm stratejiler tek bir `BatchKimotoSimulator` içinde strateji
+    grupları olarak ve `common_random_numbers=True` ile simüle edilir; böylece
+    her stratejinin `i`. tekrarı aynı kriz, Domino ve gürültü çekilişlerini
+    görür. Farklar tekrar başına alındığından ortak gürültü birbirini götürür
+    ve strateji farkının güven aralığı bağımsız çalıştırmalara göre çok daha
+    dardır.
+
+    Args:
+        strategies (list): Karşılaştırılacak strateji parametre sözlükleri (en az iki).
+        num_runs (int): Strateji başına tekrar sayısı.
+        reference (int, optional): Farkların alınacağı referans stratejinin sırası.
+        confidence (float, optional): Güven düzeyi.
+        batch_size (int, optional): Blok başına (strateji başına) tekrar sayısı.
+        seed (int, optional): Tekrarlanabilir sonuçlar için tohum değeri.
+            Verilirse sonuç önbelleğe alınır.
+        metrics (tuple, optional): Karşılaştırılacak metrikler.
+
+    Returns:
+        dict: 'values' ve 'differences' ({metrik: (strateji × tekrar) dizisi}),
+            'summary' ({metrik: `paired_difference_summary` sonucu}),
+            'confidence', 'num_runs' ve 'reference'.
+    """
+    strategies = list(strategies)
+    if len(strategies) < 2:
+        raise ValueError("Eşlenmiş karşılaştırma için en az iki strateji gereklidir.")
+    if not 0 <= reference < len(strategies):
+        raise ValueError(f"Geçersiz referans strateji sırası: {reference}")
+    return _cached_result("run_paired_monte_carlo", seed,
+                          lambda: _compute_paired_monte_carlo(strategies, base_data, timeline, locations, interventions, config, num_runs, reference, confidence, batch_size, seed, metrics),
+                          strategies, base_data, timeline, locations, interventions, config, num_runs, reference, confidence, batch_size, list(metrics))
+
+def _compute_paired_monte_carlo(strategies, base_data, timeline, locations, interventions, config, num_runs, reference, confidence, batch_size, seed, metrics):
+    """(İÇ) `run_paired_monte_carlo` için eşlenmiş blokları çalıştırır ve farkları özetler."""
+    num_strategies = len(strategies)
+    block_starts = list(range(0, num_runs, batch_size))
+    blocks = {metric: [] for metric in metrics}
+    for start, seed_sequence in zip(block_starts, np.random.SeedSequence(seed).spawn(len(block_starts))):
+        block_size = min(batch_size, num_runs - start)
+        simulator = BatchKimotoSimulator(base_data, strategies, config, num_strategies * block_size, np.random.default_rng(seed_sequence), common_random_numbers=True)
+        batch_results = simulator.run(timeline, locations, interventions)
+        for metric in metrics:
+            blocks[metric].append(batch_results[metric].reshape(num_strategies, block_size))
+
+    values = {metric: np.concatenate(metric_blocks, axis=1) for metric, metric_blocks in blocks.items()}
+    logger.info(f"Eşlenmiş Monte Carlo tamamlandı. Strateji: {num_strategies}, Tekrar: {num_runs}")
+    return {
+        "values": values,
+        "differences": {metric: metric_values - metric_values[reference] for metric, metric_values in values.items()},
+        "summary": {metric: paired_difference_summary(metric_values, reference, confidence) for metric, metric_values in values.items()},
+        "confidence": confidence,
+        "num_runs": num_runs,
+        "reference": reference,
+    }
+
+def _run_batch_monte_carlo_block_summary(params, base_data, timeline, locations, interventions, config, first_run_id, block_size, seed_sequence, accumulator_options, erp_profile=None):
+    """(İÇ) Bir blok tekrarı vektörel motorla çalıştırır ve sonuçları bir `MonteCarloAccumulator` olarak döndürür.
+
+    `erp_profile` verilirse her tekrarın son durum depo kullanımı ve kategori
+    tonajları da (`_erp_metric_arrays`) birikimciye eklenir.
+    """
+    simulation_seed, accumulator_seed = seed_sequence.spawn(2)
+    simulator = BatchKimotoSimulator(base_data, params, config, block_size, np.random.default_rng(simulation_seed))
+    batch_results = simulator.run(timeline, locations, interventions)
+
+    metric_arrays = {metric: batch_results[metric] for metric in MC_METRICS}
+    if erp_profile is not None:
+        metric_arrays.update(_erp_metric_arrays(erp_profile, batch_results['final_turnover'], batch_results['realized_events'], params, config))
+    accumulator = MonteCarloAccumulator(seed=accumulator_seed, **accumulator_options)
+    accumulator.update(metric_arrays, batch_results['realized_events'], first_run_id)
+    return accumulator
+
+def _erp_metric_arrays(erp_profile, final_turnovers, realized_events, params, config):
+    """(İÇ) Tekrarların son durum ERP metriklerini birikimci metrik adlarıyla döndürür."""
+    erp_state = batch_final_erp_state(erp_profile, final_turnovers, [[event["event"] for event in run_events] for run_events in realized_events], params.get('stok_s'), config)
+    arrays = {"final_turnover": np.asarray(final_turnovers, dtype=float), "warehouse_utilization": erp_state["kullanim_orani"], "warehouse_excess_tons": erp_state["fark_ton"]}
+    arrays.update({f"stock_tons_{category}": tons for category, tons in erp_state["kategori_ton"].items()})
+    return arrays
+
+def stream_monte_carlo_simulation(params, base_data, timeline, locations, interventions, config, num_runs, batch_size=1000, seed=None, n_workers=1, thresholds=None, sketch_k=200, reservoir_size=5000, batch_quantiles=None, erp_data=None):
+    """
+    Monte Carlo tekrarlarını bloklar halinde çalıştıran ve sabit boyutlu özet döndüren üreteç.
+
+    `run_monte_carlo_simulation`'dan farklı olarak tekrar başına kayıt
+    biriktirmez; her blok vektörel motorla çalıştırılıp bir
+    `MonteCarloAccumulator`'a (Welford momentleri, kantil özetleri, eşik ve
+    kriz sayaçları, sınırlı tekrar örneklemi) eklenir. Bu sayede bellek
+    kullanımı tekrar sayısından bağımsızdır.
+
+    Args:
+        num_runs (int): Toplam tekrar sayısı.
+        batch_size (int, optional): Blok başına tekrar sayısı.
+        seed (int, optional): Tekrarlanabilir sonuçlar için ana tohum.
+        n_workers (int, optional): İşçi süreç sayısı; bloklar süreç havuzunda
+            çalıştırılıp özetleri ana süreçte gönderim sırasıyla birleştirilir.
+            Kantil özetleri ve tekrar örneklemi birleştirme sırasına bağlı
+            olduğundan, aynı tohum işçi sayısından bağımsız olarak aynı özeti verir.
+            Havuza aynı anda en fazla `2 * n_workers` blok gönderilir; üreteç
+            erken kapatılırsa (örn: uyarlamalı durma) kalan bloklar hiç başlatılmaz.
+        thresholds (dict, optional): Kesin sayılacak eşikler. {metrik: [eşikler]}.
+        sketch_k (int, optional): Kantil özetlerinin doğruluk parametresi.
+        reservoir_size (int, optional): Grafikler için saklanacak tekrar sayısı.
+        batch_quantiles (dict, optional): Blok başına tahmini tutulacak kantiller
+            (güven aralıkları için). {metrik: [kantiller]}.
+        erp_data (pd.DataFrame, optional): Verilirse her tekrarın son durum
+            stok devir hızı, depo kullanımı, kapasite aşımı (ton) ve kategori
+            tonajları (`ErpGroupProfile.metric_names`) da özetlenir; depo
+            kullanımının %100 eşiği kesin sayılır. SKU tablosu tekrar başına
+            çoğaltılmaz, kategori ve bayrak gruplarına indirgenir.
+
+    Yields:
+        tuple: (tamamlanan_tekrar, MonteCarloAccumulator). Her blok sonrası aynı
+            birikimci nesnesi güncellenmiş haliyle döndürülür.
+    """
+    accumulator_options = {"thresholds": thresholds, "sketch_k": sketch_k, "reservoir_size": reservoir_size, "batch_quantiles": batch_quantiles}
+    erp_profile = None
+    if erp_data is not None and not erp_data.empty:
+        erp_profile = ErpGroupProfile.from_frame(erp_data)
+        tracked_thresholds = {metric: list(values) for metric, values in (thresholds or {}).items()}
+        if WAREHOUSE_BREACH_UTILIZATION not in tracked_thresholds.setdefault("warehouse_utilization", []):
+            tracked_thresholds["warehouse_utilization"].append(WAREHOUSE_BREACH_UTILIZATION)
+        accumulator_options.update(metrics=MC_METRICS + erp_profile.metric_names, thresholds=tracked_thresholds)
+    block_starts = list(range(0, num_runs, batch_size))
+    root_sequence = np.random.SeedSequence(seed)
+    accumulator = MonteCarloAccumulator(seed=root_sequence.spawn(1)[0], **accumulator_options)
+    seed_sequences = root_sequence.spawn(len(block_starts))
+    tasks = [(params, base_data, timeline, locations, interventions, config, start + 1, min(batch_size, num_runs - start), seed_sequence, accumulator_options, erp_profile)
+             for start, seed_sequence in zip(block_starts, seed_sequences)]
+
+    logger.info(f"Akışlı Monte Carlo başlatılıyor. Tekrar: {num_runs}, Blok: {batch_size}, İşçi: {n_workers}, Tohum: {seed}")
+    if n_workers <= 1:
+        for task_args in tasks:
+            accumulator.merge(_run_batch_monte_carlo_block_summary(*task_args))
+            yield accumulator.count, accumulator
+        return
+
+    with ProcessPoolExecutor(max_workers=n_workers) as executor:
+        pending, submitted = deque(), 0
+        try:
+            while submitted < len(tasks) or pending:
+                while submitted < len(tasks) and len(pending) < 2 * n_workers:
+                    pending.append(executor.submit(_run_batch_monte_carlo_block_summary, *tasks[submitted]))
+                    submitted += 1
+                accumulator.merge(pending.popleft().result())
+                yield accumulator.count, accumulator
+        finally:
+            for future in pending:
+                future.cancel()
+
+def run_adaptive_monte_carlo(params, base_data, timeline, locations, interventions, config, tolerances, max_runs=100_000, batch_size=1000, min_batches=5, confidence=0.95, seed=None, n_workers=1, thresholds=None, callback_func=None, erp_data=None):
+    """
+    Monte Carlo tekrarlarını, seçilen metriklerin güven aralıkları yeterince daralana kadar çalıştırır.
+
+    Tekrarlar `stream_monte_carlo_simulation` ile bloklar halinde çalıştırılır.
+    Her bloktan sonra `tolerances` içindeki her hedefin güven aralığı yarı
+    genişliği hesaplanır; tümü toleransın altına indiğinde (en az
+    `min_batches` blok sonra) veya `max_runs` bütçesi dolduğunda durulur.
+
+    Args:
+        tolerances (dict): Hassasiyet hedefi -> izin verilen yarı genişlik.
+            Hedefler `("mean", metrik)`, `("quantile", metrik, q)` veya
+            `("probability", metrik, eşik)` biçimindedir; örn.
+            `{("mean", "annual_profits"): 100_000, ("probability", "final_otifs", 0.95): 0.01}`.
+        max_runs (int, optional): En fazla çalıştırılacak tekrar sayısı.
+        batch_size (int, optional): Blok başına tekrar sayısı.
+        min_batches (int, optional): Durma kontrolünden önce gereken en az blok sayısı.
+        confidence (float, optional): Güven düzeyi.
+        callback_func (callable, optional): `callback_func(tamamlanan, max_runs)`.
+        erp_data (pd.DataFrame, optional): Son durum depo metrikleri için ERP verisi
+            (bkz. `stream_monte_carlo_simulation`).
+
+    Returns:
+        tuple: (MonteCarloAccumulator, hassasiyet raporu). Rapor anahtarları:
+            'runs_used', 'max_runs', 'converged', 'confidence' ve her hedef için
+            tahmin, yarı genişlik ve toleransı içeren 'targets' listesi.
+
+    Raises:
+        ValueError: `max_runs` veya `batch_size` 1'den küçükse.
+    """
+    if max_runs < 1 or batch_size < 1:
+        raise ValueError("Uyarlamalı Monte Carlo için 'max_runs' ve 'batch_size' en az 1 olmalıdır.")
+    tracked_thresholds = {metric: list(values) for metric, values in (thresholds or {}).items()}
+    batch_quantiles = {}
+    for target in tolerances:
+        if target[0] == "probability" and target[2] not in tracked_thresholds.setdefault(target[1], []):
+            tracked_thresholds[target[1]].append(target[2])
+        elif target[0] == "quantile":
+            batch_quantiles.setdefault(target[1], []).append(target[2])
+
+    stream = stream_monte_carlo_simulation(params, base_data, timeline, locations, interventions, config, max_runs, batch_size=batch_size, seed=seed,
+                                           n_workers=n_workers, thresholds=tracked_thresholds, batch_quantiles=batch_quantiles, erp_data=erp_data)
+    accumulator, converged, completed_batches = None, False, 0
+    for completed_runs, accumulator in stream:
+        completed_batches += 1
+        if callback_func:
+            callback_func(completed_runs, max_runs)
+        if completed_batches >= min_batches and all(accumulator.half_width(target, confidence) <= tolerance for target, tolerance in tolerances.items()):
+            converged = True
+            break
+    stream.close()
+
+    report = {
+        "runs_used": accumulator.count,
+        "max_runs": max_runs,
+        "converged": converged,
+        "confidence": confidence,
+        "targets": [{"target": target, "estimate": float(accumulator.estimate(target)), "half_width": float(accumulator.half_width(target, confidence)), "tolerance": tolerance}
+                    for target, tolerance in tolerances.items()]
+    }
+    logger.info(f"Uyarlamalı Monte Carlo tamamlandı. Tekrar: {report['runs_used']}/{max_runs}, Yakınsadı: {converged}")
+    return accumulator, report
+
 # ==============================================================================
 # YARDIMCI, ANALİZ VE GÖRSELLEŞTİRME FONKSİYONLARI
 # ==============================================================================
@@ -531,93 +2040,132 @@ def calculate_risk_matrix(_base_data, _config, _params):
         temp_params.update(strat_params)
 
         sim_baseline = KimotoSimulator(_base_data, temp_params, _config)
-        baseline_results = sim_baseline.run(user_timeline_events={}, user_event_locations={}, interventions={})
-        baseline_profit = baseline_results['results_df'].iloc[0]['Aylık Net Kar'] 
+        baseline_results = sim_baseline.run(user_timeline_events={}, user_event_locations={}, interventions={}, summary_only=True, horizon=1)
+        baseline_profit = baseline_results['monthly_kpis']['net_kar_aylik'][0]
 
         for crisis_name in crises_to_test:
             sim_crisis = KimotoSimulator(_base_data, temp_params, _config)
             crisis_timeline = {1: crisis_name} 
-            crisis_results = sim_crisis.run(user_timeline_events=crisis_timeline, user_event_locations={}, interventions={})
-            crisis_profit = crisis_results['results_df'].iloc[0]['Aylık Net Kar']
+            crisis_results = sim_crisis.run(user_timeline_events=crisis_timeline, user_event_locations={}, interventions={}, summary_only=True, horizon=1)
+            crisis_profit = crisis_results['monthly_kpis']['net_kar_aylik'][0]
             
             profit_loss = baseline_profit - crisis_profit
             risk_matrix.loc[strat_name, crisis_name] = profit_loss
             
     return risk_matrix
 
+RISK_CUBE_DIMENSIONS = ("Üretim Stratejisi", "Stok Politikası", "Kriz", "Lokasyon", "Müdahale")
+RISK_CUBE_METRICS = ("Aylık Kâr Kaybı ($)", "OTIF Düşüşü", "Memnuniyet Düşüşü")
+
+def calculate_risk_cube(base_data, config, params, replications=200, seed=None):
+    """Tüm kriz senaryoları ve strateji kombinasyonları için tam risk küpünü hesaplar.
+
+    `EVENT_LIBRARY`'deki her kriz, her coğrafi lokasyon ("Genel" dahil) ve
+    krizin her müdahalesi; `URETIM_STRATEJILERI` × `STOK_STRATEJILERI`
+    kombinasyonlarının her biri için 1. ayda uygulanır. Her strateji
+    kombinasyonundaki tüm senaryolar tek bir `BatchKimotoSimulator` geçişinde,
+    krizsiz referansla ortak rastgele sayılar paylaşılarak simüle edilir.
+
+    Args:
+        base_data (dict): Simülasyon için başlangıç verilerini içeren sözlük.
+        config (dict): Uygulamanın genel yapılandırma sözlüğü.
+        params (dict): Üretim ve stok stratejisi dışındaki senaryo parametreleri.
+        replications (int, optional): Her senaryonun tekrar sayısı.
+        seed (int, optional): Tekrarlanabilir sonuçlar için tohum değeri.
+
+    Returns:
+        pd.DataFrame: İndeksi `RISK_CUBE_DIMENSIONS` seviyelerinden oluşan
+            MultiIndex, sütunları `RISK_CUBE_METRICS` olan risk küpü. Değerler,
+            krizsiz referansa göre ortalama kayıplardır (pozitif değer kötüleşme).
+            `seed` verilmişse sonuç önbelleğe alınır.
+    """
+    return _cached_result("calculate_risk_cube", seed, lambda: _compute_risk_cube(base_data, config, params, replications, seed),
+                          base_data, config, params, replications)
+
+def _compute_risk_cube(base_data, config, params, replications, seed):
+    """(İÇ) `calculate_risk_cube` için tüm senaryoları simüle eder."""
+    table = get_event_table()
+    locations = ["Genel"] + list(base_data['tesisler_df']['Ulke'].unique())
+
+    probes, probe_labels = [(table.none_id, "Müdahale Yok", None)], []
+    for event_id, event_name in enumerate(table.names):
+        if not table.is_active[event_id]:
+            continue
+        event_locations = locations if table.is_geographic[event_id] else ["Genel"]
+        interventions = [name for (source_id, name) in table.intervention_ids if source_id == event_id]
+        for location in event_locations:
+            for intervention_name in interventions:
+                probes.append((event_id, intervention_name, None if location == "Genel" else location))
+                probe_labels.append((event_name, location, intervention_name))
+
+    seed_sequences = np.random.SeedSequence(seed).spawn(len(URETIM_STRATEJILERI) * len(STOK_STRATEJILERI))
+    index_tuples, metric_blocks = [], []
+    for combo_idx, (uretim_s, stok_s) in enumerate((u, s) for u in URETIM_STRATEJILERI for s in STOK_STRATEJILERI):
+        combo_params = params.copy()
+        combo_params.update({'uretim_s': uretim_s, 'stok_s': stok_s})
+        simulator = BatchKimotoSimulator(base_data, combo_params, config, len(probes) * replications,
+                                         rng=np.random.default_rng(seed_sequences[combo_idx]))
+        month_one = simulator.run_first_month_probes(probes).mean(axis=1)
+        losses = month_one[0] - month_one[1:]
+        metric_blocks.append(losses[:, [_KAR, _OTIF, _MEMNUNIYET]])
+        index_tuples.extend((uretim_s, stok_s) + labels for labels in probe_labels)
+
+    index = pd.MultiIndex.from_tuples(index_tuples, names=RISK_CUBE_DIMENSIONS)
+    return pd.DataFrame(np.concatenate(metric_blocks), index=index, columns=list(RISK_CUBE_METRICS))
+
+def slice_risk_cube(risk_cube, rows, columns, metric=RISK_CUBE_METRICS[0], filters=None, aggfunc="mean"):
+    """Risk küpünden iki boyutlu bir görünüm (ısı haritası tablosu) çıkarır.
+
+    Args:
+        risk_cube (pd.DataFrame): `calculate_risk_cube` çıktısı.
+        rows (str): Satırlarda gösterilecek boyut.
+        columns (str): Sütunlarda gösterilecek boyut.
+        metric (str, optional): Gösterilecek metrik.
+        filters (dict, optional): Sabitlenecek boyutlar. {boyut: değer}.
+        aggfunc (str, optional): Kalan boyutlar üzerinde uygulanacak toplama
+            fonksiyonu ("mean", "max" vb.).
+
+    Returns:
+        pd.DataFrame: (rows × columns) boyutlu tablo.
+    """
+    if rows == columns:
+        raise ValueError("Satır ve sütun boyutları farklı olmalıdır.")
+    view = risk_cube[metric]
+    for dimension, value in (filters or {}).items():
+        view = view[view.index.get_level_values(dimension) == value]
+    return view.groupby(level=[rows, columns], sort=False).agg(aggfunc).unstack(columns)
+
 def generate_final_erp_data(initial_erp_df, final_kpis, params):
     """
     Simülasyon sonuçlarına ve parametrelere göre "son durum" ERP verisini üretir.
     Bu versiyon, vaka metnine dayalı, kategori öncelikli bir optimizasyon mantığı kullanır.
+
+    Kategori sütunu bir kez kodlanır; yeniden dengeleme oranları ve gerçekleşen
+    olayların çarpanları kategori başına, stok politikası çarpanları bayraklar
+    üzerinden SKU başına tek bir çarpan vektöründe birleştirilir ve stok sütununa
+    tek geçişte uygulanır. Diğer sütunlar kopyalanmaz, girdiyle paylaşılır.
+    Monte Carlo tekrarlarının tümü için `batch_final_erp_state` aynı çarpanları
+    grup toplamlarına uygular.
     """
     if initial_erp_df is None or initial_erp_df.empty:
         return pd.DataFrame()
-    final_df = initial_erp_df.copy()
-
-    final_df['Stok_Adedi'] = final_df['Stok_Adedi'].astype(float)
-    
-    initial_turnover = CONFIG['kpi_defaults']['stok_devir_hizi']
-    final_turnover = final_kpis['Stok Devir Hızı']
 
-    if final_turnover > 0 and abs(initial_turnover - final_turnover) > 1e-6:
-        final_df['Stok_Degeri'] = final_df['Stok_Adedi'] * final_df['Birim_Maliyet']
-        initial_total_stock_value = final_df['Stok_Degeri'].sum()
-        target_total_stock_value = initial_total_stock_value * (initial_turnover / final_turnover)
+    # Yuva 0 kategorisi eksik (NaN) SKU'lara ayrılmıştır.
+    category_codes, category_names = pd.factorize(initial_erp_df['Kategori'])
+    category_codes = category_codes + 1
+    category_slot = {category: code + 1 for code, category in enumerate(category_names)}
+    stock = initial_erp_df['Stok_Adedi'].to_numpy(dtype=float)
+    category_values = np.bincount(category_codes, weights=stock * initial_erp_df['Birim_Maliyet'].to_numpy(dtype=float), minlength=len(category_names) + 1)
 
-        value_change = initial_total_stock_value - target_total_stock_value
+    category_factor = rebalancing_factors(category_values, category_slot, CONFIG['kpi_defaults']['stok_devir_hizi'], final_kpis['Stok Devir Hızı'])
+    apply_event_factors(category_factor, [final_kpis.get('Gerçekleşen Olaylar_Listesi', [])], category_slot)
 
-        reduction_priority = ['B', 'C', 'A']
-        increase_priority = ['A', 'C', 'B']
+    sku_factor = category_factor[0, category_codes]
+    for column, value, multiplier in STOCK_POLICY_MULTIPLIERS.get(params.get('stok_s'), ()):
+        sku_factor[(initial_erp_df[column] == value).to_numpy()] *= multiplier
 
-        if value_change > 0:
-            for category in reduction_priority:
-                if value_change <= 0:
-                    break
-                category_mask = final_df['Kategori'] == category
-                category_current_value = final_df.loc[category_mask, 'Stok_Degeri'].sum()
-                if category_current_value > 0:
-                    reduction_from_this_category = min(value_change, category_current_value * 0.90)
-                    reduction_ratio = 1 - (reduction_from_this_category / category_current_value)
-                    final_df.loc[category_mask, 'Stok_Adedi'] *= reduction_ratio
-                    value_change -= reduction_from_this_category
-        elif value_change < 0: 
-            value_to_increase = abs(value_change)
-            for category in increase_priority:
-                if value_to_increase <= 0:
-                    break
-                category_mask = final_df['Kategori'] == category
-                category_current_value = final_df.loc[category_mask, 'Stok_Degeri'].sum()
-                if category_current_value > 0:
-                    increase_to_this_category = min(value_to_increase, category_current_value)
-                    increase_ratio = 1 + (increase_to_this_category / category_current_value)
-                    final_df.loc[category_mask, 'Stok_Adedi'] *= increase_ratio
-                    value_to_increase -= increase_to_this_category
-
-    if 'Stok_Degeri' in final_df.columns:
-        final_df = final_df.drop(columns=['Stok_Degeri'])
-
-    stok_s = params.get('stok_s')
-    if stok_s == 'Fazla Stokları Erit':
-        final_df.loc[final_df['Yavas_Hareket'] == True, 'Stok_Adedi'] *= 0.20
-    elif stok_s == 'SKU Optimizasyonu':
-        final_df.loc[final_df['Yavas_Hareket'] == True, 'Stok_Adedi'] = 0
-    elif stok_s == 'Kilit Müşteri Ayrıcalığı':
-        final_df.loc[final_df['Musteri_Ozel'] == True, 'Stok_Adedi'] *= 1.20
-        final_df.loc[final_df['Musteri_Ozel'] == False, 'Stok_Adedi'] *= 0.90
-
-    olay_listesi = final_kpis.get('Gerçekleşen Olaylar_Listesi', [])
-    for olay_adi in olay_listesi:
-        event_config = EVENT_LIBRARY.get(olay_adi, {})
-        erp_impact = event_config.get('erp_stock_multiplier')
-        if erp_impact:
-            multiplier = erp_impact.get('multiplier', 1.0)
-            categories = erp_impact.get('categories')
-            if categories:
-                final_df.loc[final_df['Kategori'].isin(categories), 'Stok_Adedi'] *= multiplier
-            else:
-                final_df['Stok_Adedi'] *= multiplier
-
-    final_df['Stok_Adedi'] = final_df['Stok_Adedi'].round().astype(int).clip(lower=0)
+    final_df = initial_erp_df.drop(columns=['Stok_Degeri']) if 'Stok_Degeri' in initial_erp_df.columns else initial_erp_df.copy(deep=False)
+    final_df['Stok_Adedi'] = np.clip(np.round(stock * sku_factor).astype(int), 0, None)
     return final_df
 
 def analyze_stock_and_demand_risk(df, risk_threshold=1.25):
@@ -727,37 +2275,83 @@ def analyze_stock_composition_by_category(final_erp_data, config):
 
     ton_per_unit = config.get('physical_factors', {}).get('avg_ton_per_sku_unit', 0.015)
     
-    composition = (final_erp_data.groupby('Kategori')['Stok_Adedi'].sum() * ton_per_unit).to_dict()
+    composition = (final_erp_data.groupby('Kategori', observed=True)['Stok_Adedi'].sum() * ton_per_unit).to_dict()
     
     return composition
 
-def calculate_crisis_impact_comparison(params_main, params_compare, base_data, config):
+def analyze_monte_carlo_warehouse_feasibility(initial_erp_df, mc_records, params, config):
+    """
+    Tüm Monte Carlo tekrarlarının son durum envanterinin depo kapasitesine
+    sığıp sığmadığını, SKU tablosunu tekrar başına çoğaltmadan analiz eder.
+
+    `run_monte_carlo_simulation` kayıtlarındaki son stok devir hızı ve
+    gerçekleşen olaylar, ERP tablosunun kategori/bayrak grup özetine
+    (`ErpGroupProfile`) uygulanır.
+
+    Returns:
+        dict: `batch_final_erp_state` dizileri ('kullanim_orani', 'fark_ton',
+            'gereken_hacim_ton', 'kategori_ton', 'toplam_kapasite_ton') ve
+            `summarize_warehouse_breaches` özeti ('summary'). Veri yoksa boş sözlük.
+    """
+    if initial_erp_df is None or initial_erp_df.empty or not mc_records:
+        return {}
+    profile = ErpGroupProfile.from_frame(initial_erp_df)
+    erp_state = batch_final_erp_state(profile, [record['final_turnover'] for record in mc_records],
+                                      [[event["event"] for event in record['realized_events']] for record in mc_records], params.get('stok_s'), config)
+    erp_state["summary"] = summarize_warehouse_breaches(erp_state)
+    return erp_state
+
+def calculate_crisis_impact_comparison(params_main, params_compare, base_data, config, seed=None, replications=200, confidence=0.95):
     """
     İki farklı strateji setini, belirli krizler karşısındaki finansal
     dayanıklılıkları açısından karşılaştırır.
+
+    Her iki strateji de aynı tohumlu akışla, krizsiz referans ve kriz
+    senaryoları 1. ayda `replications` tekrarla simüle edilir (ortak rastgele
+    sayılar). Tekrar başına kayıplar eşlendiğinden stratejiler arasındaki
+    fark gürültüden arındırılmış olarak güven aralığıyla raporlanır.
+    `seed` verilirse sonuç önbelleğe alınır.
+
+    Returns:
+        pd.DataFrame: Strateji ve kriz başına ortalama aylık kâr kaybı, güven
+            aralığı yarı genişliği ve ana stratejiye göre eşlenmiş fark.
     """
+    return _cached_result("calculate_crisis_impact_comparison", seed,
+                          lambda: _compute_crisis_impact_comparison(params_main, params_compare, base_data, config, seed, replications, confidence),
+                          params_main, params_compare, base_data, config, replications, confidence)
+
+def _compute_crisis_impact_comparison(params_main, params_compare, base_data, config, seed, replications, confidence):
+    """(İÇ) `calculate_crisis_impact_comparison` için temel ve kriz simülasyonlarını çalıştırır."""
     crises_to_test = ["Liman Grevi", "Hammadde Tedarikçi Krizi", "Talep Patlaması", "3PL İflası"]
+    table = get_event_table()
+    probes = [(table.none_id, "Müdahale Yok", None)]
+    for crisis_name in crises_to_test:
+        event_id = table.ids[crisis_name]
+        probes.append((event_id, "Müdahale Yok", "Hindistan" if table.is_geographic[event_id] else None))
+
+    # Tohum verilmese bile iki strateji aynı (yeni) entropiden türetilen akışı paylaşır.
+    entropy = np.random.SeedSequence(seed).entropy
+    strategies = [("Ana Strateji", params_main), ("Karşılaştırma Stratejisi", params_compare)]
+    losses = []
+    for _, params in strategies:
+        simulator = BatchKimotoSimulator(base_data, params, config, len(probes) * replications, rng=np.random.default_rng(np.random.SeedSequence(entropy)))
+        month_one_profit = simulator.run_first_month_probes(probes)[:, :, _KAR]
+        losses.append(month_one_profit[0] - month_one_profit[1:])
+    losses = np.stack(losses)
+
+    z = z_score(confidence)
     comparison_results = []
-
-    for strategy_name, params in [("Ana Strateji", params_main), ("Karşılaştırma Stratejisi", params_compare)]:
-        sim_baseline = KimotoSimulator(base_data, params, config)
-        baseline_results = sim_baseline.run({}, {}, {})
-        baseline_profit = baseline_results['results_df'].iloc[0]['Aylık Net Kar']
-
-        for crisis_name in crises_to_test:
-            sim_crisis = KimotoSimulator(base_data, params, config)
-            crisis_timeline = {1: crisis_name}
-            crisis_location = {1: "Hindistan"} if EVENT_LIBRARY[crisis_name].get("is_geographic") else {}
-            
-            crisis_results = sim_crisis.run(crisis_timeline, crisis_location, {})
-            crisis_profit = crisis_results['results_df'].iloc[0]['Aylık Net Kar']
-            
-            profit_loss = baseline_profit - crisis_profit
-            
+    for crisis_idx, crisis_name in enumerate(crises_to_test):
+        crisis_losses = losses[:, crisis_idx]
+        paired = paired_difference_summary(crisis_losses, reference=0, confidence=confidence)
+        for strategy_idx, (strategy_name, _) in enumerate(strategies):
             comparison_results.append({
                 "Strateji": strategy_name,
                 "Kriz Senaryosu": crisis_name,
-                "Aylık Kâr Kaybı ($)": profit_loss
+                "Aylık Kâr Kaybı ($)": paired["mean"][strategy_idx],
+                "Kayıp Güven Payı ($)": z * crisis_losses[strategy_idx].std(ddof=1) / replications ** 0.5 if replications > 1 else float("inf"),
+                "Ana Stratejiye Göre Fark ($)": paired["difference"][strategy_idx],
+                "Fark Güven Payı ($)": z * paired["standard_error"][strategy_idx],
             })
 
     return pd.DataFrame(comparison_results)
\ No newline at end of file
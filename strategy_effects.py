@@ -0,0 +1,87 @@
+from collections import OrderedDict
+
+import numpy as np
+
+KPI_COLUMNS = ('net_kar_aylik', 'otif', 'musteri_memnuniyeti_skoru', 'esneklik_skoru', 'stok_devir_hizi')
+_KAR, _OTIF, _MEMNUNIYET, _ESNEKLIK, _STOK_HIZI = range(len(KPI_COLUMNS))
+
+# Aylık stratejik etkileri belirleyen parametreler; diğer parametreler (örn: tek kaynak oranı) tabloyu değiştirmez.
+STRATEGY_PARAMETERS = ('lojistik_m', 'uretim_s', 'transport_m', 'stok_s', 'ozel_sku_modu', 'mevsimsellik_etkisi')
+# Toplamsal etkilerden sonra uygulanan çarpımsal gürültü: (KPI sütunu, alt sınır, üst sınır).
+STRATEGIC_NOISE = ((_KAR, 0.98, 1.02), (_OTIF, 0.99, 1.01))
+
+_SCHEDULE_CACHE = OrderedDict()
+_SCHEDULE_CACHE_SIZE = 256
+
+def build_strategy_schedule(params, config):
+    """Uzun vadeli stratejilerin gürültü öncesi aylık toplamsal etkilerini hesaplar.
+
+    3PL maliyeti, üretim merkezi ve taşıma modu OTIF bonusları, stok
+    politikasının kurulum ve etki ayları, özel SKU maliyet ve kazançları ile
+    mevsimsellik yalnızca parametrelere ve aya bağlıdır; bu nedenle tüm
+    tekrarlar ve denemeler için bir kez hesaplanabilir.
+
+    Returns:
+        np.ndarray: (ay × KPI) boyutlu toplamsal etki tablosu. Sütun sırası
+            `KPI_COLUMNS` ile aynıdır.
+    """
+    cfg_sim = config['simulation_parameters']
+    cfg_strat = config['strategy_impacts']
+    months_in_year = cfg_sim['months_in_year']
+    schedule = np.zeros((months_in_year, len(KPI_COLUMNS)))
+
+    schedule[:, _KAR] -= (cfg_strat['lojistik_3pl']['verimlilik_esigi'] - params['lojistik_m']) / months_in_year * cfg_strat['lojistik_3pl']['max_maliyet_artis_yillik']
+
+    uretim_s_config = cfg_strat['uretim'].get(params['uretim_s'], {})
+    schedule[:, _OTIF] += uretim_s_config.get("monthly_otif_bonus", 0)
+    if uretim_s_config.get("is_agile_hub", False):
+        transport_mode = params.get('transport_m', 'default')
+        schedule[:, _OTIF] += cfg_strat['transport']['modes'][transport_mode].get('monthly_otif_bonus', 0)
+
+    stok_s_config = cfg_strat['stok'].get(params['stok_s'], {})
+    schedule[:, _OTIF] += stok_s_config.get("monthly_otif_bonus", 0)
+    schedule[:, _STOK_HIZI] += stok_s_config.get("monthly_turnover_bonus", 0)
+    if params['stok_s'] == 'SKU Optimizasyonu':
+        schedule[:, _MEMNUNIYET] += stok_s_config.get("monthly_satisfaction_penalty", 0)
+
+    if params.get('ozel_sku_modu', False):
+        ozel_sku_cfg = cfg_strat['ozel_sku']
+        base_monthly_profit = config['kpi_defaults']['net_kar_aylik']
+        schedule[:, _KAR] += base_monthly_profit * ozel_sku_cfg['gelir_payi'] * ozel_sku_cfg['kar_marji_bonusu'] - ozel_sku_cfg['aylik_operasyonel_ek_maliyet']
+        schedule[:, _STOK_HIZI] -= ozel_sku_cfg['stok_hizi_yavaslama_aylik']
+
+    for month in range(1, months_in_year + 1):
+        if month in stok_s_config.get("setup_months", []):
+            schedule[month - 1, _KAR] -= stok_s_config.get("setup_cost", 0) / len(stok_s_config["setup_months"])
+        elif month in stok_s_config.get("impact_months", []):
+            schedule[month - 1, _OTIF] += stok_s_config.get("impact_otif_bonus", 0)
+        if params['mevsimsellik_etkisi'] and month in cfg_sim['mevsimsellik_aylari']:
+            schedule[month - 1, _OTIF] += cfg_sim['mevsimsellik_otif_etkisi']
+
+    return schedule
+
+def get_strategy_schedule(params, config):
+    """Parametrelerin aylık etki tablosunu önbellekten döndürür; yoksa derleyip önbelleğe ekler.
+
+    Anahtar, `STRATEGY_PARAMETERS` değerleri ve yapılandırmanın strateji ve
+    simülasyon bölümlerinin kimliğidir. Bölümler yerinde değiştirilirse önbellek
+    `clear_strategy_schedule_cache` ile boşaltılmalıdır. Önbellek kaydı bu
+    bölümlere referans tuttuğundan kimlikler yeniden kullanılamaz. Dönen tablo
+    paylaşıldığı için salt okunurdur.
+    """
+    cfg_strat, cfg_sim = config['strategy_impacts'], config['simulation_parameters']
+    key = (tuple(params.get(name) for name in STRATEGY_PARAMETERS), id(cfg_strat), id(cfg_sim), config['kpi_defaults']['net_kar_aylik'])
+    entry = _SCHEDULE_CACHE.get(key)
+    if entry is None:
+        schedule = build_strategy_schedule(params, config)
+        schedule.flags.writeable = False
+        entry = _SCHEDULE_CACHE[key] = (cfg_strat, cfg_sim, schedule)
+        if len(_SCHEDULE_CACHE) > _SCHEDULE_CACHE_SIZE:
+            _SCHEDULE_CACHE.popitem(last=False)
+    else:
+        _SCHEDULE_CACHE.move_to_end(key)
+    return entry[2]
+
+def clear_strategy_schedule_cache():
+    """Aylık etki tablosu önbelleğini boşaltır (yapılandırma yerinde değiştirildiğinde çağrılır)."""
+    _SCHEDULE_CACHE.clear()
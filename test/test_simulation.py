@@ -1,15 +1,29 @@
+import copy
+import os
 import pytest
 import pandas as pd
 from unittest.mock import MagicMock
 import random
+import numpy as np
 
-from erp_module import load_erp_data
-from simulation_engine import (KimotoSimulator, run_monte_carlo_simulation, 
-                               generate_final_erp_data)
+import erp_module
+from erp_module import load_erp_data, erp_cache_path, stream_validate_erp_csv
+from simulation_engine import (KimotoSimulator, BatchKimotoSimulator, run_monte_carlo_simulation, stream_monte_carlo_simulation, run_adaptive_monte_carlo, run_variance_reduced_monte_carlo, run_importance_sampling_monte_carlo, run_optimization, objective, run_pareto_optimization, load_pareto_frontier, OPTIMIZATION_GOALS,
+                               enumerate_strategy_space, best_enumerated_strategy, strategy_space,
+                               generate_final_erp_data, calculate_risk_cube, slice_risk_cube,
+                               RISK_CUBE_DIMENSIONS, RISK_CUBE_METRICS, trigger_single_simulation, calculate_crisis_impact_comparison,
+                               run_paired_monte_carlo, trigger_paired_simulations, analyze_monte_carlo_warehouse_feasibility,
+                               analyze_warehouse_feasibility, analyze_stock_composition_by_category,
+                               get_result_cache, configure_result_cache, clear_simulation_caches, sync_simulation_caches)
 from ui_manager import UIManager
 from config import CONFIG, URETIM_STRATEJILERI, STOK_STRATEJILERI
 from app import get_initial_data
-from event_library import EVENT_LIBRARY, JURY_SCENARIOS
+from event_library import EVENT_LIBRARY, DOMINO_RULES, JURY_SCENARIOS
+from event_compiler import compile_event_library, IMPACT_CHANNELS
+from mc_statistics import QuantileSketch, RunningMoments
+from variance_reduction import norm_ppf, make_uniform_stream
+from strategy_effects import get_strategy_schedule, build_strategy_schedule, clear_strategy_schedule_cache
+from result_cache import content_key
 
 @pytest.fixture
 def default_params():
@@ -48,6 +62,64 @@ def test_load_erp_data_missing_column(tmp_path):
     with pytest.raises(SystemExit):
         load_erp_data(file_path=str(csv_file))
 
+def test_load_erp_data_typed_columns_and_parquet_cache(tmp_path, mocker):
+    cache_dir = tmp_path / "erp_cache"
+    df = load_erp_data(cache_dir=str(cache_dir))
+    assert isinstance(df['Kategori'].dtype, pd.CategoricalDtype) and isinstance(df['Ulke'].dtype, pd.CategoricalDtype)
+    assert df['Stok_Adedi'].dtype == np.int32 and df['Musteri_Ozel'].dtype == bool
+    assert os.path.exists(erp_cache_path("erp_data_300_sku.csv", str(cache_dir)))
+
+    validate = mocker.spy(erp_module, '_normalize_and_validate')
+    cached = load_erp_data(cache_dir=str(cache_dir))
+    validate.assert_not_called()
+    pd.testing.assert_frame_equal(cached, df)
+
+    bad_csv = tmp_path / "bad_erp.csv"
+    bad_csv.write_text("SKU,Kategori,Stok_Adedi,Birim_Maliyet,Birim_Fiyat,Tedarik_Suresi_Hafta\nKIM-A-001, A ,yok,150,250,2")
+    bad_df = load_erp_data(file_path=str(bad_csv), cache_dir=str(cache_dir))
+    assert bad_df['Kategori'].tolist() == ['A']
+    assert erp_module.st.markdown.call_args.args[0] == "- Veri Hatası: 'Stok_Adedi' sütunu sayısal olmayan değerler içeriyor."
+    assert not os.path.exists(erp_cache_path(str(bad_csv), str(cache_dir)))
+
+    copied_csv = tmp_path / "erp.csv"
+    copied_csv.write_bytes(open("erp_data_300_sku.csv", "rb").read())
+    original_path = erp_cache_path(str(copied_csv), str(cache_dir))
+    assert original_path != erp_cache_path("erp_data_300_sku.csv", str(cache_dir))
+    with open(copied_csv, "a") as csv_file:
+        csv_file.write("KIM-A-999,Yeni Urun,A,10,0,100,150,10,ZA-JNB,Güney Afrika,2,False,False\n")
+    assert erp_cache_path(str(copied_csv), str(cache_dir)) != original_path
+
+def test_stream_validate_erp_csv_bounded_summary_and_store(tmp_path, mocker):
+    cache_dir = str(tmp_path / "erp_cache")
+    report = stream_validate_erp_csv("erp_data_300_sku.csv", cache_dir=cache_dir, chunksize=70)
+    assert (report.rows, report.chunks, report.is_valid) == (300, 5, True)
+    assert report.store_path == erp_cache_path("erp_data_300_sku.csv", cache_dir)
+
+    validate = mocker.spy(erp_module, '_normalize_and_validate')
+    stored = load_erp_data(cache_dir=cache_dir)
+    validate.assert_not_called()
+    pd.testing.assert_frame_equal(stored, load_erp_data(), check_categorical=False)
+    assert stored['Tedarik_Suresi_Gun'].dtype == np.int32
+
+    rows = ["SKU,Kategori,Stok_Adedi,Birim_Maliyet,Birim_Fiyat,Tedarik_Suresi_Hafta"]
+    rows += [f"KIM-{i},{'VWXYZ'[i % 5] if i % 2 else 'A'},{-i if i % 4 == 0 else i},{'' if i in (11, 30) else 10},20,{2.5 if i == 7 else 2}" for i in range(1, 41)]
+    bad_csv = tmp_path / "bad_erp.csv"
+    bad_csv.write_text("\n".join(rows))
+    report = stream_validate_erp_csv(str(bad_csv), cache_dir=cache_dir, chunksize=8, max_examples=3)
+    assert not report.is_valid and report.store_path is None
+    assert os.listdir(cache_dir) == [os.path.basename(erp_cache_path("erp_data_300_sku.csv", cache_dir))]
+    negative = report.column_issues[('Stok_Adedi', 'negative')]
+    assert negative["count"] == 10 and [row for row, _ in negative["examples"]] == [5, 9, 13]
+    assert report.column_issues[('Tedarik_Suresi_Hafta', 'type_mismatch')]["count"] == 1
+    assert report.column_issues[('Birim_Maliyet', 'missing')]["count"] == 2
+    assert "Veri Hatası: 'Birim_Maliyet' sütununda boş değerler var (2 satır, ilk satırlar: 12, 31)." in report.messages()
+    unknown = report.unknown_categories['Kategori']
+    assert len(unknown) == 3 and sum(unknown.values()) + report.unknown_category_overflow['Kategori'] == 20
+
+    bad_csv.write_text("SKU,Kategori,Stok_Adedi\nKIM-1,A,1")
+    report = stream_validate_erp_csv(str(bad_csv))
+    assert report.rows == 0 and report.missing_columns == ['Birim_Maliyet', 'Birim_Fiyat', 'Tedarik_Suresi_Hafta']
+
 def test_kimoto_simulator_crisis_impact(mocker, default_params):
     mocker.patch('simulation_engine.random.uniform', return_value=1.0)
     mocker.patch('simulation_engine.random.normalvariate', return_value=-0.15)
@@ -85,6 +157,163 @@ def test_production_strategy_shifts_production(default_params):
     final_prod = simulator.run({}, {}, {})['final_tesis_df']
     assert final_prod[final_prod['Ulke'] == 'Türkiye']['Fiili_Uretim_Ton'].sum() > initial_prod[initial_prod['Ulke'] == 'Türkiye']['Fiili_Uretim_Ton'].sum()
 
+def test_array_backed_state_keeps_run_output_format(default_params):
+    base_data = get_initial_data(CONFIG)
+    params = default_params.copy()
+    params['uretim_s'] = 'Strateji 1: G. Afrika Çevik Merkezi'
+    simulator = KimotoSimulator(base_data, params, CONFIG)
+    results = simulator.run({1: "Hammadde Tedarikçi Krizi"}, {1: "Hindistan"}, {})
+
+    assert isinstance(simulator.state.plants.production, np.ndarray)
+    assert not hasattr(simulator.state, '__dict__')
+    assert list(results['final_tesis_df'].columns) == list(base_data['tesisler_df'].columns)
+    assert set(results['initial_state']) == {'kpis', 'tesisler_df', 'month'}
+    assert isinstance(results['initial_state']['tesisler_df'], pd.DataFrame)
+    assert results['final_tesis_df']['Fiili_Uretim_Ton'].sum() < results['initial_state']['tesisler_df']['Fiili_Uretim_Ton'].sum()
+    assert base_data['tesisler_df']['Fiili_Uretim_Ton'].tolist() == get_initial_data(CONFIG)['tesisler_df']['Fiili_Uretim_Ton'].tolist()
+
+def test_summary_only_run_matches_full_run(default_params):
+    base_data = get_initial_data(CONFIG)
+    timeline, locations = {2: "Hammadde Tedarikçi Krizi"}, {2: "Hindistan"}
+    full = KimotoSimulator(base_data, default_params, CONFIG, rng=random.Random(7)).run(timeline, locations, {})
+    fast_simulator = KimotoSimulator(base_data, default_params, CONFIG, rng=random.Random(7))
+    fast = fast_simulator.run(timeline, locations, {}, summary_only=True)
+
+    assert set(fast) == {'summary', 'monthly_kpis', 'realized_events'}
+    assert fast_simulator.results_df is None and fast_simulator.history == []
+    assert fast['summary'] == full['summary']
+    assert fast['monthly_kpis']['net_kar_aylik'].tolist() == full['results_df']['Aylık Net Kar'].tolist()
+    assert fast['monthly_kpis']['otif'].tolist() == full['results_df']['OTIF'].tolist()
+    expected_events = [{"event": row["Gerçekleşen Olay"], "source": row["Olay Kaynağı"]}
+                       for _, row in full['results_df'].iterrows() if row["Gerçekleşen Olay"] != "Kriz Yok"]
+    assert fast['realized_events'] == expected_events
+
+def test_run_horizon_and_stop_condition_end_simulation_early(default_params):
+    base_data = get_initial_data(CONFIG)
+    timeline = {1: "Liman Grevi"}
+    full = KimotoSimulator(base_data, default_params, CONFIG, rng=random.Random(3)).run(timeline, {}, {}, summary_only=True)
+    probe = KimotoSimulator(base_data, default_params, CONFIG, rng=random.Random(3)).run(timeline, {}, {}, summary_only=True, horizon=1)
+    assert len(probe['monthly_kpis']['net_kar_aylik']) == 1
+    assert probe['monthly_kpis']['net_kar_aylik'][0] == full['monthly_kpis']['net_kar_aylik'][0]
+
+    stopped = KimotoSimulator(base_data, default_params, CONFIG).run(
+        {}, {}, {}, summary_only=True, stop_condition=lambda month, kpis: month == 4)
+    assert len(stopped['monthly_kpis']['otif']) == 4
+    assert stopped['summary']['final_otif'] == stopped['monthly_kpis']['otif'][-1]
+
+    with pytest.raises(ValueError):
+        KimotoSimulator(base_data, default_params, CONFIG).run({}, {}, {}, horizon=0)
+
+def test_checkpointed_run_resumes_from_first_changed_month(default_params):
+    base_data = get_initial_data(CONFIG)
+    timeline = {2: "Hammadde Tedarikçi Krizi", 9: "Liman Grevi"}
+    edited = {**timeline, 9: "Talep Patlaması"}
+    simulator = lambda params=default_params, seed=11: KimotoSimulator(base_data, params, CONFIG, rng=random.Random(seed))
+
+    first = simulator()
+    first.run(timeline, {}, {}, use_checkpoints=True)
+    assert first.resumed_from_month is None
+
+    resumed = simulator()
+    resumed_results = resumed.run(edited, {}, {}, use_checkpoints=True)
+    fresh_results = simulator().run(edited, {}, {})
+    assert resumed.resumed_from_month == 8
+    assert resumed_results['results_df'].equals(fresh_results['results_df'])
+    assert resumed_results['summary'] == fresh_results['summary']
+    assert resumed_results['initial_state']['kpis'] == fresh_results['initial_state']['kpis']
+
+    repeated = simulator()
+    repeated.run(edited, {}, {}, summary_only=True, horizon=6, use_checkpoints=True)
+    assert repeated.resumed_from_month == 6
+    for other in (simulator(seed=12), simulator({**default_params, 'lojistik_m': 0.5})):
+        other.run(edited, {}, {}, use_checkpoints=True)
+        assert other.resumed_from_month is None
+    unseeded = KimotoSimulator(base_data, default_params, CONFIG)
+    unseeded.run(edited, {}, {}, use_checkpoints=True)
+    assert unseeded.resumed_from_month is None
+
+def test_risk_cube_covers_all_events_locations_interventions_and_strategies(default_params):
+    base_data = get_initial_data(CONFIG)
+    cube = calculate_risk_cube(base_data, CONFIG, default_params, replications=20, seed=5)
+
+    assert cube.index.names == list(RISK_CUBE_DIMENSIONS)
+    assert list(cube.columns) == list(RISK_CUBE_METRICS)
+    assert "Kriz Yok" not in cube.index.get_level_values("Kriz")
+    combo_cells = cube.sort_index().loc[(URETIM_STRATEJILERI[0], STOK_STRATEJILERI[0])]
+    assert len(cube) == len(combo_cells) * len(URETIM_STRATEJILERI) * len(STOK_STRATEJILERI)
+    assert set(combo_cells.loc["Liman Grevi"].index.get_level_values("Lokasyon")) == {"Genel", "Hindistan", "Güney Afrika", "Türkiye"}
+    assert combo_cells.loc[("Liman Grevi", "Genel", "Müdahale Yok"), "OTIF Düşüşü"] > 0
+    assert combo_cells.loc[("Faiz Artışı Şoku", "Genel", "Müdahale Yok"), "Aylık Kâr Kaybı ($)"] > 0
+
+    view = slice_risk_cube(cube, "Üretim Stratejisi", "Kriz", filters={"Lokasyon": "Genel", "Müdahale": "Müdahale Yok"})
+    assert view.shape == (len(URETIM_STRATEJILERI), cube.index.get_level_values("Kriz").nunique())
+    get_result_cache().clear()
+    assert cube.equals(calculate_risk_cube(base_data, CONFIG, default_params, replications=20, seed=5))
+
+def test_seeded_results_are_served_from_content_addressed_cache(default_params, tmp_path):
+    base_data = get_initial_data(CONFIG)
+    timeline = {1: "Hammadde Tedarikçi Krizi", 4: "Liman Grevi"}
+    cache = configure_result_cache(max_entries=2, directory=str(tmp_path))
+    try:
+        first = trigger_single_simulation(default_params, base_data, timeline, {}, {}, CONFIG, seed=7)
+        first['results_df'].iloc[0, 1] = None
+        second = trigger_single_simulation(default_params, base_data, timeline, {}, {}, CONFIG, seed=7)
+        assert cache.stats() == {"hits": 1, "disk_hits": 0, "misses": 1, "entries": 1}
+        assert second['results_df'].notna().all().all()
+        assert second['summary'] == first['summary']
+
+        trigger_single_simulation(default_params, base_data, timeline, {}, {}, CONFIG)
+        trigger_single_simulation(default_params, base_data, timeline, {}, {}, CONFIG, seed=8)
+        trigger_single_simulation({**default_params, 'tek_kaynak_orani': 0.9}, base_data, timeline, {}, {}, CONFIG, seed=7)
+        assert cache.stats()["misses"] == 3 and len(cache) == 2
+
+        progress = []
+        records = run_monte_carlo_simulation(default_params, base_data, timeline, {}, {}, CONFIG, num_runs=20, engine="batch", seed=3)
+        assert run_monte_carlo_simulation(default_params, base_data, timeline, {}, {}, CONFIG, num_runs=20, engine="batch", seed=3,
+                                          callback_func=lambda done, total: progress.append(done)) == records
+        assert progress == [20]
+
+        comparison = calculate_crisis_impact_comparison(default_params, {**default_params, 'uretim_s': URETIM_STRATEJILERI[1]}, base_data, CONFIG, seed=1)
+        # Bellekten çıkarılan sonuçlar disk katmanından okunur.
+        restarted = configure_result_cache(max_entries=4, directory=str(tmp_path))
+        assert trigger_single_simulation(default_params, base_data, timeline, {}, {}, CONFIG, seed=7)['summary'] == first['summary']
+        assert calculate_crisis_impact_comparison(default_params, {**default_params, 'uretim_s': URETIM_STRATEJILERI[1]}, base_data, CONFIG, seed=1).equals(comparison)
+        assert restarted.stats()["disk_hits"] == 2
+    finally:
+        get_result_cache().clear()
+        configure_result_cache()
+
+def test_content_key_distinguishes_key_types_and_accepts_mixed_keys():
+    assert content_key({1: "Liman Grevi"}) != content_key({"1": "Liman Grevi"})
+    assert content_key({"a": {1: 0.5}}) != content_key({"a": {"1": 0.5}})
+    timeline = {1: "Liman Grevi", "not": "x", 4: "Hammadde Tedarikçi Krizi"}
+    assert content_key(timeline) == content_key(dict(reversed(list(timeline.items()))))
+    assert content_key({"b": 1, "a": 2}) == content_key({"a": 2, "b": 1})
+
+def test_paired_evaluation_shares_random_draws_across_strategies(default_params):
+    base_data = get_initial_data(CONFIG)
+    timeline = {2: "Liman Grevi", 6: "Talep Patlaması"}
+    compare_params = {**default_params, 'uretim_s': URETIM_STRATEJILERI[1], 'lojistik_m': default_params['lojistik_m'] + 0.1}
+    with pytest.raises(ValueError):
+        run_paired_monte_carlo([default_params], base_data, timeline, {}, {}, CONFIG, num_runs=10)
+
+    paired = run_paired_monte_carlo([default_params, compare_params, dict(default_params)], base_data, timeline, {}, {}, CONFIG, num_runs=300, batch_size=120)
+    assert paired['values']['annual_profits'].shape == (3, 300)
+    assert not paired['differences']['annual_profits'][0].any() and not paired['differences']['annual_profits'][2].any()
+    profit = paired['summary']['annual_profits']
+    assert profit['difference'][0] == 0 and profit['ci_low'][1] <= profit['difference'][1] <= profit['ci_high'][1]
+    assert profit['standard_error'][1] < profit['independent_standard_error'][1] / 3
+
+    single_runs = trigger_paired_simulations([default_params, dict(default_params)], base_data, timeline, {}, {}, CONFIG)
+    assert single_runs[0]['summary'] == single_runs[1]['summary']
+
+    same = calculate_crisis_impact_comparison(default_params, dict(default_params), base_data, CONFIG, replications=50)
+    assert (same['Ana Stratejiye Göre Fark ($)'] == 0).all()
+    comparison = calculate_crisis_impact_comparison(default_params, compare_params, base_data, CONFIG, seed=2, replications=50)
+    get_result_cache().clear()
+    assert comparison.equals(calculate_crisis_impact_comparison(default_params, compare_params, base_data, CONFIG, seed=2, replications=50))
+    assert (comparison['Fark Güven Payı ($)'] <= comparison['Kayıp Güven Payı ($)'] + 1e-9).all()
+
 def test_calculate_financial_breakdown_logic():
     ui_manager = UIManager(base_data={})
     ui_manager.config = CONFIG 
@@ -120,6 +349,56 @@ def test_strategy_cost_is_deducted_at_start(mocker, default_params):
     investment_cost = simulator.state['initial_investment_cost']
     assert investment_cost == pytest.approx(strategy_cost)
 
+def test_strategy_setup_is_memoized_with_copy_on_write_clones(default_params):
+    base_data = get_initial_data(CONFIG)
+    params = {**default_params, 'uretim_s': 'Strateji 1: G. Afrika Çevik Merkezi'}
+    first, second = KimotoSimulator(base_data, params, CONFIG), KimotoSimulator(base_data, params, CONFIG)
+    first._apply_initial_strategy_impacts()
+    second._apply_initial_strategy_impacts()
+    snapshot = first.initial_state_after_setup
+    assert second.initial_state_after_setup is snapshot and not snapshot.plants.production.flags.writeable
+    assert second.state.plants.production is snapshot.plants.production and second.state.kpis is not snapshot.kpis
+
+    setup_production = snapshot.plants.production.copy()
+    results = first.run({1: "Hammadde Tedarikçi Krizi"}, {1: "Hindistan"}, {})
+    assert np.array_equal(snapshot.plants.production, setup_production)
+    assert results['final_tesis_df']['Fiili_Uretim_Ton'].sum() < setup_production.sum()
+    assert base_data['tesisler_df']['Fiili_Uretim_Ton'].tolist() == get_initial_data(CONFIG)['tesisler_df']['Fiili_Uretim_Ton'].tolist()
+
+    other = KimotoSimulator(base_data, {**params, 'stok_s': STOK_STRATEJILERI[1]}, CONFIG)
+    other._apply_initial_strategy_impacts()
+    assert other.initial_state_after_setup is not snapshot
+
+    edited_config = copy.deepcopy(CONFIG)
+    KimotoSimulator(base_data, params, edited_config)._apply_initial_strategy_impacts()
+    edited_config['strategy_impacts']['uretim'][params['uretim_s']]['initial_cost'] += 1_000_000
+    base_data['tesisler_df'].loc[0, 'Fiili_Uretim_Ton'] += 500
+    stale = KimotoSimulator(base_data, params, edited_config)
+    stale._apply_initial_strategy_impacts()
+    clear_simulation_caches()
+    fresh = KimotoSimulator(base_data, params, edited_config)
+    fresh._apply_initial_strategy_impacts()
+    assert fresh.state['initial_investment_cost'] == stale.state['initial_investment_cost'] + 1_000_000
+    assert fresh.state.plants.production.sum() == pytest.approx(stale.state.plants.production.sum() + 500)
+
+def test_simulation_caches_survive_reruns_until_content_changes(default_params):
+    base_data = get_initial_data(CONFIG)
+    sync_simulation_caches(CONFIG, base_data)
+    simulator = KimotoSimulator(base_data, default_params, CONFIG)
+    simulator._apply_initial_strategy_impacts()
+
+    rerun_data = {**base_data, 'tesisler_df': base_data['tesisler_df'].copy()}
+    assert not sync_simulation_caches(CONFIG, rerun_data)
+    rerun = KimotoSimulator(rerun_data, default_params, CONFIG)
+    rerun._apply_initial_strategy_impacts()
+    assert rerun.initial_state_after_setup is simulator.initial_state_after_setup
+
+    rerun_data['tesisler_df'].loc[0, 'Fiili_Uretim_Ton'] += 500
+    assert sync_simulation_caches(CONFIG, rerun_data)
+    edited = KimotoSimulator(rerun_data, default_params, CONFIG)
+    edited._apply_initial_strategy_impacts()
+    assert edited.state.plants.production.sum() == pytest.approx(simulator.state.plants.production.sum() + 500)
+
 def test_high_single_source_ratio_worsens_supply_crisis(mocker, default_params):
     mocker.patch('simulation_engine.random.normalvariate', return_value=0.75)
     mocker.patch('simulation_engine.random.uniform', return_value=1.0)
@@ -162,6 +441,30 @@ def test_seasonal_stock_strategy_applies_effects_in_correct_months(mocker, defau
     
     assert otif_during_bonus == pytest.approx(otif_before_bonus + expected_bonus)
 
+def test_strategy_schedule_is_compiled_once_per_strategy(default_params):
+    params = {**default_params, 'stok_s': STOK_STRATEJILERI[1], 'mevsimsellik_etkisi': True}
+    schedule = get_strategy_schedule(params, CONFIG)
+
+    assert schedule is get_strategy_schedule({**params, 'tek_kaynak_orani': 0.9}, CONFIG)
+    assert schedule is not get_strategy_schedule({**params, 'mevsimsellik_etkisi': False}, CONFIG)
+    assert not schedule.flags.writeable
+    np.testing.assert_array_equal(schedule, build_strategy_schedule(params, CONFIG))
+    seasonal = np.array(CONFIG['simulation_parameters']['mevsimsellik_aylari']) - 1
+    otif_change = schedule[:, 1] - get_strategy_schedule({**params, 'mevsimsellik_etkisi': False}, CONFIG)[:, 1]
+    assert otif_change[seasonal] == pytest.approx(CONFIG['simulation_parameters']['mevsimsellik_otif_etkisi'])
+    assert np.delete(otif_change, seasonal) == pytest.approx(0)
+
+    edited_config = copy.deepcopy(CONFIG)
+    edited_schedule = get_strategy_schedule(params, edited_config)
+    edited_config['simulation_parameters']['mevsimsellik_otif_etkisi'] = -0.20
+    assert get_strategy_schedule(params, edited_config) is edited_schedule
+    configure_result_cache(CONFIG['result_cache']['max_entries'], None)
+    assert get_strategy_schedule(params, edited_config) is edited_schedule
+    assert sync_simulation_caches(edited_config, get_initial_data(CONFIG))
+    assert get_strategy_schedule(params, edited_config)[seasonal[0], 1] - schedule[seasonal[0], 1] == pytest.approx(-0.15)
+    clear_strategy_schedule_cache()
+    assert get_strategy_schedule(params, CONFIG) is not schedule
+
 def test_simulation_with_zero_impact_parameters(default_params):
     base_data = get_initial_data(CONFIG)
     initial_production = base_data['tesisler_df']['Fiili_Uretim_Ton'].sum()
@@ -216,6 +519,38 @@ def test_total_production_loss_handles_gracefully(mocker, default_params):
     except ZeroDivisionError:
         pytest.fail("Sıfır üretim durumunda ZeroDivisionError oluştu.")
 
+def test_compiled_event_library_indexes_events_and_samplers():
+    table = compile_event_library(EVENT_LIBRARY, DOMINO_RULES)
+    strike_id = table.event_id("Liman Grevi")
+
+    assert table.names[strike_id] == "Liman Grevi"
+    assert not table.is_active[table.none_id]
+    assert table.is_geographic[strike_id]
+    assert table.names[table.domino_trigger[strike_id]] == "Müşteri Güven Kaybı"
+    assert table.domino_probability[strike_id] == pytest.approx(0.40)
+
+    intervention_id = table.intervention_id(strike_id, "Hava Kargo ($2M)")
+    assert table.intervention_cost[intervention_id] == pytest.approx(2_000_000)
+    assert table.intervention_mitigation[intervention_id] == pytest.approx(0.4)
+    with pytest.raises(KeyError):
+        table.intervention_id(strike_id, "Kısa Vadeli Kontrat ($1M)")
+
+    otif_sampler = table.samplers[strike_id][IMPACT_CHANNELS.index("otif")]
+    draws = otif_sampler.sample(np.random.default_rng(0), 20000)
+    assert draws.mean() == pytest.approx(-0.15, abs=0.002)
+    assert table.net_kar_multiplier[table.event_id("Talep Patlaması")] == pytest.approx(1.4)
+    assert table.net_kar_multiplier[table.event_id("Faiz Artışı Şoku")] == pytest.approx(1.0)
+    assert not table.is_stale(EVENT_LIBRARY, DOMINO_RULES)
+
+    library, rules = copy.deepcopy(EVENT_LIBRARY), copy.deepcopy(DOMINO_RULES)
+    edited = compile_event_library(library, rules)
+    library["Liman Grevi"]["impact"]["otif"]["mean"] = -0.30
+    assert edited.is_stale(library, rules)
+    library["Liman Grevi"]["impact"]["otif"]["mean"] = EVENT_LIBRARY["Liman Grevi"]["impact"]["otif"]["mean"]
+    rules["Liman Grevi"]["probability"] = 0.9
+    assert edited.is_stale(library, rules)
+    assert compile_event_library(library, rules).domino_probability[strike_id] == pytest.approx(0.9)
+
 def test_erp_module_with_empty_and_malformed_data(tmp_path):
     empty_file = tmp_path / "empty.csv"
     empty_file.write_text("")
@@ -246,6 +581,170 @@ def test_monte_carlo_output_structure_and_content(mocker, default_params):
     assert "realized_events" in first_run_with_domino
     assert len(first_run_with_domino["realized_events"]) == 2
 
+def test_batch_monte_carlo_matches_scalar_engine_statistically(default_params):
+    base_data = get_initial_data(CONFIG)
+    timeline, locations = {2: "Liman Grevi", 5: "Hammadde Tedarikçi Krizi"}, {2: "Hindistan", 5: "Hindistan"}
+    random.seed(7)
+    scalar_runs = pd.DataFrame(run_monte_carlo_simulation(default_params, base_data, timeline, locations, {}, CONFIG, num_runs=300))
+    batch_runs = pd.DataFrame(run_monte_carlo_simulation(default_params, base_data, timeline, locations, {}, CONFIG, num_runs=300, engine="batch"))
+
+    assert list(batch_runs.columns) == list(scalar_runs.columns)
+    for key in ["annual_profits", "final_otifs", "final_flexibility", "final_satisfaction", "co2_savings"]:
+        standard_error = ((scalar_runs[key].var() + batch_runs[key].var()) / 300) ** 0.5
+        assert abs(scalar_runs[key].mean() - batch_runs[key].mean()) <= 4 * standard_error + 1e-9
+
+def test_batch_simulator_domino_and_intervention_logic(default_params):
+    base_data = get_initial_data(CONFIG)
+    simulator = BatchKimotoSimulator(base_data, default_params, CONFIG, 500, np.random.default_rng(3))
+    results = simulator.run({1: "Hammadde Tedarikçi Krizi"}, {}, {1: "Alternatif Tedarikçi ($2.5M)"})
+
+    domino_share = np.mean([len(events) == 2 for events in results['realized_events']])
+    assert 0.5 < domino_share < 0.7
+    assert all(events[0] == {"event": "Hammadde Tedarikçi Krizi", "source": "Kullanıcı"} for events in results['realized_events'])
+    assert results['annual_profits'].shape == (500,)
+    assert (results['final_otifs'] >= 0.0).all() and (results['final_otifs'] <= 1.0).all()
+
+@pytest.mark.parametrize("engine", ["scalar", "batch"])
+def test_seeded_domino_draws_follow_chronological_order(default_params, engine):
+    base_data = get_initial_data(CONFIG)
+    # Her iki Domino da 4. aya düşer; kronolojik olarak önce gelen 2. ayın krizi geçerlidir.
+    chronological = {2: "Hammadde Tedarikçi Krizi", 3: "Liman Grevi"}
+    reversed_timeline = dict(reversed(chronological.items()))
+    runs = run_monte_carlo_simulation(default_params, base_data, reversed_timeline, {}, {}, CONFIG, num_runs=300, engine=engine, seed=5)
+    get_result_cache().clear()
+    assert runs == run_monte_carlo_simulation(default_params, base_data, chronological, {}, {}, CONFIG, num_runs=300, engine=engine, seed=5)
+
+    spot_share = np.mean([{"event": "Spot Piyasa Fiyat Artışı", "source": "Domino Etkisi"} in run["realized_events"] for run in runs])
+    assert spot_share == pytest.approx(DOMINO_RULES["Hammadde Tedarikçi Krizi"]["probability"], abs=4 * (0.24 / 300) ** 0.5)
+
+@pytest.mark.parametrize("engine", ["scalar", "batch"])
+def test_seeded_monte_carlo_is_identical_across_worker_counts(default_params, engine):
+    base_data = get_initial_data(CONFIG)
+    timeline = {1: "Hammadde Tedarikçi Krizi", 4: "Liman Grevi"}
+    progress = []
+    serial = run_monte_carlo_simulation(default_params, base_data, timeline, {}, {}, CONFIG, num_runs=12, engine=engine, batch_size=5, seed=2024)
+    get_result_cache().clear()
+    parallel = run_monte_carlo_simulation(default_params, base_data, timeline, {}, {}, CONFIG, num_runs=12, engine=engine, batch_size=5, seed=2024, n_workers=2,
+                                          callback_func=lambda done, total: progress.append((done, total)))
+
+    assert serial == parallel
+    assert [run["run_id"] for run in parallel] == list(range(1, 13))
+    assert progress[-1] == (12, 12)
+    other_seed = run_monte_carlo_simulation(default_params, base_data, timeline, {}, {}, CONFIG, num_runs=12, engine=engine, batch_size=5, seed=2025)
+    assert [run["annual_profits"] for run in other_seed] != [run["annual_profits"] for run in serial]
+
+def test_streaming_monte_carlo_summaries_match_exact_statistics(default_params):
+    base_data = get_initial_data(CONFIG)
+    timeline = {1: "Hammadde Tedarikçi Krizi", 4: "Liman Grevi"}
+    progress = []
+    for completed, summary in stream_monte_carlo_simulation(default_params, base_data, timeline, {}, {}, CONFIG, num_runs=6000, batch_size=1000,
+                                                            seed=11, thresholds={"final_otifs": [0.7]}, reservoir_size=500):
+        progress.append(completed)
+
+    assert progress == [1000, 2000, 3000, 4000, 5000, 6000]
+    assert summary.count == 6000 and len(summary.samples) == 500
+    assert len({run["run_id"] for run in summary.samples}) == 500
+    assert summary.event_counts["Hammadde Tedarikçi Krizi"] == 6000
+    assert 0 < summary.domino_runs < 6000
+
+    exact = pd.DataFrame(run_monte_carlo_simulation(default_params, base_data, timeline, {}, {}, CONFIG, num_runs=6000, engine="batch", seed=11))
+    profit_spread = exact["annual_profits"].std()
+    assert summary.mean("annual_profits") == pytest.approx(exact["annual_profits"].mean(), abs=0.1 * profit_spread)
+    assert summary.quantile("annual_profits", 0.10) == pytest.approx(exact["annual_profits"].quantile(0.10), abs=0.1 * profit_spread)
+    assert summary.probability_at_least("final_otifs", 0.7) == pytest.approx((exact["final_otifs"] >= 0.7).mean(), abs=0.05)
+
+    serial = list(stream_monte_carlo_simulation(default_params, base_data, timeline, {}, {}, CONFIG, num_runs=2000, batch_size=250, seed=11, reservoir_size=100))[-1][1]
+    parallel = list(stream_monte_carlo_simulation(default_params, base_data, timeline, {}, {}, CONFIG, num_runs=2000, batch_size=250, seed=11, reservoir_size=100, n_workers=3))[-1][1]
+    assert parallel.quantile("annual_profits", 0.10) == serial.quantile("annual_profits", 0.10)
+    assert [run["run_id"] for run in parallel.samples] == [run["run_id"] for run in serial.samples]
+
+def test_adaptive_monte_carlo_stops_on_precision_or_budget(default_params):
+    base_data = get_initial_data(CONFIG)
+    timeline = {1: "Hammadde Tedarikçi Krizi", 4: "Liman Grevi"}
+    loose = {("mean", "annual_profits"): 1_000_000, ("quantile", "annual_profits", 0.10): 2_000_000, ("probability", "final_otifs", 0.7): 0.05}
+    summary, report = run_adaptive_monte_carlo(default_params, base_data, timeline, {}, {}, CONFIG, loose, max_runs=50_000, batch_size=500, seed=4)
+
+    assert report["converged"] and report["runs_used"] == summary.count < 50_000
+    assert summary.count >= 5 * 500
+    assert all(target["half_width"] <= target["tolerance"] for target in report["targets"])
+
+    parallel_summary, parallel_report = run_adaptive_monte_carlo(default_params, base_data, timeline, {}, {}, CONFIG, loose, max_runs=50_000, batch_size=500, seed=4, n_workers=2)
+    assert parallel_report == report and parallel_summary.quantile("annual_profits", 0.10) == summary.quantile("annual_profits", 0.10)
+    with pytest.raises(ValueError):
+        run_adaptive_monte_carlo(default_params, base_data, timeline, {}, {}, CONFIG, loose, max_runs=0)
+
+    tight = {("mean", "annual_profits"): 1.0}
+    summary, report = run_adaptive_monte_carlo(default_params, base_data, timeline, {}, {}, CONFIG, tight, max_runs=3000, batch_size=500, seed=4)
+    assert not report["converged"] and report["runs_used"] == 3000
+    assert report["targets"][0]["half_width"] > 1.0
+
+@pytest.mark.parametrize("sampling", ["antithetic", "lhs", "halton"])
+def test_variance_reduced_monte_carlo_reports_gain_without_bias(default_params, sampling):
+    base_data = get_initial_data(CONFIG)
+    timeline = {1: "Hammadde Tedarikçi Krizi", 4: "Liman Grevi"}
+    report = run_variance_reduced_monte_carlo(default_params, base_data, timeline, {}, {}, CONFIG, num_runs=4000, sampling=sampling, seed=8)
+    plain = pd.DataFrame(run_monte_carlo_simulation(default_params, base_data, timeline, {}, {}, CONFIG, num_runs=20000, engine="batch", seed=8))
+
+    profit = report["annual_profits"]
+    assert profit["variance_reduction"] > 5
+    assert profit["estimate"] == pytest.approx(plain["annual_profits"].mean(), abs=4 * plain["annual_profits"].std() / np.sqrt(20000))
+    assert report["final_otifs"]["estimate"] == pytest.approx(plain["final_otifs"].mean(), abs=0.002)
+
+    records = run_monte_carlo_simulation(default_params, base_data, timeline, {}, {}, CONFIG, num_runs=50, engine="batch", seed=8, sampling=sampling)
+    assert len(records) == 50
+    with pytest.raises(ValueError):
+        run_monte_carlo_simulation(default_params, base_data, timeline, {}, {}, CONFIG, num_runs=5, sampling=sampling)
+
+def test_importance_sampling_tail_risk_matches_plain_monte_carlo(default_params):
+    base_data = get_initial_data(CONFIG)
+    timeline = {1: "Hammadde Tedarikçi Krizi", 6: "Talep Patlaması"}
+    report = run_importance_sampling_monte_carlo(default_params, base_data, timeline, {}, {}, CONFIG, num_runs=20000, alphas=(0.01, 0.05), seed=3)
+    plain = pd.DataFrame(run_monte_carlo_simulation(default_params, base_data, timeline, {}, {}, CONFIG, num_runs=20000, engine="batch", seed=3))
+    profits = np.sort(plain["annual_profits"].values)
+
+    assert report["domino_rate"] > 0.85
+    assert report["effective_sample_size"] < report["num_runs"]
+    assert report["mean"] == pytest.approx(profits.mean(), abs=5 * profits.std() / np.sqrt(report["effective_sample_size"]))
+    assert report["var"][0.05] == pytest.approx(np.quantile(profits, 0.05), rel=0.05)
+    assert report["cvar"][0.01] == pytest.approx(profits[:200].mean(), rel=0.05)
+    assert report["cvar"][0.01] <= report["var"][0.01] <= report["var"][0.05]
+
+def test_quasi_random_streams_and_inverse_normal():
+    from statistics import NormalDist
+    u = np.array([1e-6, 0.01, 0.2, 0.5, 0.8, 0.99, 1 - 1e-6])
+    assert norm_ppf(u) == pytest.approx([NormalDist().inv_cdf(x) for x in u], abs=1e-8)
+
+    generator = np.random.default_rng(0)
+    antithetic = make_uniform_stream("antithetic", generator, 10).next()
+    assert antithetic[:5] + antithetic[5:] == pytest.approx(np.ones(5))
+    lhs = make_uniform_stream("lhs", generator, 10).next()
+    assert sorted(np.floor(lhs * 10).astype(int)) == list(range(10))
+    halton = make_uniform_stream("halton", generator, 64)
+    for _ in range(3):
+        column = np.sort(halton.next())
+        assert np.abs(column - (np.arange(64) + 0.5) / 64).max() < 2 / 64
+    with pytest.raises(ValueError):
+        make_uniform_stream("sobol", generator, 10)
+
+def test_online_accumulators_merge_like_a_single_pass():
+    values = np.random.default_rng(0).normal(10.0, 3.0, 20000)
+    moments, left, right = RunningMoments(), RunningMoments(), RunningMoments()
+    moments.update(values)
+    left.update(values[:7000])
+    right.update(values[7000:])
+    left.merge(right)
+    assert left.mean == pytest.approx(values.mean()) and left.variance == pytest.approx(values.var(ddof=1))
+    assert moments.variance == pytest.approx(values.var(ddof=1))
+
+    sketch, other = QuantileSketch(k=200, seed=1), QuantileSketch(k=200, seed=2)
+    for block in np.array_split(values[:10000], 10):
+        sketch.update(block)
+    other.update(values[10000:])
+    sketch.merge(other)
+    assert len(sketch) < 1000
+    for q in (0.05, 0.5, 0.9):
+        assert np.mean(values <= sketch.quantile(q)) == pytest.approx(q, abs=0.02)
+
 @pytest.fixture
 def sample_erp_data_for_test():
     data = {
@@ -280,6 +779,44 @@ def test_generate_final_erp_data(sample_erp_data_for_test, default_params):
     result_3 = generate_final_erp_data(initial_df.copy(), final_kpis_3, params_3)
     assert result_3.loc[0, 'Stok_Adedi'] == pytest.approx(100 * 0.5)
 
+def test_generate_final_erp_data_folds_all_multipliers_without_touching_input(sample_erp_data_for_test):
+    initial_df = sample_erp_data_for_test.copy()
+    initial_df['Stok_Degeri'] = 0.0
+    initial_df.loc[3] = ['X-01', None, 50, 1, 2, True, True, 50, 0.0]
+    snapshot = initial_df.copy()
+
+    final_kpis = {'Stok Devir Hızı': CONFIG['kpi_defaults']['stok_devir_hizi'], 'Gerçekleşen Olaylar_Listesi': ['Hammadde Tedarikçi Krizi', 'Hammadde Tedarikçi Krizi']}
+    result = generate_final_erp_data(initial_df, final_kpis, {'stok_s': 'Fazla Stokları Erit'})
+
+    multiplier = EVENT_LIBRARY['Hammadde Tedarikçi Krizi']['erp_stock_multiplier']['multiplier']
+    assert result['Stok_Adedi'].tolist() == [round(100 * multiplier ** 2), round(200 * 0.20), 300, round(50 * 0.20)]
+    assert 'Stok_Degeri' not in result.columns
+    assert initial_df.equals(snapshot)
+
+def test_batch_erp_end_state_matches_per_run_erp_tables(default_params):
+    base_data = get_initial_data(CONFIG)
+    erp_data = load_erp_data()
+    params = {**default_params, 'stok_s': 'Kilit Müşteri Ayrıcalığı'}
+    timeline = {2: "Hammadde Tedarikçi Krizi"}
+    records = run_monte_carlo_simulation(params, base_data, timeline, {}, {}, CONFIG, num_runs=40, engine="batch", seed=2)
+    assert all('final_turnover' in record for record in records)
+
+    erp_state = analyze_monte_carlo_warehouse_feasibility(erp_data, records, params, CONFIG)
+    for i, record in enumerate(records):
+        final_erp = generate_final_erp_data(erp_data, {'Stok Devir Hızı': record['final_turnover'],
+                                                       'Gerçekleşen Olaylar_Listesi': [event['event'] for event in record['realized_events']]}, params)
+        # Grup toplamlarında SKU başına adet yuvarlaması yapılmaz.
+        rounding_tons = 0.5 * len(erp_data) * CONFIG['physical_factors']['avg_ton_per_sku_unit']
+        assert erp_state['gereken_hacim_ton'][i] == pytest.approx(analyze_warehouse_feasibility(final_erp, CONFIG)['gereken_hacim_ton'], abs=rounding_tons)
+        for category, tons in analyze_stock_composition_by_category(final_erp, CONFIG).items():
+            assert erp_state['kategori_ton'][category][i] == pytest.approx(tons, abs=rounding_tons)
+    assert erp_state['summary']['breach_probability'] == np.mean(erp_state['fark_ton'] > 0)
+
+    for _, summary in stream_monte_carlo_simulation(params, base_data, timeline, {}, {}, CONFIG, num_runs=40, batch_size=15, erp_data=erp_data):
+        pass
+    assert {'final_turnover', 'warehouse_utilization', 'stock_tons_A'} <= set(summary.metrics)
+    assert summary.probability_at_least('warehouse_utilization', 1.0) == np.mean([record['warehouse_utilization'] >= 1.0 for record in summary.samples])
+
 def test_jury_scenario_overwrites_user_params_correctly(default_params):
     """
     Bir Jüri Özel Senaryosu yüklendiğinde, sidebar'daki kullanıcı parametrelerinin
@@ -312,6 +849,107 @@ def test_comparison_mode_params_are_independent(default_params):
     assert params_main['tek_kaynak_orani'] == 0.9
     assert params_compare['tek_kaynak_orani'] == 0.3
 
+def test_parallel_optimization_resumes_from_persistent_study(tmp_path):
+    base_data = get_initial_data(CONFIG)
+    storage_path = str(tmp_path / "studies.log")
+    goal = "Yıllık Net Kârı Maksimize Et"
+    reported = []
+    callback = lambda study, trial: reported.append(trial.number)
+
+    _, first_best, first_trials = run_optimization({}, base_data, {1: "Liman Grevi"}, {}, {}, CONFIG, 8, goal, callback, n_workers=2, storage_path=storage_path, seed=1)
+    _, second_best, second_trials = run_optimization({}, base_data, {1: "Liman Grevi"}, {}, {}, CONFIG, 4, goal, callback, storage_path=storage_path, seed=2)
+    _, _, other_trials = run_optimization({}, base_data, {2: "Liman Grevi"}, {}, {}, CONFIG, 3, goal, storage_path=storage_path, seed=3)
+
+    assert len(first_trials) == 8 and len(second_trials) == 12 and len(other_trials) == 3
+    assert sorted(reported) == list(range(12))
+    assert second_best >= first_best
+    with pytest.raises(ValueError):
+        run_optimization({}, base_data, {}, {}, {}, CONFIG, 2, goal, n_workers=2)
+
+def test_robust_objective_scores_trials_on_common_random_numbers(default_params):
+    import optuna
+    base_data = get_initial_data(CONFIG)
+    timeline = {1: "Hammadde Tedarikçi Krizi", 4: "Liman Grevi"}
+    goal = "Yıllık Net Kârı Maksimize Et"
+    trial_params = {key: value for key, value in default_params.items() if key not in ('transport_m', 'tahmin_d')}
+    score = lambda params, **options: objective(optuna.trial.FixedTrial(params), base_data, CONFIG, timeline, {}, {}, goal, replications=64, **options)
+
+    mean_score = score(trial_params)
+    assert score(trial_params) == mean_score
+    assert score(trial_params, crn_seed=1) != mean_score
+    # Skorlar maksimizasyon için negatiftir; alt kuyruk istatistikleri ortalamadan daha kötümserdir.
+    assert score(trial_params, statistic="cvar", alpha=0.1) > score(trial_params, statistic="quantile", alpha=0.1) > mean_score
+    with pytest.raises(ValueError):
+        score(trial_params, statistic="median")
+
+def test_pruned_optimization_stops_hopeless_trials_mid_simulation(default_params):
+    import optuna
+    base_data = get_initial_data(CONFIG)
+    timeline = {1: "Hammadde Tedarikçi Krizi", 4: "Liman Grevi"}
+    goal = "Yıllık Net Kârı Maksimize Et"
+    trial_params = {key: value for key, value in default_params.items() if key not in ('transport_m', 'tahmin_d')}
+
+    score = lambda **options: objective(optuna.trial.FixedTrial(trial_params), base_data, CONFIG, timeline, {}, {}, goal, replications=16, crn_seed=3, **options)
+    assert score(pruning=True) == score()
+
+    reported = []
+    _, best_value, trials = run_optimization({}, base_data, timeline, {}, {}, CONFIG, 30, goal, lambda study, trial: reported.append(trial.state),
+                                             seed=0, objective_options={"pruner": "median"})
+    pruned = trials[trials['state'] == "PRUNED"]
+    assert len(trials) == len(reported) == 30
+    assert len(pruned) > 0 and (trials['state'] == "COMPLETE").sum() >= 5
+    assert best_value == -trials.loc[trials['state'] == "COMPLETE", 'value'].min()
+    with pytest.raises(ValueError):
+        run_optimization({}, base_data, timeline, {}, {}, CONFIG, 1, goal, objective_options={"pruner": "hyperband"})
+
+def test_pareto_optimization_returns_persisted_non_dominated_frontier(tmp_path):
+    base_data = get_initial_data(CONFIG)
+    storage_path = str(tmp_path / "studies.log")
+    goals = list(OPTIMIZATION_GOALS[:2])
+    assert load_pareto_frontier(base_data, CONFIG, {1: "Liman Grevi"}, {}, {}, goals, storage_path) is None
+
+    frontier, trials = run_pareto_optimization({}, base_data, {1: "Liman Grevi"}, {}, {}, CONFIG, 30, goals, storage_path=storage_path, seed=0)
+    assert len(trials) == 30 and 0 < len(frontier) <= 30
+    assert set(OPTIMIZATION_GOALS) <= set(frontier.columns)
+    values = frontier[goals].to_numpy()
+    for row in values:
+        assert not ((values >= row).all(axis=1) & (values > row).any(axis=1)).any()
+
+    assert load_pareto_frontier(base_data, CONFIG, {1: "Liman Grevi"}, {}, {}, goals, storage_path).equals(frontier)
+    with pytest.raises(ValueError):
+        run_pareto_optimization({}, base_data, {}, {}, {}, CONFIG, 2, goals[:1])
+
+def test_heterogeneous_batch_rows_match_single_strategy_runs(default_params):
+    base_data = get_initial_data(CONFIG)
+    timeline, locations = {1: "Hammadde Tedarikçi Krizi", 4: "Liman Grevi"}, {4: "Hindistan"}
+    groups = [default_params, {**default_params, 'uretim_s': URETIM_STRATEJILERI[1], 'transport_m': 'Hava Kargo (Hızlı)',
+                               'stok_s': STOK_STRATEJILERI[2], 'ozel_sku_modu': True, 'tek_kaynak_orani': 0.9, 'lojistik_m': 0.5}]
+    mixed = BatchKimotoSimulator(base_data, groups, CONFIG, 100, np.random.default_rng(4), common_random_numbers=True).run(timeline, locations, {})
+    for group_idx, group_params in enumerate(groups):
+        single = BatchKimotoSimulator(base_data, group_params, CONFIG, 50, np.random.default_rng(4), common_random_numbers=True).run(timeline, locations, {})
+        for metric in ("annual_profits", "final_otifs", "final_satisfaction", "co2_savings"):
+            assert mixed[metric][group_idx * 50:(group_idx + 1) * 50] == pytest.approx(single[metric])
+    with pytest.raises(ValueError):
+        BatchKimotoSimulator(base_data, groups, CONFIG, 101)
+
+def test_strategy_space_enumeration_ranks_all_combinations(default_params):
+    import optuna
+    base_data = get_initial_data(CONFIG)
+    timeline = {1: "Hammadde Tedarikçi Krizi"}
+    goal = OPTIMIZATION_GOALS[0]
+    ranking = enumerate_strategy_space(base_data, CONFIG, timeline, {}, {}, goal, slider_points=2, replications=8)
+
+    forecast_combinations = 2 * 2 ** 3
+    assert len(ranking) == len(strategy_space(CONFIG)) * 4 * forecast_combinations
+    assert ranking[goal].is_monotonic_decreasing and list(ranking["Sıra"][:3]) == [1, 2, 3]
+    best = best_enumerated_strategy(ranking, CONFIG, include_sliders=True)
+    assert -objective(optuna.trial.FixedTrial(best), base_data, CONFIG, timeline, {}, {}, goal, replications=8) == pytest.approx(ranking[goal].iloc[0])
+
+    fixed = best_enumerated_strategy(ranking, CONFIG)
+    best_params, _, trials = run_optimization({}, base_data, timeline, {}, {}, CONFIG, 5, goal, objective_options={"replications": 8, "fixed_params": fixed})
+    assert {key: best_params[key] for key in fixed} == fixed
+    assert not any(column.endswith("uretim_s") for column in trials.columns)
+
 def test_optimization_engine_finds_logical_best_for_co2(mocker, default_params):
     """
     Optimizasyon motorunun, bariz bir hedef (CO2 minimizasyonu) için
@@ -329,6 +967,7 @@ def test_optimization_engine_finds_logical_best_for_co2(mocker, default_params):
     from app import run_optimization_flow
     
     mock_session_state = MagicMock()
+    mock_session_state.get.return_value = None
     mocker.patch('app.st.session_state', mock_session_state)
     
     run_optimization_flow(
@@ -240,11 +240,11 @@ def render_stakeholder_analysis(params, scenario_title, results_df, final_row):
     if not any_issue_found:
          st.success("Tebrikler! Seçilen stratejiler ve simülasyon sonuçları, paydaşlar üzerinde önemli bir negatif etki veya kriz öngörmemektedir. Dengeli ve sağlam bir yaklaşım elde edildi.")
 
-def plot_risk_heatmap(risk_df):
-    """Risk matrisini bir ısı haritası olarak çizer."""
+def plot_risk_heatmap(risk_df, x_label="Kriz Senaryoları", y_label="Stratejiler", color_label="Aylık Kâr Kaybı ($)"):
+    """Risk matrisini (veya risk küpünün iki boyutlu bir kesitini) ısı haritası olarak çizer."""
     fig = px.imshow(risk_df,
-                    labels=dict(x="Kriz Senaryoları", y="Stratejiler", color="Aylık Kâr Kaybı ($)"),
-                    text_auto=".2s",
+                    labels=dict(x=x_label, y=y_label, color=color_label),
+                    text_auto=".2s" if "$" in color_label else ".3f",
                     aspect="auto",
                     color_continuous_scale=px.colors.sequential.Reds,
                     title="Strateji-Kriz Risk Matrisi")
@@ -261,9 +261,9 @@ def render_financial_intelligence_panel(df, key_prefix=""):
         potansiyel_ciro = (df['Birim_Fiyat'] * df['Stok_Adedi']).sum()
         df_copy = df.copy()
         df_copy['Kar_Marji'] = df_copy.apply(lambda row: (row['Birim_Fiyat'] - row['Birim_Maliyet']) / row['Birim_Fiyat'] if row['Birim_Fiyat'] > 0 else 0, axis=1)
-        karlilik_df = df_copy.groupby('Kategori')['Kar_Marji'].mean().reset_index()
+        karlilik_df = df_copy.groupby('Kategori', observed=True)['Kar_Marji'].mean().reset_index()
         karlilik_df['Kar_Marji'] = karlilik_df['Kar_Marji'] * 100
-        stok_degeri_kategori = df_copy.groupby('Kategori').apply(lambda d: (d['Birim_Maliyet'] * d['Stok_Adedi']).sum()).reset_index(name='EnvanterDegeri')
+        stok_degeri_kategori = df_copy.groupby('Kategori', observed=True).apply(lambda d: (d['Birim_Maliyet'] * d['Stok_Adedi']).sum()).reset_index(name='EnvanterDegeri')
     except KeyError as e:
         st.error(f"Finansal panel hesaplamasında hata: Gerekli sütun ({e}) ERP verisinde bulunamadı.")
         return
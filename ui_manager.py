@@ -9,8 +9,9 @@ from collections import Counter
 
 from event_library import EVENT_LIBRARY, DOMINO_RULES, JURY_SCENARIOS
 from config import (CONFIG, URETIM_STRATEJILERI, STOK_STRATEJILERI, MONTH_NAMES)
-from simulation_engine import (calculate_risk_matrix, analyze_stock_and_demand_risk, 
-                               perform_abc_analysis,calculate_crisis_impact_comparison)
+from simulation_engine import (calculate_risk_cube, slice_risk_cube, RISK_CUBE_DIMENSIONS, RISK_CUBE_METRICS, OPTIMIZATION_GOALS,
+                               analyze_stock_and_demand_risk, perform_abc_analysis, calculate_crisis_impact_comparison, get_result_cache)
+from erp_end_state import WAREHOUSE_BREACH_UTILIZATION
 
 from ui_components import (
     display_colored_progress,
@@ -45,8 +46,8 @@ class UIManager:
 
         if 'scenarios' not in st.session_state:
             st.session_state.scenarios = []
-        if 'risk_matrix_df' not in st.session_state:
-            st.session_state.risk_matrix_df = None
+        if 'risk_cube_df' not in st.session_state:
+            st.session_state.risk_cube_df = None
 
         if 'scenarios' not in st.session_state: st.session_state.scenarios = []
 
@@ -160,6 +161,11 @@ class UIManager:
         )
 
         is_comparison_mode = st.sidebar.checkbox("🆚 Strateji Karşılaştırma Modunu Aktif Et")
+        is_reproducible = st.sidebar.checkbox("🔁 Tekrarlanabilir Sonuçlar (Önbellekli)", value=False, help="Simülasyonlar sabit bir tohumla çalıştırılır; aynı strateji ve senaryo yeniden çalıştırıldığında (örn: bir Jüri senaryosu tekrar yüklendiğinde) sonuç yeniden hesaplanmadan önbellekten gelir.")
+        st.session_state.simulation_seed = self.config['result_cache']['default_seed'] if is_reproducible else None
+        if is_reproducible:
+            cache_stats = get_result_cache().stats()
+            st.sidebar.caption(f"Önbellek: {cache_stats['hits']} isabet, {cache_stats['misses']} ıska")
 
         with st.sidebar.expander("🛠️ Özel Strateji ve Tahmin Modeli Ayarları", expanded=False):
             st.markdown("<h6>🧠 Talep Tahmin Modeli Ayarları</h6>", unsafe_allow_html=True)
@@ -254,19 +260,48 @@ class UIManager:
 
             if run_mode == "Manuel Strateji Analizi":
                 is_mc_mode = st.checkbox("🎲 Monte Carlo Modunu Aktif Et (Olasılıksal Risk Analizi)", help="Seçili senaryoyu birden çok kez çalıştırarak sonuçların istatistiksel dağılımını analiz eder. Yalnızca olasılıksal olaylar (örn: Domino Etkisi) içeren senaryolar için anlamlıdır.")
+                st.session_state.mc_tolerances = None
                 if is_mc_mode:
-                    num_runs = st.slider("Tekrar Sayısı", min_value=10, max_value=500, value=100, step=10)
+                    is_adaptive = st.checkbox("🎯 Uyarlamalı Tekrar Sayısı (Hassasiyet Hedefli)", help="Tekrar sayısını tahmin etmek yerine, seçilen metriklerin %95 güven aralıkları belirlenen toleransın altına inene kadar simülasyonu bloklar halinde çalıştırır.")
+                    if is_adaptive:
+                        num_runs = st.slider("Maksimum Tekrar Bütçesi", min_value=1000, max_value=200000, value=50000, step=1000)
+                        tol_col1, tol_col2, tol_col3 = st.columns(3)
+                        mean_tolerance = tol_col1.number_input("Ortalama Kâr Toleransı (±$K)", min_value=1.0, value=100.0, step=10.0) * 1000
+                        p10_tolerance = tol_col2.number_input("P10 Kâr Toleransı (±$K)", min_value=1.0, value=250.0, step=10.0) * 1000
+                        otif_tolerance = tol_col3.number_input("OTIF Hedef Olasılığı Toleransı (±puan)", min_value=0.1, value=1.0, step=0.1) / 100
+                        st.session_state.mc_tolerances = {
+                            ("mean", "annual_profits"): mean_tolerance,
+                            ("quantile", "annual_profits", 0.10): p10_tolerance,
+                            ("probability", "final_otifs", 0.95): otif_tolerance
+                        }
+                    else:
+                        num_runs = st.slider("Tekrar Sayısı", min_value=10, max_value=500, value=100, step=10)
             else: 
                 st.info("Bu mod, seçtiğiniz hedefi maksimize edecek en iyi strateji kombinasyonunu bulmak için yapay zeka kullanır. Strateji parametreleri kenar çubuğundan değil, motor tarafından otomatik olarak seçilecektir.")
-                optimization_goal = st.selectbox(
-                    "Optimizasyon Hedefiniz Nedir?",
-                    ("Yıllık Net Kârı Maksimize Et", "Final OTIF'i Maksimize Et", "Final Esneklik Skorunu Maksimize Et", "CO2 Tasarrufunu Maksimize Et")
-                )
+                is_pareto_mode = st.checkbox("🧭 Çok Amaçlı (Pareto) Optimizasyon", help="Seçilen hedefleri tek bir çalışmada birlikte optimize eder ve hiçbir hedefte diğerinden geride kalmayan stratejilerin (Pareto sınırı) listesini döndürür. Sonuçlarda hedefler arasında yeniden simülasyon yapmadan geçiş yapabilirsiniz.")
+                if is_pareto_mode:
+                    optimization_goal = st.multiselect("Birlikte Optimize Edilecek Hedefler", OPTIMIZATION_GOALS, default=list(OPTIMIZATION_GOALS[:2]))
+                    if len(optimization_goal) < 2:
+                        st.warning("Çok amaçlı optimizasyon için en az iki hedef seçin.")
+                else:
+                    optimization_goal = st.selectbox("Optimizasyon Hedefiniz Nedir?", OPTIMIZATION_GOALS)
+                st.session_state.opt_enumerate = not is_pareto_mode and st.checkbox("🧮 Kesikli Kombinasyonları Tam Tara", help="Üretim, taşıma, stok, mevsimsellik ve özel SKU seçeneklerinin tüm kombinasyonlarını bir kaydırıcı ızgarası üzerinde tek bir vektörel taramada değerlendirir ve sıralı tabloyu gösterir. Optuna yalnızca en iyi kombinasyonun kaydırıcılarını iyileştirir.")
                 n_trials = st.slider(
                     "Optimizasyon Hassasiyeti (Deneme Sayısı)",
                     min_value=20, max_value=1000, value=100, step=10,
                     help="Daha yüksek deneme sayısı, daha iyi bir strateji bulma olasılığını artırır ancak daha uzun sürer."
                 )
+                robust_scores = {"Tek Simülasyon": None, "Ortalama": ("mean", 0.10), "Kötümser Senaryo (P10)": ("quantile", 0.10), "En Kötü %10 Ortalaması (CVaR)": ("cvar", 0.10)}
+                robust_score = st.selectbox("Deneme Skoru", list(robust_scores.keys()), help="Her denemeyi tek bir gürültülü simülasyon yerine, tüm denemelerde ortak rastgele sayılarla üretilen çok sayıda tekrar üzerinden puanlar. Şans eseri iyi çıkan denemelerin seçilmesini önler.")
+                st.session_state.opt_robustness = None
+                if robust_scores[robust_score]:
+                    statistic, alpha = robust_scores[robust_score]
+                    replications = st.slider("Deneme Başına Tekrar Sayısı", min_value=8, max_value=256, value=64, step=8)
+                    st.session_state.opt_robustness = {"replications": replications, "statistic": statistic, "alpha": alpha}
+                pruners = {"Kapalı": None, "Medyan Budama": "median", "Ardışık Yarılama (Successive Halving)": "halving"}
+                pruner = pruners[st.selectbox("Umutsuz Denemeleri Erken Buda", list(pruners.keys()), disabled=is_pareto_mode, help="Her deneme aylık ara skorunu bildirir; aynı aydaki önceki denemelerin gerisinde kalan denemeler 12 ay tamamlanmadan durdurulur. Aynı sürede daha fazla deneme değerlendirilir. Çok amaçlı optimizasyonda kullanılamaz.")]
+                if pruner and not is_pareto_mode:
+                    st.session_state.opt_robustness = {**(st.session_state.opt_robustness or {}), "pruner": pruner}
 
             st.markdown("<hr style='margin-top:1rem; margin-bottom:1rem'>", unsafe_allow_html=True)
             st.markdown("<h6>2. Senaryo ve Müdahaleleri Planlayın (İsteğe Bağlı)</h6>", unsafe_allow_html=True)
@@ -370,13 +405,17 @@ class UIManager:
         if run_type == "optimization":
             optimization_goal = results_data.get('optimization_goal', '')
             st.success(f"**Optimizasyon Tamamlandı!** Hedef: `{optimization_goal}`")
+        elif run_type == "pareto":
+            st.success(f"**Çok Amaçlı Optimizasyon Tamamlandı!** {len(results_data['pareto_frontier'])} Pareto-optimal strateji bulundu.")
         elif run_type == "monte_carlo":
-            st.info(f"**Çalıştırılan Senaryo:** {scenario_title} ({len(results_data.get('mc_results', []))} Tekrar)")
+            st.info(f"**Çalıştırılan Senaryo:** {scenario_title} ({results_data['mc_summary'].count} Tekrar)")
         else:
             st.info(f"**Çalıştırılan Senaryo:** {scenario_title}")
 
         if run_type == "optimization":
             self.draw_optimization_results()
+        elif run_type == "pareto":
+            self.draw_pareto_results()
         elif run_type == "monte_carlo":
             self.draw_monte_carlo_summary()
         else:
@@ -415,45 +454,127 @@ class UIManager:
                     "Final Esneklik": f"{summary.get('final_flexibility', 0):.1f}"
                 })
                 st.success(f"Senaryo '{scenario_note}' kaydedildi!")
+        strategy_ranking = results_data.get("strategy_ranking")
+        if strategy_ranking is not None:
+            with st.expander(f"🧮 Strateji Uzayı Taraması ({len(strategy_ranking):,} kombinasyon)"):
+                st.caption("Kesikli kombinasyonlar kaydırıcı ızgarasında ortak rastgele sayılarla değerlendirildi; en iyi kombinasyonun kaydırıcıları ardından Optuna ile iyileştirildi.")
+                st.dataframe(strategy_ranking.head(200), use_container_width=True, hide_index=True)
         st.markdown("---")
         st.markdown("### Optimal Stratejinin Detaylı Analizi")
         self.draw_single_view()
 
+    @staticmethod
+    def _format_goal_value(goal, value):
+        if "Kâr" in goal: return f"${value:,.0f}"
+        if "OTIF" in goal: return f"{value:.1%}"
+        if "CO2" in goal: return f"{value:,.0f} ton"
+        return f"{value:.2f}"
+
+    def draw_pareto_results(self):
+        results_data = st.session_state.last_results
+        frontier, goals = results_data["pareto_frontier"], results_data["pareto_goals"]
+        st.subheader("🧭 Pareto Sınırı")
+        st.caption("Listelenen stratejilerin hiçbiri, seçilen tüm hedeflerde bir diğerinden daha kötü değildir. Öncelikli hedefi değiştirmek yeni bir simülasyon gerektirmez.")
+
+        goal_labels = dict(zip(OPTIMIZATION_GOALS, ("Yıllık Net Kâr", "Final OTIF", "Final Esneklik Skoru", "CO2 Tasarrufu")))
+        priority_goal = st.selectbox("Öncelikli Hedef", goals, format_func=goal_labels.get, key="pareto_priority_goal")
+        best_row = frontier.loc[frontier[priority_goal].idxmax()]
+        with st.container(border=True):
+            cols = st.columns(len(goals))
+            for col, goal in zip(cols, goals):
+                col.metric(goal_labels[goal], self._format_goal_value(goal, best_row[goal]))
+            st.markdown("##### 💡 Bu Hedef İçin Seçilen Strateji Paketi:")
+            readable_params = {"Üretim Stratejisi": best_row.get('uretim_s'), "Stok Stratejisi": best_row.get('stok_s'), "Tek Kaynak Oranı": f"{best_row.get('tek_kaynak_orani', 0):.0%}", "3PL Oranı": f"{best_row.get('lojistik_m', 0):.0%}", "Özel SKU Modu": "Aktif" if best_row.get('ozel_sku_modu') else "Pasif", "Mevsimsellik Zirvesi": "Aktif" if best_row.get('mevsimsellik_etkisi') else "Pasif", "Tahmin Algoritması": best_row.get('tahmin_algoritmasi')}
+            if isinstance(best_row.get('transport_m'), str): readable_params["Çevik Merkez Taşıma Modu"] = best_row['transport_m']
+            cols = st.columns(3)
+            for i, (key, value) in enumerate(readable_params.items()):
+                with cols[i % 3]: st.markdown(f"**{key}:** {value}")
+
+        x_goal = goals[0]
+        y_goal = goals[1] if priority_goal == goals[0] else priority_goal
+        fig = px.scatter(frontier, x=x_goal, y=y_goal, hover_data=["Deneme", "uretim_s", "stok_s"], title="Pareto Sınırındaki Stratejiler")
+        fig.add_trace(go.Scatter(x=[best_row[x_goal]], y=[best_row[y_goal]], mode="markers", marker=dict(size=16, symbol="star", color="#ff4b4b"), name="Seçilen Strateji"))
+        st.plotly_chart(fig, use_container_width=True)
+        st.dataframe(frontier.sort_values(priority_goal, ascending=False), use_container_width=True, hide_index=True)
+
     def draw_monte_carlo_summary(self):
         results_data = st.session_state.last_results
+        mc_summary = results_data["mc_summary"]
         mc_results_df = pd.DataFrame(results_data["mc_results"])
-        num_runs = len(mc_results_df)
-
-        profits = mc_results_df["annual_profits"]
-        otifs = mc_results_df["final_otifs"]
 
         st.success("Sonuçlar hazır! Detaylı interaktif analiz için kenar çubuğundan **'Yönetim Paneli (Dashboard)'** sekmesine gidin.")
+        precision_report = results_data.get("mc_precision")
+        if precision_report:
+            self.draw_monte_carlo_precision(precision_report)
         st.subheader("Olasılıksal Sonuç Özeti")
         st.caption("Bu metrikler, senaryonun potansiyel sonuç yelpazesini ve risklerini gösterir.")
 
         col1, col2 = st.columns(2)
         with col1:
             st.markdown("##### 💸 Yıllık Net Kâr/Zarar Dağılımı")
-            st.metric("Ortalama Sonuç", f"${profits.mean():,.0f}")
-            st.metric("En Kötü Durum (P5)", f"${profits.quantile(0.05):,.0f}", "Daha düşük kayıp beklenir")
-            st.metric("En İyi Durum (P95)", f"${profits.quantile(0.95):,.0f}", "Daha yüksek kazanç beklenir")
+            st.metric("Ortalama Sonuç", f"${mc_summary.mean('annual_profits'):,.0f}")
+            st.metric("En Kötü Durum (P5)", f"${mc_summary.quantile('annual_profits', 0.05):,.0f}", "Daha düşük kayıp beklenir")
+            st.metric("En İyi Durum (P95)", f"${mc_summary.quantile('annual_profits', 0.95):,.0f}", "Daha yüksek kazanç beklenir")
         with col2:
             st.markdown("##### 🎯 Final OTIF Dağılımı")
-            st.metric("Ortalama OTIF", f"{otifs.mean():.2%}")
-            st.metric("En Kötü Durum (P5)", f"{otifs.quantile(0.05):.2%}")
-            st.metric("En İyi Durum (P95)", f"{otifs.quantile(0.95):.2%}")
+            st.metric("Ortalama OTIF", f"{mc_summary.mean('final_otifs'):.2%}")
+            st.metric("En Kötü Durum (P5)", f"{mc_summary.quantile('final_otifs', 0.05):.2%}")
+            st.metric("En İyi Durum (P95)", f"{mc_summary.quantile('final_otifs', 0.95):.2%}")
+        if 'warehouse_utilization' in mc_summary.metrics:
+            self._draw_monte_carlo_warehouse_risk(mc_summary)
 
         st.markdown("---")
         st.subheader("Sonuç Dağılım Grafikleri")
+        if len(mc_results_df) < mc_summary.count:
+            st.caption(f"Grafikler, {mc_summary.count} tekrar içinden rastgele seçilen {len(mc_results_df)} tekrarlık örneklemle çizilmiştir.")
         fig_profit = px.histogram(mc_results_df, x="annual_profits", nbins=30, title="Yıllık Net Kâr/Zarar Dağılımı", labels={'annual_profits': 'Yıllık Net Kâr/Zarar ($)'})
-        fig_profit.add_vline(x=profits.mean(), line_dash="dash", line_color="red", annotation_text=f"Ortalama: ${profits.mean():,.0f}")
+        fig_profit.add_vline(x=mc_summary.mean('annual_profits'), line_dash="dash", line_color="red", annotation_text=f"Ortalama: ${mc_summary.mean('annual_profits'):,.0f}")
         st.plotly_chart(fig_profit, use_container_width=True)
 
         fig_otif = px.histogram(mc_results_df, x="final_otifs", nbins=30, title="Final OTIF Dağılımı", labels={'final_otifs': 'Final OTIF'})
         fig_otif.update_xaxes(tickformat=".1%")
-        fig_otif.add_vline(x=otifs.mean(), line_dash="dash", line_color="red", annotation_text=f"Ortalama: {otifs.mean():.1%}")
+        fig_otif.add_vline(x=mc_summary.mean('final_otifs'), line_dash="dash", line_color="red", annotation_text=f"Ortalama: {mc_summary.mean('final_otifs'):.1%}")
         st.plotly_chart(fig_otif, use_container_width=True)
 
+    def _draw_monte_carlo_warehouse_risk(self, mc_summary):
+        """Tüm tekrarların son durum ERP envanterinden hesaplanan depo kapasitesi aşım dağılımını gösterir."""
+        st.markdown("##### 🏭 Depo Kapasitesi Riski (Tüm Tekrarlar)")
+        capacity = self.config.get('warehouse_capacities', {}).get('Toplam', 43000)
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("Kapasite Aşım Olasılığı", f"{mc_summary.probability_at_least('warehouse_utilization', WAREHOUSE_BREACH_UTILIZATION):.1%}")
+        col2.metric("Medyan Doluluk", f"{mc_summary.quantile('warehouse_utilization', 0.50):.0%}")
+        col3.metric("Kötü Durum Doluluk (P95)", f"{mc_summary.quantile('warehouse_utilization', 0.95):.0%}")
+        col4.metric("P95 Aşım Miktarı", f"{max(mc_summary.quantile('warehouse_excess_tons', 0.95), 0):,.0f} ton")
+        category_metrics = sorted(metric for metric in mc_summary.metrics if metric.startswith("stock_tons_"))
+        composition = pd.DataFrame({
+            "Kategori": [metric.removeprefix("stock_tons_") for metric in category_metrics],
+            "Ortalama (ton)": [mc_summary.mean(metric) for metric in category_metrics],
+            "P5 (ton)": [mc_summary.quantile(metric, 0.05) for metric in category_metrics],
+            "P95 (ton)": [mc_summary.quantile(metric, 0.95) for metric in category_metrics],
+        })
+        st.caption(f"Her tekrarın son stok devir hızı ve gerçekleşen krizleri ERP verisine uygulanarak toplam {capacity:,.0f} ton depo kapasitesiyle karşılaştırılmıştır.")
+        st.dataframe(composition.style.format({"Ortalama (ton)": "{:,.0f}", "P5 (ton)": "{:,.0f}", "P95 (ton)": "{:,.0f}"}), use_container_width=True, hide_index=True)
+
+    def draw_monte_carlo_precision(self, precision_report):
+        """Uyarlamalı Monte Carlo çalışmasında kullanılan tekrar sayısını ve ulaşılan hassasiyeti gösterir."""
+        target_labels = {
+            ("mean", "annual_profits"): "Ortalama Yıllık Kâr",
+            ("quantile", "annual_profits", 0.10): "Kötümser Kâr (P10)",
+            ("probability", "final_otifs", 0.95): "OTIF ≥ %95 Olasılığı"
+        }
+        status = "hassasiyet hedeflerine ulaşıldı" if precision_report["converged"] else "tekrar bütçesi doldu, hedeflere tam ulaşılamadı"
+        st.info(f"**Uyarlamalı Mod:** {precision_report['runs_used']:,} / {precision_report['max_runs']:,} tekrar kullanıldı; {status}. "
+                f"(%{precision_report['confidence'] * 100:.0f} güven düzeyi)")
+        cols = st.columns(len(precision_report["targets"]))
+        for col, target_info in zip(cols, precision_report["targets"]):
+            target = target_info["target"]
+            label = target_labels.get(target, " ".join(map(str, target)))
+            if target[0] == "probability":
+                value, precision = f"{target_info['estimate']:.1%}", f"± {target_info['half_width'] * 100:.2f} puan"
+            else:
+                value, precision = f"${target_info['estimate']:,.0f}", f"± ${target_info['half_width']:,.0f}"
+            col.metric(label, value, precision, delta_color="off")
+
     def _render_as_is_panel(self):
         st.header("Başlangıç (As-Is)")
         as_is_col1, as_is_col2 = st.columns(2)
@@ -613,6 +734,7 @@ class UIManager:
         with col1: st.metric(label="Yıllık Kâr Avantajı", value=f"${abs(kar_farki):,.0f}", delta=kar_delta_text, delta_color=kar_delta_color if kar_farki !=0 else "off")
         with col2: st.metric(label="Final OTIF Avantajı", value=f"{abs(otif_farki):.1%}", delta=otif_delta_text, delta_color=otif_delta_color if otif_farki !=0 else "off")
         with col3: st.metric(label="Final Esneklik Avantajı", value=f"{abs(esneklik_farki):.1f}", delta=esneklik_delta_text, delta_color=esneklik_delta_color if esneklik_farki !=0 else "off")
+        if comp_results.get('paired_comparison'): self._render_paired_comparison(comp_results['paired_comparison'])
         with st.expander("Başlangıç Durumunu (As-Is) Görüntüle"): self._render_as_is_panel()
         st.markdown("---"); st.subheader("KPI'ların Zaman İçindeki Değişimi (Karşılaştırmalı)")
         fig = go.Figure()
@@ -637,14 +759,16 @@ class UIManager:
         st.subheader("⚔️ Stratejik Kırılganlık Karşılaştırması")
         st.info(
             "Bu analiz, iki stratejinin de temel krizler karşısında ne kadar finansal hasar aldığını "
-            "doğrudan karşılaştırır. Daha düşük çubuk, stratejinin o krize karşı daha dayanıklı olduğunu gösterir."
+            "doğrudan karşılaştırır. Daha düşük çubuk, stratejinin o krize karşı daha dayanıklı olduğunu gösterir. "
+            "İki strateji aynı kriz ve gürültü çekilişleriyle simüle edilir; hata çubukları %95 güven aralığını gösterir."
         )
         with st.spinner("Stratejilerin kriz dayanıklılığı karşılaştırılıyor..."):
             comparison_df = calculate_crisis_impact_comparison(
                 main_results['params'], 
                 comp_results['params'], 
                 self.base_data, 
-                self.config
+                self.config,
+                seed=st.session_state.get("simulation_seed")
             )
 
         if not comparison_df.empty:
@@ -653,6 +777,7 @@ class UIManager:
                 x="Kriz Senaryosu",
                 y="Aylık Kâr Kaybı ($)",
                 color="Strateji",
+                error_y="Kayıp Güven Payı ($)",
                 barmode="group",
                 title="Stratejilerin Krizlere Karşı Finansal Etkisi",
                 labels={"Aylık Kâr Kaybı ($)": "Aylık Kâr Kaybı ($)"},
@@ -665,6 +790,25 @@ class UIManager:
         else:
             st.warning("Kırılganlık karşılaştırma analizi için veri üretilemedi.")
 
+    def _render_paired_comparison(self, paired):
+        """Eşlenmiş (ortak rastgele sayılı) Monte Carlo ile hesaplanan strateji farklarını güven aralıklarıyla gösterir."""
+        rows = []
+        for metric, label, fmt in (("annual_profits", "Yıllık Kâr Değişimi ($)", "{:,.0f}"), ("final_otifs", "Final OTIF", "{:.2%}"),
+                                   ("final_flexibility", "Final Esneklik Skoru", "{:.2f}"), ("final_satisfaction", "Final Memnuniyet", "{:.2f}")):
+            summary = paired['summary'][metric]
+            rows.append({
+                "Metrik": label,
+                "Ana Strateji (ort.)": fmt.format(summary['mean'][0]),
+                "Karşılaştırma (ort.)": fmt.format(summary['mean'][1]),
+                "Fark (Ana − Karşı.)": fmt.format(summary['difference'][0]),
+                f"%{paired['confidence'] * 100:.0f} Güven Aralığı": f"[{fmt.format(summary['ci_low'][0])}, {fmt.format(summary['ci_high'][0])}]",
+                "Varyans Azalması": f"{(summary['independent_standard_error'][0] / summary['standard_error'][0]) ** 2:,.0f}x" if summary['standard_error'][0] > 0 else "—",
+            })
+        st.markdown(f"##### 🎯 Eşlenmiş Monte Carlo Farkı ({paired['num_runs']:,} tekrar)")
+        st.caption("Her iki strateji aynı kriz, Domino ve gürültü çekilişleriyle simüle edilir; fark tekrar başına alındığından ortak gürültü birbirini götürür. "
+                   "Güven aralığı sıfırı içermiyorsa fark istatistiksel olarak anlamlıdır.")
+        st.dataframe(pd.DataFrame(rows), use_container_width=True, hide_index=True)
+
     def draw_single_view(self):
         results_data = st.session_state.last_results
         results_df, params, scenario_title = results_data["results_df"], results_data["params"], results_data["scenario_title"]
@@ -787,6 +931,9 @@ class UIManager:
         if run_type == "monte_carlo":
             self.draw_monte_carlo_dashboard(results_data)
             return
+        if run_type == "pareto":
+            st.info("Son çalıştırma çok amaçlı bir optimizasyondu. Pareto sınırını 'Ana Simülatör' sayfasında inceleyebilir, seçtiğiniz stratejiyi manuel modda çalıştırarak bu panelde detaylı analiz edebilirsiniz.")
+            return
 
         with st.expander("ℹ️ Modelin Felsefesi ve Temel Varsayımları"):
             st.info("""
@@ -838,18 +985,18 @@ class UIManager:
         st.subheader("Stratejik Risk Matrisi")
         st.info(
             "**Not:** Bu analiz, stratejik bir **'stres testi'** işlevi görür. Şu anda **incelenen senaryonun** "
-            "temel parametrelerini (örn: Tek Kaynak Oranı) baz alarak, farklı **üretim stratejilerinin** "
-            "('Mevcut', 'G. Afrika', 'Türkiye') standart krizler karşısındaki finansal kırılganlığını test eder. "
-            "Sonuç, hangi üretim yapısının hangi krize karşı ne kadar dayanıklı olduğunu gösteren bir ısı haritasıdır.",
+            "temel parametrelerini (örn: Tek Kaynak Oranı) baz alarak, tüm **üretim ve stok stratejisi** "
+            "kombinasyonlarının her kriz, lokasyon ve müdahale karşısındaki kırılganlığını tek seferde test eder. "
+            "Sonuç üzerinde istediğiniz iki boyutu seçerek ısı haritasını anında değiştirebilirsiniz.",
             icon="ℹ️"
         )
         if st.button("Risk Matrisini Hesapla ve Göster"):
-            with st.spinner("Risk matrisi farklı senaryolar için hesaplanıyor... (Bu işlem 10-15 saniye sürebilir)"):
-                st.session_state.risk_matrix_df = calculate_risk_matrix(self.base_data, self.config, params)
-        if st.session_state.risk_matrix_df is not None:
-            st.plotly_chart(plot_risk_heatmap(st.session_state.risk_matrix_df), use_container_width=True)
+            with st.spinner("Risk küpü tüm senaryolar için hesaplanıyor..."):
+                st.session_state.risk_cube_df = calculate_risk_cube(self.base_data, self.config, params, seed=st.session_state.get("simulation_seed"))
+        if st.session_state.risk_cube_df is not None:
+            self.draw_risk_cube_heatmap(st.session_state.risk_cube_df)
             if st.button("Risk Matrisini Gizle", key="clear_risk_matrix"):
-                st.session_state.risk_matrix_df = None
+                st.session_state.risk_cube_df = None
                 st.rerun()
 
         st.markdown("---")
@@ -988,13 +1135,13 @@ class UIManager:
     def draw_monte_carlo_dashboard(self, results_data):
         st.info(f"Bu panel, çalıştırılan **{results_data['scenario_title']}** senaryosunun olasılıksal sonuçlarını detaylı olarak analiz eder.")
 
-        mc_runs_data = results_data["mc_results"]
-        if not mc_runs_data:
+        mc_summary = results_data.get("mc_summary")
+        if mc_summary is None or mc_summary.count == 0:
             st.error("Monte Carlo simülasyonu için sonuç verisi bulunamadı.")
             return
         
-        results_df = pd.DataFrame(mc_runs_data)
-        num_runs = len(results_df)
+        results_df = pd.DataFrame(results_data["mc_results"])
+        num_runs = mc_summary.count
 
         st.markdown(f"### Olasılıksal Performans Karnesi ({num_runs} Tekrar)")
         kpi_defs = {
@@ -1012,11 +1159,11 @@ class UIManager:
         st.markdown("<hr style='margin-top: -10px; margin-bottom: 10px;'>", unsafe_allow_html=True)
 
         for key, kpi in kpi_defs.items():
-            if key not in results_df.columns: continue
+            if key not in mc_summary.metrics: continue
             c_kpi, c_avg, c_med, c_p10, c_p90 = st.columns([2.5, 2, 2, 2, 2])
-            data = results_df[key]
             initial_val = self.base_data['initial_kpis'][kpi['initial_key']] * (12 if key == 'annual_profits' else 1)
-            mean_val, median_val, p10_val, p90_val = data.mean(), data.median(), data.quantile(0.10), data.quantile(0.90)
+            mean_val, median_val, p10_val, p90_val = (mc_summary.mean(key), mc_summary.quantile(key, 0.50),
+                                                      mc_summary.quantile(key, 0.10), mc_summary.quantile(key, 0.90))
             
             c_kpi.markdown(f"<div style='height: 60px; display: flex; align-items: center; font-weight: bold;'>{kpi['label']}</div>", unsafe_allow_html=True)
 
@@ -1059,9 +1206,9 @@ class UIManager:
             fig.update_layout(paper_bgcolor="rgba(0,0,0,0)", font={'color': "white"}, height=250, margin=dict(l=30, r=30, t=65, b=20))
             col.plotly_chart(fig, use_container_width=True)
 
-        prob_otif = (results_df['final_otifs'] * 100 >= user_target_otif).mean() * 100
-        prob_profit = (results_df['annual_profits'] >= user_target_profit).mean() * 100
-        prob_flex = (results_df['final_flexibility'] >= user_target_flex).mean() * 100
+        prob_otif = mc_summary.probability_at_least('final_otifs', round(user_target_otif / 100, 6)) * 100
+        prob_profit = mc_summary.probability_at_least('annual_profits', user_target_profit) * 100
+        prob_flex = mc_summary.probability_at_least('final_flexibility', user_target_flex) * 100
         
         with g_col1: create_gauge(g_col1, prob_otif, "OTIF Başarı Olasılığı", f"{user_target_otif:.0f}%", user_target_otif, "%", 100)
         with g_col2: create_gauge(g_col2, prob_profit, "Kâr Hedefi Olasılığı", f"${user_target_profit/1e6:.1f}M", user_target_profit, "%", 100)
@@ -1093,8 +1240,8 @@ class UIManager:
         st.subheader("Nedensellik Analizi: Başarı ve Başarısızlığın Kök Nedenleri")
         st.caption("Bu analiz, en iyi ve en kötü sonuçlara yol açan krizlerin hangileri olduğunu karşılaştırarak en büyük risk faktörlerini ortaya koyar.")
         
-        profit_p10 = results_df['annual_profits'].quantile(0.10)
-        profit_p90 = results_df['annual_profits'].quantile(0.90)
+        profit_p10 = mc_summary.quantile('annual_profits', 0.10)
+        profit_p90 = mc_summary.quantile('annual_profits', 0.90)
 
         worst_runs = results_df[results_df['annual_profits'] <= profit_p10]
         best_runs = results_df[results_df['annual_profits'] >= profit_p90]
@@ -1178,6 +1325,28 @@ class UIManager:
             else:
                 st.info("Simülasyon sonrası durumu görmek için bir senaryo çalıştırın.")
 
+    def draw_risk_cube_heatmap(self, risk_cube):
+        """Önbellekteki risk küpünden kullanıcının seçtiği iki boyutlu görünümü çizer."""
+        col1, col2, col3 = st.columns(3)
+        rows = col1.selectbox("Satırlar", RISK_CUBE_DIMENSIONS, index=0, key="risk_cube_rows")
+        column_options = [dim for dim in RISK_CUBE_DIMENSIONS if dim != rows]
+        columns = col2.selectbox("Sütunlar", column_options, index=column_options.index("Kriz") if "Kriz" in column_options else 0, key="risk_cube_columns")
+        metric = col3.selectbox("Metrik", RISK_CUBE_METRICS, key="risk_cube_metric")
+
+        filters = {}
+        remaining_dims = [dim for dim in RISK_CUBE_DIMENSIONS if dim not in (rows, columns)]
+        filter_cols = st.columns(len(remaining_dims))
+        for filter_col, dimension in zip(filter_cols, remaining_dims):
+            values = list(risk_cube.index.get_level_values(dimension).unique())
+            default_value = {"Lokasyon": "Genel", "Müdahale": "Müdahale Yok"}.get(dimension)
+            options = ["Tümü (Ortalama)"] + values
+            selected = filter_col.selectbox(dimension, options, index=options.index(default_value) if default_value in options else 0, key=f"risk_cube_filter_{dimension}")
+            if selected != "Tümü (Ortalama)":
+                filters[dimension] = selected
+
+        risk_view = slice_risk_cube(risk_cube, rows, columns, metric, filters)
+        st.plotly_chart(plot_risk_heatmap(risk_view, x_label=columns, y_label=rows, color_label=metric), use_container_width=True)
+
     def draw_stock_demand_risk_radar(self, results_data):
         final_erp_data = results_data.get('final_erp_data')
         risk_metrics = analyze_stock_and_demand_risk(final_erp_data)
@@ -0,0 +1,204 @@
+import numpy as np
+
+SAMPLING_METHODS = ("random", "antithetic", "lhs", "halton")
+
+# Acklam'ın ters normal dağılım yaklaşımı katsayıları (bağıl hata < 1.15e-9).
+_A = (-3.969683028665376e+01, 2.209460984245205e+02, -2.759285104469687e+02, 1.383577518672690e+02, -3.066479806614716e+01, 2.506628277459239e+00)
+_B = (-5.447609879822406e+01, 1.615858368580409e+02, -1.556989798598866e+02, 6.680131188771972e+01, -1.328068155288572e+01)
+_C = (-7.784894002430293e-03, -3.223964580411365e-01, -2.400758277161838e+00, -2.549732539343734e+00, 4.374664141464968e+00, 2.938163982698783e+00)
+_D = (7.784695709041462e-03, 3.224671290700398e-01, 2.445134137142996e+00, 3.754408661907416e+00)
+_P_LOW = 0.02425
+
+def norm_ppf(u):
+    """Standart normal dağılımın ters birikimli dağılım fonksiyonu (vektörel, SciPy gerektirmez)."""
+    u = np.clip(np.asarray(u, dtype=float), 1e-12, 1 - 1e-12)
+    result = np.empty_like(u)
+
+    low, high = u < _P_LOW, u > 1 - _P_LOW
+    central = ~(low | high)
+
+    q = u[central] - 0.5
+    r = q * q
+    result[central] = ((((((_A[0] * r + _A[1]) * r + _A[2]) * r + _A[3]) * r + _A[4]) * r + _A[5]) * q /
+                       (((((_B[0] * r + _B[1]) * r + _B[2]) * r + _B[3]) * r + _B[4]) * r + 1))
+
+    for mask, sign, tail in ((low, 1.0, u[low]), (high, -1.0, 1 - u[high])):
+        q = np.sqrt(-2 * np.log(tail))
+        result[mask] = sign * ((((((_C[0] * q + _C[1]) * q + _C[2]) * q + _C[3]) * q + _C[4]) * q + _C[5]) /
+                               ((((_D[0] * q + _D[1]) * q + _D[2]) * q + _D[3]) * q + 1))
+    return result
+
+class PseudoRandomStream:
+    """Her çağrıda bağımsız düzgün U(0, 1) sütunu üreten akış."""
+    def __init__(self, generator, num_runs):
+        self.generator = generator
+        self.num_runs = num_runs
+
+    def next(self):
+        return self.generator.random(self.num_runs)
+
+class AntitheticStream(PseudoRandomStream):
+    """Tekrarların ikinci yarısı için ilk yarının karşıt (`1 - u`) değerlerini kullanan akış.
+
+    `i` ve `i + ceil(N/2)` numaralı tekrarlar bir karşıt çift oluşturur.
+    """
+    def next(self):
+        half = -(-self.num_runs // 2)
+        u = self.generator.random(half)
+        return np.concatenate([u, 1 - u])[:self.num_runs]
+
+class LatinHypercubeStream(PseudoRandomStream):
+    """Her boyutu `N` eşit tabakaya bölen ve her tabakadan tek değer çeken Latin hiperküp akışı."""
+    def next(self):
+        return (self.generator.permutation(self.num_runs) + self.generator.random(self.num_runs)) / self.num_runs
+
+def first_primes(count):
+    """İlk `count` asal sayıyı döndürür (Halton tabanları)."""
+    primes = []
+    candidate = 2
+    while len(primes) < count:
+        if all(candidate % prime for prime in primes if prime * prime <= candidate):
+            primes.append(candidate)
+        candidate += 1
+    return primes
+
+def scrambled_halton(num_points, dimensions, generator):
+    """Rastgele basamak permütasyonu ve kaydırmayla karıştırılmış Halton noktaları üretir (SciPy gerektirmez).
+
+    Her boyut bir asal tabanın ters basamak (radical inverse) dizisidir. Sıfırı
+    sabit bırakan basamak permütasyonu yüksek boyutlardaki boyutlar arası
+    ilişkiyi kırar; mod 1 rastgele kaydırma (Cranley-Patterson) her noktayı
+    U(0, 1) dağılımlı yapar.
+
+    Returns:
+        np.ndarray: (nokta × boyut) boyutlu matris.
+    """
+    points = np.empty((num_points, dimensions))
+    indices = np.arange(1, num_points + 1)
+    for dimension, base in enumerate(first_primes(dimensions)):
+        permutation = np.concatenate([[0], generator.permutation(np.arange(1, base))])
+        remaining, value, scale = indices.copy(), np.zeros(num_points), 1.0 / base
+        while remaining.any():
+            remaining, digit = np.divmod(remaining, base)
+            value += permutation[digit] * scale
+            scale /= base
+        points[:, dimension] = (value + generator.random()) % 1.0
+    return points
+
+class HaltonStream(PseudoRandomStream):
+    """Karıştırılmış Halton dizisinden sütun üreten yarı-rastgele akış.
+
+    İlk `max_dimensions` boyuttan sonraki sütunlar Latin hiperküp ile üretilir.
+    """
+    def __init__(self, generator, num_runs, max_dimensions=64):
+        super().__init__(generator, num_runs)
+        self._points = scrambled_halton(num_runs, max_dimensions, generator)
+        self._dimension = 0
+        self._fallback = LatinHypercubeStream(generator, num_runs)
+
+    def next(self):
+        if self._dimension >= self._points.shape[1]:
+            return self._fallback.next()
+        column = self._points[:, self._dimension]
+        self._dimension += 1
+        return column
+
+class TiledUniformStream:
+    """Bir akışın sütunlarını `blocks` kez art arda tekrarlayan akış.
+
+    Tekrarlar eşit büyüklükte bloklara ayrıldığında her bloğun `i`. satırı
+    aynı düzgün sayıyı alır (bloklar arası ortak rastgele sayılar).
+    """
+    def __init__(self, stream, blocks):
+        self.stream = stream
+        self.blocks = blocks
+
+    def next(self):
+        return np.tile(self.stream.next(), self.blocks)
+
+def make_uniform_stream(sampling, generator, num_runs):
+    """Örnekleme yöntemine göre düzgün dağılımlı sütun akışı oluşturur."""
+    streams = {"random": PseudoRandomStream, "antithetic": AntitheticStream, "lhs": LatinHypercubeStream, "halton": HaltonStream}
+    if sampling not in streams:
+        raise ValueError(f"Bilinmeyen örnekleme yöntemi: '{sampling}'")
+    return streams[sampling](generator, num_runs)
+
+def control_variate_mean(values, controls):
+    """Beklenen değeri sıfır olan kontrol değişkenleriyle düzeltilmiş ortalamayı hesaplar.
+
+    Katsayılar en küçük kareler regresyonuyla tahmin edilir:
+    `ortalama(y) - beta · ortalama(C)`.
+
+    Args:
+        values (np.ndarray): Tekrar başına hedef metrik değerleri.
+        controls (np.ndarray): (tekrar × kontrol) boyutlu, beklenen değeri sıfır olan matris.
+
+    Returns:
+        float: Düzeltilmiş ortalama tahmini.
+    """
+    if controls.size == 0:
+        return float(values.mean())
+    centered = controls - controls.mean(axis=0)
+    beta, *_ = np.linalg.lstsq(centered, values - values.mean(), rcond=None)
+    return float(values.mean() - controls.mean(axis=0) @ beta)
+
+class ImportanceTilt:
+    """Kuyruk olaylarını daha sık üretmek için Domino olasılıklarını ve normal etki ortalamalarını kaydırır.
+
+    Her tekrarın olabilirlik oranı (orijinal yoğunluk / kaydırılmış yoğunluk)
+    log ağırlık olarak biriktirilir; ağırlıklı tahminler orijinal dağılım için
+    yansızdır.
+
+    Attributes:
+        domino_probability (float): Tüm Domino kuralları için kullanılacak
+            tetiklenme olasılığı (`None` ise orijinal olasılıklar).
+        impact_shift (float): Normal dağılımlı etkilerin ortalamasına standart
+            sapma cinsinden eklenecek kayma.
+        directions (dict): Etki kanalı -> kaymanın yönü (-1, 0 veya 1). Varsayılan
+            olarak yalnızca kârı doğrudan düşüren 'net_kar' kanalı kaydırılır.
+    """
+    def __init__(self, domino_probability=0.9, impact_shift=1.0, directions=None):
+        if domino_probability is not None and not 0 < domino_probability < 1:
+            raise ValueError("Kaydırılmış Domino olasılığı 0 ile 1 arasında olmalıdır.")
+        self.domino_probability = domino_probability
+        self.impact_shift = impact_shift
+        self.directions = directions if directions is not None else {"net_kar": -1}
+
+    def domino_draw(self, coin, probability):
+        """Düzgün `coin` değerlerinden kaydırılmış olasılıkla Domino tetiklenmelerini ve log olabilirlik oranlarını döndürür."""
+        if self.domino_probability is None or not 0 < probability < 1:
+            return coin < probability, np.zeros(coin.shape)
+        tilted = self.domino_probability
+        fired = coin < tilted
+        return fired, np.where(fired, np.log(probability / tilted), np.log((1 - probability) / (1 - tilted)))
+
+    def mean_shift(self, channel, sampler):
+        """Normal dağılımlı bir etki için ortalama kaymasını döndürür; diğer dağılımlar için 0."""
+        std = getattr(sampler, "std", 0)
+        if not hasattr(sampler, "std") or std <= 0:
+            return 0.0
+        return self.directions.get(channel, 0) * self.impact_shift * std
+
+def effective_sample_size(weights):
+    """Önem örneklemesi ağırlıklarının etkin örneklem büyüklüğünü (Kish) döndürür."""
+    weights = np.asarray(weights, dtype=float)
+    return float(weights.sum() ** 2 / (weights ** 2).sum())
+
+def weighted_tail_risk(values, weights, alpha):
+    """Ağırlıklı örneklemden alt kuyruk riske maruz değerini (VaR) ve koşullu değerini (CVaR) hesaplar.
+
+    Ağırlıklar kendi toplamına bölünerek normalize edilir. VaR, birikimli
+    ağırlığın `alpha`'ya ulaştığı değer; CVaR ise en kötü `alpha` olasılık
+    kütlesinin ağırlıklı ortalamasıdır.
+
+    Returns:
+        tuple: (VaR, CVaR).
+    """
+    order = np.argsort(values)
+    values = np.asarray(values, dtype=float)[order]
+    probabilities = np.asarray(weights, dtype=float)[order]
+    probabilities = probabilities / probabilities.sum()
+    cumulative = np.cumsum(probabilities)
+    index = min(int(np.searchsorted(cumulative, alpha, side="left")), values.size - 1)
+    tail_mass = np.minimum(probabilities, np.maximum(alpha - (cumulative - probabilities), 0))
+    return float(values[index]), float((tail_mass * values).sum() / tail_mass.sum())